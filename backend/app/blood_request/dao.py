@@ -1,42 +1,44 @@
 from app.dao.base import BaseDAO
 from app.blood_request.models import BloodRequest
-from app.database import async_session_maker
-from sqlalchemy import select, func, and_, text
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from app.common.enums import BloodType, RequestStatus
+from app.database import session_scope
+from app.config import settings
+from app.common.cache import TTLCache, cached_method
+from app.common.events import ChangeEvent, publish, subscribe
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, case, literal, text, update
+from typing import List, Optional, Dict, Any, Sequence
+from datetime import datetime, timedelta
+from app.common.enums import BloodType, DonationStatus, RequestStatus
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm import selectinload
-from app.database import async_session_maker
 from app.donation.models import Donation
 from app.donor.models import Donor
+from app.donor.dao import DonorDAO
 
 
 class BloodRequestDAO(BaseDAO):
     model = BloodRequest
+    _summary_cache = TTLCache(ttl=settings.SUMMARY_CACHE_TTL, maxsize=512, name="blood_request_summary")
+    # Bumped by every eviction, see get_summary
+    _summary_generation = 0
 
     @classmethod
-    async def add(cls, **values):
-        async with async_session_maker() as session:
+    async def add(cls, session: Optional[AsyncSession] = None, **values):
+        async with session_scope(session) as session:
             instance = cls.model(**values)
             session.add(instance)
-            await session.commit()
+            await session.flush()
             
             await session.refresh(instance)
-            
-            query = select(cls.model).options(
-                selectinload(cls.model.donations)
-            ).filter(cls.model.id == instance.id)
-            
-            result = await session.execute(query)
-            return result.scalar_one()
+            publish(session, ChangeEvent.for_instance(instance))
+            return instance
     
 
     @classmethod
-    async def find_one_or_none(cls, **filter_by):
+    async def find_one_or_none(cls, session: Optional[AsyncSession] = None, **filter_by):
         """Override to eager load donations relationship"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(cls.model).options(
                 selectinload(cls.model.donations)
             ).filter_by(**filter_by)
@@ -50,13 +52,12 @@ class BloodRequestDAO(BaseDAO):
         limit: Optional[int] = None, 
         offset: Optional[int] = None,
         order_by: Optional[List] = None,
+        session: Optional[AsyncSession] = None,
         **filter_by
     ):
         """Find all blood requests with optional filtering, pagination and ordering"""
-        async with async_session_maker() as session:
-            stmt = select(cls.model).options(
-                selectinload(cls.model.donations)
-            )
+        async with session_scope(session) as session:
+            stmt = select(cls.model)
             
             # Apply filters
             for field, value in filter_by.items():
@@ -77,61 +78,92 @@ class BloodRequestDAO(BaseDAO):
             return result.scalars().all()
     
     @classmethod
-    async def update(cls, request_id, **values):
-        """Update a blood request by ID and return the updated instance with relationships loaded"""
-        async with async_session_maker() as session:
-            # Get the blood request with ID
-            stmt = select(cls.model).options(
-                selectinload(cls.model.donations),
-                joinedload(cls.model.staff),
-                joinedload(cls.model.hospital)
-            ).where(cls.model.id == request_id)
-            
-            result = await session.execute(stmt)
-            instance = result.scalar_one_or_none()
-            
-            if not instance:
-                return None
-            
-            # Update the instance with the provided values
-            for key, value in values.items():
-                setattr(instance, key, value)
-            
-            # Commit the changes
-            await session.commit()
-            
-            # Refresh the instance with the updated values and ensure relationships are loaded
-            await session.refresh(instance, ["donations", "staff", "hospital"])
-            
-            # Access computed properties to ensure they're calculated with relationships loaded
-            _ = instance.collected_amount_ml
-            _ = instance.fulfillment_percentage
-            _ = instance.days_until_needed
-            _ = instance.is_fulfilled
-            
-            return instance
+    async def update(
+        cls,
+        request_id,
+        session: Optional[AsyncSession] = None,
+        load: Sequence[str] = (),
+        **values
+    ):
+        """
+        Update a blood request by ID in a single UPDATE ... RETURNING.
+
+        Relationships are only loaded when named in ``load``; pass
+        ``load=("donations",)`` when the caller needs the computed
+        collection properties (collected_amount_ml, fulfillment_percentage).
+        """
+        return await cls.update_returning(request_id, session=session, load=load, **values)
     
     @classmethod
-    async def delete(cls, **filter_by):
-        """Delete blood requests by filter criteria"""
-        async with async_session_maker() as session:
-            query = select(cls.model).filter_by(**filter_by)
-            result = await session.execute(query)
-            instances = result.scalars().all()
-            
-            for instance in instances:
-                await session.delete(instance)
-            
-            await session.commit()
-            return len(instances)
+    async def delete(
+        cls,
+        session: Optional[AsyncSession] = None,
+        cascade_donations: bool = False,
+        dry_run: bool = False,
+        **filter_by
+    ) -> int:
+        """
+        Delete blood requests by filter criteria in one set-based statement.
+
+        Donations linked to the deleted requests are unlinked (blood_request_id
+        set to NULL) unless cascade_donations is set, in which case they are
+        deleted as well and the donors of deleted completed donations are
+        recounted. With dry_run nothing is changed and the number of
+        matching requests is returned.
+        """
+        async with session_scope(session) as session:
+            if dry_run:
+                ids = await cls.delete_where(session=session, dry_run=True, **filter_by)
+                return len(ids)
+
+            if cascade_donations:
+                # Lock the donations, then their donors, before anything is deleted
+                result = await session.execute(
+                    select(Donation.donor_id, Donation.status)
+                    .where(Donation.blood_request_id.in_(select(cls.model.id).filter_by(**filter_by)))
+                    .order_by(Donation.id)
+                    .with_for_update()
+                )
+                donor_ids = {donor_id for donor_id, status in result.all() if status == DonationStatus.COMPLETED}
+                await DonorDAO.lock(donor_ids, session)
+
+                ids = await cls.delete_where(
+                    session=session,
+                    cascade=(Donation.blood_request_id,),
+                    **filter_by
+                )
+                await DonorDAO.recount_donations(donor_ids, session=session)
+            else:
+                matching_ids = select(cls.model.id).filter_by(**filter_by)
+                await session.execute(
+                    update(Donation)
+                    .where(Donation.blood_request_id.in_(matching_ids))
+                    .values(blood_request_id=None)
+                )
+                publish(session, ChangeEvent(Donation.__tablename__))
+                ids = await cls.delete_where(session=session, **filter_by)
+
+            return len(ids)
     
     @classmethod
-    async def find_by_min_urgency(cls, urgency_min: int, **filters):
+    async def find_page(cls, *where, urgency_min: Optional[int] = None, **kwargs):
+        """One id-ordered page of blood requests"""
+        if urgency_min is not None:
+            where = (*where, cls.model.urgency_level >= urgency_min)
+        return await super().find_page(*where, **kwargs)
+
+    @classmethod
+    def stream(cls, *where, urgency_min: Optional[int] = None, **kwargs):
+        """Stream blood requests matching the filters"""
+        if urgency_min is not None:
+            where = (*where, cls.model.urgency_level >= urgency_min)
+        return super().stream(*where, **kwargs)
+
+    @classmethod
+    async def find_by_min_urgency(cls, urgency_min: int, session: Optional[AsyncSession] = None, **filters):
         """Find requests with minimum urgency level"""
-        async with async_session_maker() as session:
-            query = select(cls.model).options(
-                selectinload(cls.model.donations)
-            ).filter(cls.model.urgency_level >= urgency_min)
+        async with session_scope(session) as session:
+            query = select(cls.model).filter(cls.model.urgency_level >= urgency_min)
             
             for field, value in filters.items():
                 query = query.filter(getattr(cls.model, field) == value)
@@ -140,64 +172,65 @@ class BloodRequestDAO(BaseDAO):
             return result.scalars().all()
     
     @classmethod
-    async def get_summary(cls, hospital_id: Optional[int] = None) -> Dict[str, Any]:
-        """Get statistical summary of blood requests"""
-        async with async_session_maker() as session:
-            filters = []
-            if hospital_id:
-                filters.append(cls.model.hospital_id == hospital_id)
-            
-            total_query = select(func.count()).select_from(cls.model)
-            if filters:
-                total_query = total_query.where(and_(*filters))
-            total_result = await session.execute(total_query)
-            total_requests = total_result.scalar() or 0
-            
-            pending_query = select(func.count()).select_from(cls.model).where(
-                cls.model.status == "pending",
-                *filters
-            )
-            pending_result = await session.execute(pending_query)
-            pending_requests = pending_result.scalar() or 0
-            
-            fulfilled_query = select(func.count()).select_from(cls.model).where(
-                cls.model.status == "fulfilled",
-                *filters
-            )
-            fulfilled_result = await session.execute(fulfilled_query)
-            fulfilled_requests = fulfilled_result.scalar() or 0
-            
-            urgent_query = select(func.count()).select_from(cls.model).where(
-                cls.model.urgency_level >= 4,
-                *filters
-            )
-            urgent_result = await session.execute(urgent_query)
-            urgent_requests = urgent_result.scalar() or 0
-            
-            blood_type_query = select(
+    async def get_summary(cls, hospital_id: Optional[int] = None, session: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        """
+        Get statistical summary of blood requests
+        
+        All figures come from one grouped query using COUNT(*) FILTER (...);
+        the totals are the sums of the per-blood-type rows. Results are cached
+        per hospital for SUMMARY_CACHE_TTL seconds; committed writes evict the
+        affected hospital's entry and the all-hospitals entry.
+
+        A miss is computed in a private session, not the caller's, so
+        uncommitted writes never reach the cache, and the result is only
+        stored if no eviction happened while it was being computed.
+        """
+        summary = cls._summary_cache.get(hospital_id)
+        if summary is None:
+            generation = cls._summary_generation
+            summary = await cls._query_summary(hospital_id)
+            if generation == cls._summary_generation:
+                cls._summary_cache.set(hospital_id, summary)
+        
+        return {**summary, "by_blood_type": dict(summary["by_blood_type"])}
+    
+    @classmethod
+    async def _query_summary(cls, hospital_id: Optional[int] = None, session: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        async with session_scope(session) as session:
+            query = select(
                 cls.model.blood_type,
-                func.count().label("count")
+                func.count().label("total"),
+                func.count().filter(cls.model.status == RequestStatus.PENDING).label("pending"),
+                func.count().filter(cls.model.status == RequestStatus.FULFILLED).label("fulfilled"),
+                func.count().filter(cls.model.urgency_level >= 4).label("urgent")
             ).group_by(cls.model.blood_type)
-            if filters:
-                blood_type_query = blood_type_query.where(and_(*filters))
-            blood_type_result = await session.execute(blood_type_query)
-            by_blood_type = {row[0]: row[1] for row in blood_type_result}
+            if hospital_id:
+                query = query.where(cls.model.hospital_id == hospital_id)
+            
+            rows = (await session.execute(query)).all()
             
             return {
-                "total_requests": total_requests,
-                "pending_requests": pending_requests,
-                "fulfilled_requests": fulfilled_requests,
-                "urgent_requests": urgent_requests,
-                "by_blood_type": by_blood_type
+                "total_requests": sum(row.total for row in rows),
+                "pending_requests": sum(row.pending for row in rows),
+                "fulfilled_requests": sum(row.fulfilled for row in rows),
+                "urgent_requests": sum(row.urgent for row in rows),
+                "by_blood_type": {row.blood_type: row.total for row in rows}
             }
+    
+    @classmethod
+    def _evict_summary(cls, change: ChangeEvent):
+        cls._summary_generation += 1
+        if change.hospital_id is None:
+            cls._summary_cache.clear()
+        else:
+            cls._summary_cache.invalidate(change.hospital_id)
+            cls._summary_cache.invalidate(None)
         
     @classmethod
-    async def find_with_properties(cls, **filter_by):
-        """Find blood requests with eager loading and compute properties"""
-        async with async_session_maker() as session:
-            query = select(cls.model).options(
-                selectinload(cls.model.donations)
-            ).filter_by(**filter_by)
+    async def find_with_properties(cls, session: Optional[AsyncSession] = None, **filter_by):
+        """Find blood requests and compute properties"""
+        async with session_scope(session) as session:
+            query = select(cls.model).filter_by(**filter_by)
             
             result = await session.execute(query)
             instances = result.scalars().all()
@@ -211,9 +244,9 @@ class BloodRequestDAO(BaseDAO):
             return instances
     
     @classmethod
-    async def count(cls, **filter_by) -> int:
+    async def count(cls, session: Optional[AsyncSession] = None, **filter_by) -> int:
         """Count blood requests with optional filtering"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             stmt = select(func.count()).select_from(cls.model)
             
             # Apply filters
@@ -225,9 +258,9 @@ class BloodRequestDAO(BaseDAO):
             return result.scalar() or 0
     
     @classmethod
-    async def count_by_min_urgency(cls, urgency_min: int, **filter_by) -> int:
+    async def count_by_min_urgency(cls, urgency_min: int, session: Optional[AsyncSession] = None, **filter_by) -> int:
         """Count blood requests with minimum urgency level and optional filtering"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             stmt = select(func.count()).select_from(cls.model)
             
             # Add urgency filter
@@ -240,12 +273,150 @@ class BloodRequestDAO(BaseDAO):
                     
             result = await session.execute(stmt)
             return result.scalar() or 0
+
+    
+    @classmethod
+    async def adjust_collected_ml(cls, request_id: int, delta_ml: int, session: Optional[AsyncSession] = None):
+        """
+        Add delta_ml (negative to subtract) to a request's collected_ml
+        
+        The increment is done in SQL under the row lock taken by UPDATE, so
+        concurrent donations to the same request cannot overwrite each other.
+        An approved request that reaches the amount needed becomes fulfilled
+        in the same statement. Call it in the same transaction as the
+        donation change.
+        """
+        if not delta_ml:
+            return
+        values = {"collected_ml": cls.model.collected_ml + delta_ml}
+        if delta_ml > 0:
+            values["status"] = case(
+                (
+                    and_(
+                        cls.model.status == RequestStatus.APPROVED,
+                        cls.model.collected_ml + delta_ml >= cls.model.amount_needed_ml
+                    ),
+                    # Typed so the name is bound as the requeststatus enum, not as text
+                    literal(RequestStatus.FULFILLED, cls.model.status.type)
+                ),
+                else_=cls.model.status
+            )
+        async with session_scope(session) as session:
+            result = await session.execute(
+                update(cls.model)
+                .where(cls.model.id == request_id)
+                .values(**values)
+                .returning(cls.model.id, cls.model.hospital_id, cls.model.blood_type)
+            )
+            row = result.first()
+            if row:
+                publish(session, ChangeEvent(
+                    cls.model.__tablename__, row.id, row.hospital_id, row.blood_type.value
+                ))
+    
+    @classmethod
+    async def recalculate_collected_ml(
+        cls,
+        request_ids: Optional[Sequence[int]] = None,
+        session: Optional[AsyncSession] = None
+    ) -> List[int]:
+        """
+        Recompute collected_ml from completed donations and fix rows that drifted
+        
+        Used to backfill after bulk loads and as a periodic repair job.
+        
+        Args:
+            request_ids: Requests to check; all requests if omitted
+            
+        Returns:
+            IDs of the requests whose collected_ml was corrected
+        """
+        collected = select(
+            func.coalesce(func.sum(Donation.blood_amount_ml), 0)
+        ).where(
+            Donation.blood_request_id == cls.model.id,
+            Donation.status == DonationStatus.COMPLETED
+        ).scalar_subquery()
+        
+        async with session_scope(session) as session:
+            query = (
+                update(cls.model)
+                .where(cls.model.collected_ml != collected)
+                .values(collected_ml=collected)
+                .returning(cls.model.id)
+                .execution_options(synchronize_session=False)
+            )
+            if request_ids is not None:
+                query = query.where(cls.model.id.in_(request_ids))
+            
+            result = await session.execute(query)
+            ids = list(result.scalars().all())
+            if ids:
+                cls._publish_bulk_change(session)
+            return ids
+    
+    @classmethod
+    async def get_dashboard_stats(
+        cls,
+        hospital_id: int,
+        days: int = 30,
+        session: Optional[AsyncSession] = None
+    ) -> Dict[str, Any]:
+        """
+        Get every figure shown on the hospital staff dashboard
+        
+        The counts come from a single query grouped by blood type; each
+        figure is a COUNT(*) FILTER (...) over the hospital's requests.
+        
+        Args:
+            hospital_id: Hospital to report on
+            days: Length of the recent period used for the fulfillment rate
+            
+        Returns:
+            Dictionary with status counts, the critical count, recent-period
+            counts, the fulfillment rate and open requests per blood type
+        """
+        since = datetime.now() - timedelta(days=days)
+        is_open = cls.model.status.in_([RequestStatus.PENDING, RequestStatus.APPROVED])
+        is_recent = cls.model.request_date >= since
+        
+        async with session_scope(session) as session:
+            query = select(
+                cls.model.blood_type,
+                func.count().filter(cls.model.status == RequestStatus.PENDING).label("pending"),
+                func.count().filter(cls.model.status == RequestStatus.APPROVED).label("approved"),
+                func.count().filter(cls.model.status == RequestStatus.FULFILLED).label("fulfilled"),
+                func.count().filter(and_(is_open, cls.model.urgency_level >= 4)).label("critical"),
+                func.count().filter(is_open).label("open"),
+                func.count().filter(is_recent).label("recent"),
+                func.count().filter(and_(is_recent, cls.model.status == RequestStatus.FULFILLED)).label("recent_fulfilled")
+            ).where(
+                cls.model.hospital_id == hospital_id
+            ).group_by(cls.model.blood_type)
+            
+            rows = (await session.execute(query)).all()
+        
+        requests_recent = sum(row.recent for row in rows)
+        fulfilled_recent = sum(row.recent_fulfilled for row in rows)
+        blood_type_counts = {blood_type.value: 0 for blood_type in BloodType}
+        blood_type_counts.update({row.blood_type.value: row.open for row in rows})
+        
+        return {
+            "pending_count": sum(row.pending for row in rows),
+            "approved_count": sum(row.approved for row in rows),
+            "fulfilled_count": sum(row.fulfilled for row in rows),
+            "critical_count": sum(row.critical for row in rows),
+            "requests_last_30_days": requests_recent,
+            "fulfilled_last_30_days": fulfilled_recent,
+            "fulfillment_rate": round(fulfilled_recent / requests_recent * 100) if requests_recent else 0,
+            "blood_type_counts": blood_type_counts
+        }
         
 
     @classmethod
-    async def find_one_with_staff(cls, **filter_by):
+    async def find_one_with_staff(cls, session: Optional[AsyncSession] = None, **filter_by):
         """Find one blood request with all relationships eager loaded"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(cls.model).options(
                 selectinload(cls.model.donations),
                 joinedload(cls.model.staff),
@@ -256,9 +427,9 @@ class BloodRequestDAO(BaseDAO):
             return result.scalar_one_or_none()
         
     @classmethod
-    async def find_one_with_all_relations(cls, request_id: int):
+    async def find_one_with_all_relations(cls, request_id: int, session: Optional[AsyncSession] = None):
         """Find blood request with all nested relationships for detail page"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(cls.model).options(
                 selectinload(cls.model.donations).selectinload(Donation.donor).selectinload(Donor.user),
                 joinedload(cls.model.staff),
@@ -269,11 +440,13 @@ class BloodRequestDAO(BaseDAO):
             return result.scalar_one_or_none()
         
     @classmethod
+    @cached_method(ttl=60, depends_on=("blood_requests", "hospitals"))
     async def find_hospitals_with_shortages(
         cls,
         blood_type: str,
         fulfillment_percentage: float = 50.0,
-        limit: int = 100
+        limit: int = 100,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find hospitals with blood requests of a specific type that don't have enough donations.
@@ -295,22 +468,8 @@ class BloodRequestDAO(BaseDAO):
         if not blood_type_enum:
             return []
         
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
-            WITH request_donations AS (
-                SELECT 
-                    br.id AS request_id,
-                    COALESCE(SUM(don.blood_amount_ml), 0) AS total_donated
-                FROM 
-                    blood_requests br
-                LEFT JOIN 
-                    donations don ON br.id = don.blood_request_id AND don.status = 'COMPLETED'
-                WHERE 
-                    br.blood_type = :blood_type
-                    AND br.status IN ('PENDING', 'APPROVED')
-                GROUP BY 
-                    br.id
-            )
             SELECT 
                 h.id AS hospital_id,
                 h.name AS hospital_name,
@@ -318,21 +477,19 @@ class BloodRequestDAO(BaseDAO):
                 br.id AS request_id,
                 br.blood_type,
                 br.amount_needed_ml,
-                COALESCE(rd.total_donated, 0) AS collected_ml,
-                (br.amount_needed_ml - COALESCE(rd.total_donated, 0)) AS shortage_ml,
-                COALESCE((rd.total_donated * 100.0 / NULLIF(br.amount_needed_ml, 0)), 0) AS fulfillment_percentage,
+                br.collected_ml,
+                (br.amount_needed_ml - br.collected_ml) AS shortage_ml,
+                COALESCE((br.collected_ml * 100.0 / NULLIF(br.amount_needed_ml, 0)), 0) AS fulfillment_percentage,
                 br.needed_by_date::date AS needed_by_date,
                 br.urgency_level
             FROM 
                 hospitals h
             JOIN 
                 blood_requests br ON h.id = br.hospital_id
-            JOIN
-                request_donations rd ON br.id = rd.request_id
             WHERE 
                 br.blood_type = :blood_type
                 AND br.status IN ('PENDING', 'APPROVED')
-                AND COALESCE((rd.total_donated * 100.0 / NULLIF(br.amount_needed_ml, 0)), 0) < :fulfillment_percentage
+                AND COALESCE((br.collected_ml * 100.0 / NULLIF(br.amount_needed_ml, 0)), 0) < :fulfillment_percentage
             ORDER BY 
                 br.urgency_level DESC,
                 br.needed_by_date ASC,
@@ -363,12 +520,14 @@ class BloodRequestDAO(BaseDAO):
         
 
     @classmethod
+    @cached_method(ttl=60, depends_on=("blood_requests", "hospital_staff", "hospitals", "users"))
     async def find_high_volume_requests(
         cls,
         min_volume_ml: int = 1000,
         min_urgency: int = 3,
         days: int = 30,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find high-volume blood requests that meet minimum urgency level.
@@ -379,7 +538,7 @@ class BloodRequestDAO(BaseDAO):
             days: Look ahead period in days
             limit: Maximum number of results
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
             SELECT 
                 br.id AS request_id,
@@ -390,8 +549,8 @@ class BloodRequestDAO(BaseDAO):
                 br.blood_type,
                 br.amount_needed_ml,
                 br.urgency_level,
-                COALESCE(SUM(d.blood_amount_ml), 0) AS collected_ml,
-                br.amount_needed_ml - COALESCE(SUM(d.blood_amount_ml), 0) AS remaining_ml,
+                br.collected_ml,
+                br.amount_needed_ml - br.collected_ml AS remaining_ml,
                 br.needed_by_date::date AS needed_by_date,
                 CURRENT_DATE + (:days * interval '1 day') AS cutoff_date,
                 u.first_name || ' ' || u.last_name AS staff_name,
@@ -404,17 +563,11 @@ class BloodRequestDAO(BaseDAO):
                 hospital_staff hs ON br.staff_id = hs.id
             JOIN 
                 users u ON hs.user_id = u.id
-            LEFT JOIN 
-                donations d ON br.id = d.blood_request_id AND d.status = 'COMPLETED'
             WHERE 
                 br.amount_needed_ml >= :min_volume_ml
                 AND br.urgency_level >= :min_urgency
                 AND br.status IN ('PENDING', 'APPROVED')
                 AND br.needed_by_date <= CURRENT_DATE + (:days * interval '1 day')
-            GROUP BY 
-                br.id, h.id, h.name, h.city, h.region, br.blood_type, 
-                br.amount_needed_ml, br.urgency_level, br.needed_by_date,
-                u.first_name, u.last_name, hs.role
             ORDER BY 
                 br.urgency_level DESC, 
                 br.needed_by_date ASC, 
@@ -441,4 +594,7 @@ class BloodRequestDAO(BaseDAO):
                         break
                 requests.append(request_dict)
                     
-            return requests
\ No newline at end of file
+            return requests
+
+
+subscribe([BloodRequest.__tablename__], BloodRequestDAO._evict_summary)
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Text, Enum as SQLEnum, CheckConstraint
+from sqlalchemy import ForeignKey, Text, Enum as SQLEnum, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime, timedelta
 from typing import List, Optional
@@ -8,6 +8,16 @@ from app.common.enums import BloodType, RequestStatus
 
 class BloodRequest(Base):
     __tablename__ = "blood_requests"
+    __table_args__ = (
+        Index("ix_blood_requests_hospital_id_status", "hospital_id", "status"),
+        Index("ix_blood_requests_blood_type_status_needed_by_date", "blood_type", "status", "needed_by_date"),
+        Index(
+            "ix_blood_requests_open_urgency_needed_by_date",
+            text("urgency_level DESC"),
+            "needed_by_date",
+            postgresql_where=text("status IN ('PENDING', 'APPROVED')")
+        ),
+    )
     
     id: Mapped[int_pk]
     hospital_id: Mapped[int] = mapped_column(ForeignKey("hospitals.id"))
@@ -35,6 +45,11 @@ class BloodRequest(Base):
         default=lambda: datetime.now().replace(tzinfo=None)
     )
     needed_by_date: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    collected_ml: Mapped[int] = mapped_column(
+        default=0,
+        server_default=text('0'),
+        comment="Blood collected from completed donations in milliliters, kept in step by DonationDAO"
+    )
     
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[created_at]
@@ -55,10 +70,7 @@ class BloodRequest(Base):
     @property
     def collected_amount_ml(self) -> int:
         """Sum of blood collected from completed donations"""
-        if not hasattr(self, 'donations') or self.donations is None:
-            return 0
-        return sum(d.blood_amount_ml for d in self.donations 
-                  if d.status == 'completed')
+        return self.collected_ml or 0
     
     @property
     def fulfillment_percentage(self) -> float:
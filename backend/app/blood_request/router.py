@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from typing import List, Optional
 from datetime import datetime, timedelta
 from app.blood_request.schemas import (
@@ -14,9 +14,12 @@ from app.blood_request.schemas import (
 )
 from app.blood_request.dao import BloodRequestDAO
 from app.donation.dao import DonationDAO
-from app.hospital_staff.dao import HospitalStaffDAO
-from app.users.dependencies import get_current_admin_user, get_current_hospital_staff, get_admin_or_hospital_staff
+from app.users.dependencies import StaffContext, get_current_admin_user, get_current_hospital_staff, get_current_staff_context, get_admin_or_hospital_staff
 from app.users.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
+from app.dao.pagination import NEXT_CURSOR_HEADER
+from app.common.streaming import ndjson_response
 
 
 router = APIRouter(prefix='/blood-requests', tags=['Blood Requests'])
@@ -28,7 +31,9 @@ router = APIRouter(prefix='/blood-requests', tags=['Blood Requests'])
             summary="Create a new blood request")
 async def create_blood_request(
     request_data: BloodRequestCreate,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Create a new blood request.
@@ -42,7 +47,7 @@ async def create_blood_request(
     Returns:
         The created blood request
     """
-    staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+    staff_profile = staff_context.staff
     
     if not staff_profile:
         raise HTTPException(
@@ -60,7 +65,7 @@ async def create_blood_request(
         days = 1 if blood_request_data["urgency_level"] >= 4 else 7
         blood_request_data["needed_by_date"] = datetime.now() + timedelta(days=days)
     
-    blood_request = await BloodRequestDAO.add(**blood_request_data)
+    blood_request = await BloodRequestDAO.add(**blood_request_data, session=session)
     
     return blood_request
 
@@ -69,28 +74,90 @@ async def create_blood_request(
            response_model=List[BloodRequestResponse],
            summary="Get all blood requests")
 async def get_blood_requests(
+    response: Response,
     hospital_id: Optional[int] = None,
     status: Optional[str] = None,
     blood_type: Optional[str] = None,
     urgency_min: Optional[int] = None,
-    current_user: User = Depends(get_current_hospital_staff)
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
-    Get all blood requests with optional filtering.
+    Get blood requests with optional filtering.
+    
+    Results are ordered by id and returned one page at a time; the cursor
+    for the next page is sent in the X-Next-Cursor header.
     
     Args:
         hospital_id: Filter by hospital ID
         status: Filter by request status
         blood_type: Filter by blood type
         urgency_min: Filter by minimum urgency level (1-5)
+        limit: Maximum number of requests to return
+        after: Cursor of the previous page
         
     Returns:
         List of blood requests matching the filter criteria
     """
+    filters = _blood_request_filters(
+        staff_context, hospital_id, status, blood_type, urgency_min
+    )
+    
+    try:
+        blood_requests, next_cursor = await BloodRequestDAO.find_page(
+            urgency_min=urgency_min,
+            limit=limit,
+            after=after,
+            session=session,
+            **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return blood_requests
+
+
+@router.get("/stream",
+           summary="Stream blood requests as NDJSON")
+async def stream_blood_requests(
+    hospital_id: Optional[int] = None,
+    status: Optional[str] = None,
+    blood_type: Optional[str] = None,
+    urgency_min: Optional[int] = None,
+    staff_context: StaffContext = Depends(get_current_staff_context)
+):
+    """
+    Stream all matching blood requests as newline-delimited JSON.
+    
+    Accepts the same filters and access rules as GET /blood-requests/.
+    Rows are read through a server-side cursor, so memory use stays flat
+    however many requests match.
+    """
+    filters = _blood_request_filters(
+        staff_context, hospital_id, status, blood_type, urgency_min
+    )
+    return ndjson_response(
+        BloodRequestDAO.stream(urgency_min=urgency_min, **filters),
+        BloodRequestResponse
+    )
+
+
+def _blood_request_filters(
+    staff_context: StaffContext,
+    hospital_id: Optional[int],
+    request_status: Optional[str],
+    blood_type: Optional[str],
+    urgency_min: Optional[int]
+) -> dict:
+    """Build list filters, restricting non-admin staff to their own hospital"""
     filters = {}
     
-    if not current_user.is_admin:
-        staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+    if not staff_context.user.is_admin:
+        staff_profile = staff_context.staff
         if not staff_profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -100,27 +167,19 @@ async def get_blood_requests(
     elif hospital_id:
         filters["hospital_id"] = hospital_id
     
-    if status:
-        filters["status"] = status
+    if request_status:
+        filters["status"] = request_status
         
     if blood_type:
         filters["blood_type"] = blood_type
     
-    if urgency_min is not None:
-        if urgency_min < 1 or urgency_min > 5:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Urgency level must be between 1 and 5"
-            )
-            
-        blood_requests = await BloodRequestDAO.find_by_min_urgency(
-            urgency_min=urgency_min, 
-            **filters
+    if urgency_min is not None and (urgency_min < 1 or urgency_min > 5):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Urgency level must be between 1 and 5"
         )
-    else:
-        blood_requests = await BloodRequestDAO.find_all(**filters)
     
-    return blood_requests
+    return filters
 
 
 @router.get("/my-hospital", 
@@ -129,7 +188,9 @@ async def get_blood_requests(
 async def get_my_hospital_blood_requests(
     status: Optional[str] = None,
     urgency_min: Optional[int] = None,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Get all blood requests for the staff member's hospital.
@@ -141,7 +202,7 @@ async def get_my_hospital_blood_requests(
     Returns:
         List of blood requests for the user's hospital
     """
-    staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+    staff_profile = staff_context.staff
     
     if not staff_profile:
         raise HTTPException(
@@ -162,10 +223,11 @@ async def get_my_hospital_blood_requests(
             )
         blood_requests = await BloodRequestDAO.find_by_min_urgency(
             urgency_min=urgency_min, 
-            **filters
+            **filters,
+            session=session
         )
     else:
-        blood_requests = await BloodRequestDAO.find_all(**filters)
+        blood_requests = await BloodRequestDAO.find_all(**filters, session=session)
     
     return blood_requests
 
@@ -175,7 +237,9 @@ async def get_my_hospital_blood_requests(
            summary="Get blood request statistics")
 async def get_blood_request_summary(
     hospital_id: Optional[int] = None,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Get summary statistics for blood requests.
@@ -187,7 +251,7 @@ async def get_blood_request_summary(
         Summary statistics about blood requests
     """
     if not current_user.is_admin and hospital_id:
-        staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+        staff_profile = staff_context.staff
         if staff_profile and hospital_id != staff_profile.hospital_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -195,7 +259,7 @@ async def get_blood_request_summary(
             )
     
     if not current_user.is_admin and not hospital_id:
-        staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+        staff_profile = staff_context.staff
         if not staff_profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -203,7 +267,7 @@ async def get_blood_request_summary(
             )
         hospital_id = staff_profile.hospital_id
     
-    summary = await BloodRequestDAO.get_summary(hospital_id)
+    summary = await BloodRequestDAO.get_summary(hospital_id, session=session)
     
     return summary
 
@@ -213,7 +277,9 @@ async def get_blood_request_summary(
            summary="Get blood request by ID")
 async def get_blood_request(
     request_id: int,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Retrieve a specific blood request by ID.
@@ -228,7 +294,7 @@ async def get_blood_request(
         404: If the blood request doesn't exist
         403: If user doesn't have permission to view the request
     """
-    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id)
+    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id, session=session)
     
     if not blood_request:
         raise HTTPException(
@@ -237,7 +303,7 @@ async def get_blood_request(
         )
     
     if not current_user.is_admin:
-        staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+        staff_profile = staff_context.staff
         if not staff_profile or blood_request.hospital_id != staff_profile.hospital_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -253,7 +319,9 @@ async def get_blood_request(
 async def update_blood_request(
     request_id: int,
     request_data: BloodRequestUpdate,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Update an existing blood request.
@@ -262,7 +330,7 @@ async def update_blood_request(
     Updates are only allowed for requests with status pending or approved.
     """
     # Get the staff profile to check hospital association
-    staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+    staff_profile = staff_context.staff
     if not staff_profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -270,7 +338,7 @@ async def update_blood_request(
         )
 
     # Find the blood request
-    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id)
+    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id, session=session)
     if not blood_request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -303,7 +371,11 @@ async def update_blood_request(
         )
     
     # Update the blood request - pass the request_id directly, not a clause
-    updated_request = await BloodRequestDAO.update(request_id, **update_data)
+    updated_request = await BloodRequestDAO.update(
+        request_id,
+        session=session,
+        **update_data
+    )
     
     if not updated_request:
         raise HTTPException(
@@ -320,7 +392,9 @@ async def update_blood_request(
 async def update_blood_request_status(
     request_id: int,
     status_data: BloodRequestStatusUpdate,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Update the status of a blood request.
@@ -337,7 +411,7 @@ async def update_blood_request_status(
         403: If user doesn't have permission to update the request
         400: If the status transition is not allowed
     """
-    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id)
+    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id, session=session)
     
     if not blood_request:
         raise HTTPException(
@@ -346,7 +420,7 @@ async def update_blood_request_status(
         )
     
     if not current_user.is_admin:
-        staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+        staff_profile = staff_context.staff
         if not staff_profile or blood_request.hospital_id != staff_profile.hospital_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -374,13 +448,19 @@ async def update_blood_request_status(
             update_notes = f"{blood_request.notes}\n{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {status_data.reason}"
         update_data["notes"] = update_notes
     
-    updated_request = await BloodRequestDAO.update(request_id, **update_data)
+    updated_request = await BloodRequestDAO.update(
+        request_id,
+        session=session,
+        **update_data
+    )
     
     if status_data.status == "fulfilled":
-        donations = await DonationDAO.get_request_donations(request_id)
-        for donation in donations:
-            if donation.status == "scheduled":
-                await DonationDAO.update_status(donation.id, "completed", "Blood request fulfilled")
+        donations = await DonationDAO.get_request_donations(request_id, session=session)
+        await DonationDAO.complete_donations(
+            [donation.id for donation in donations if donation.status == "scheduled"],
+            "Blood request fulfilled",
+            session=session
+        )
     
     return updated_request
 
@@ -389,7 +469,7 @@ async def update_blood_request_status(
               status_code=status.HTTP_204_NO_CONTENT,
               summary="Delete a blood request",
               dependencies=[Depends(get_admin_or_hospital_staff)])
-async def delete_blood_request(request_id: int):
+async def delete_blood_request(request_id: int, session: AsyncSession = Depends(get_session)):
     """
     Delete a blood request (admin only) & (hospitall staf).
     
@@ -399,7 +479,7 @@ async def delete_blood_request(request_id: int):
     Raises:
         404: If the blood request doesn't exist
     """
-    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id)
+    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id, session=session)
     
     if not blood_request:
         raise HTTPException(
@@ -407,7 +487,7 @@ async def delete_blood_request(request_id: int):
             detail=f"Sorry, we couldn't find blood request #{request_id}. Please verify the request ID and try again."
         )
     
-    donations = await DonationDAO.get_request_donations(request_id)
+    donations = await DonationDAO.get_request_donations(request_id, session=session)
     completed_donations = [d for d in donations if d.status == "completed"]
     
     if completed_donations:
@@ -423,11 +503,9 @@ async def delete_blood_request(request_id: int):
     scheduled_donations = [d for d in donations if d.status == "scheduled"]
     if scheduled_donations:
         print(f"Unlinking {len(scheduled_donations)} scheduled donations from request #{request_id}")
-        
-    for donation in scheduled_donations:
-        await DonationDAO.update(donation.id, blood_request_id=None)
     
-    await BloodRequestDAO.delete(id=request_id)
+    # Remaining donations are unlinked by the same set-based delete
+    await BloodRequestDAO.delete(id=request_id, session=session)
     
     return None
 
@@ -436,14 +514,16 @@ async def delete_blood_request(request_id: int):
 @router.get("/query/hospitals-with-shortages", response_model=List[BloodShortageResponse])
 async def get_hospitals_with_blood_shortages(
     query_params: BloodShortageQueryParams = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """Find hospitals with blood requests matching a specific blood type but not enough donations"""
     
     shortages = await BloodRequestDAO.find_hospitals_with_shortages(
         blood_type=query_params.blood_type,
         fulfillment_percentage=query_params.fulfillment_percentage,
-        limit=query_params.limit
+        limit=query_params.limit,
+        session=session
     )
     
     if not shortages:
@@ -455,7 +535,8 @@ async def get_hospitals_with_blood_shortages(
 @router.get("/query/high-volume-requests", response_model=List[HighVolumeRequestResponse])
 async def get_high_volume_requests(
     query_params: HighVolumeRequestParams = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """Find high-volume blood requests with minimum urgency level"""
     
@@ -463,7 +544,8 @@ async def get_high_volume_requests(
         min_volume_ml=query_params.min_volume_ml,
         min_urgency=query_params.min_urgency,
         days=query_params.days,
-        limit=query_params.limit
+        limit=query_params.limit,
+        session=session
     )
     
     if not requests:
@@ -0,0 +1,405 @@
+import asyncio
+import copy
+import functools
+import inspect
+import json
+import pickle
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+from app.config import settings
+from app.common.events import ChangeEvent, subscribe
+from app.common.singleflight import SingleFlight
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # redis is only needed for DAO_CACHE_BACKEND=redis
+    redis_asyncio = None
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small in-process cache whose entries expire after a fixed time.
+
+    Once maxsize is reached the least recently used entry is evicted.
+    Hit and miss counters are kept for the monitoring endpoint.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024, name: Optional[str] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= monotonic():
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches the predicate."""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class StaleWhileRevalidate:
+    """
+    Single cached value refreshed in the background once it goes stale.
+
+    Within fresh_ttl the cached value is returned as is. After that and up
+    to max_stale it is still returned immediately while one background task
+    reloads it. Only a cold cache, or a value older than max_stale, makes the
+    caller wait for the loader.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[Any]],
+        fresh_ttl: float,
+        max_stale: float,
+        name: Optional[str] = None
+    ):
+        self.loader = loader
+        self.fresh_ttl = fresh_ttl
+        self.max_stale = max_stale
+        self.name = name
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._value: Any = _MISSING
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get(self) -> Any:
+        age = monotonic() - self._loaded_at
+        if self._value is not _MISSING and age < self.fresh_ttl:
+            self.hits += 1
+            return self._value
+
+        if self._value is not _MISSING and age < self.max_stale:
+            self.stale_hits += 1
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh_in_background())
+            return self._value
+
+        async with self._lock:
+            # Another caller may have loaded the value while we waited
+            if self._value is _MISSING or monotonic() - self._loaded_at >= self.max_stale:
+                self.misses += 1
+                await self._refresh()
+            return self._value
+
+    async def _refresh(self):
+        value = await self.loader()
+        self._value = value
+        self._loaded_at = monotonic()
+
+    async def _refresh_in_background(self):
+        try:
+            await self._refresh()
+        except Exception as e:
+            # Keep serving the stale value; the next stale hit retries
+            print(f"Error refreshing {self.name or 'cache'}: {e}")
+
+    def expire(self):
+        """Mark the value stale so the next read triggers a background refresh."""
+        self._loaded_at = min(self._loaded_at, monotonic() - self.fresh_ttl)
+
+    def clear(self):
+        self._value = _MISSING
+        self._loaded_at = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "fresh_ttl": self.fresh_ttl,
+            "max_stale": self.max_stale,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+
+class MemoryCacheBackend:
+    """In-process backend for cached DAO methods: LRU with per-entry TTL."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(ttl=0, maxsize=maxsize, name="dao_methods")
+
+    async def get(self, key: str) -> Any:
+        return self._cache.get(key, _MISSING)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+    async def invalidate_prefix(self, prefix: str):
+        self._cache.invalidate_where(lambda key: key.startswith(prefix))
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "size": len(self._cache), "maxsize": self._cache.maxsize}
+
+
+class RedisCacheBackend:
+    """
+    Out-of-process backend for cached DAO methods.
+
+    Works with any server speaking the Redis protocol (Redis, Valkey or a
+    local stand-in); entries expire server-side and values are pickled.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str):
+        if redis_asyncio is None:
+            raise RuntimeError("DAO_CACHE_BACKEND=redis requires the 'redis' package (install the redis extra)")
+        self._client = redis_asyncio.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Any:
+        raw = await self._client.get(self._prefix + key)
+        return _MISSING if raw is None else pickle.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._client.set(self._prefix + key, pickle.dumps(value), px=max(1, int(ttl * 1000)))
+
+    async def invalidate_prefix(self, prefix: str):
+        keys = [key async for key in self._client.scan_iter(match=self._prefix + prefix + "*")]
+        if keys:
+            await self._client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+
+_dao_cache_backend = None
+_cached_methods: List["CachedMethod"] = []
+
+# Concurrent misses for the same key share one database query
+dao_flights = SingleFlight(name="dao_methods")
+
+
+def get_dao_cache_backend():
+    """Backend shared by all cached DAO methods, created on first use from settings."""
+    global _dao_cache_backend
+    if _dao_cache_backend is None:
+        if settings.DAO_CACHE_BACKEND == "redis":
+            _dao_cache_backend = RedisCacheBackend(settings.DAO_CACHE_REDIS_URL, settings.DAO_CACHE_KEY_PREFIX)
+        else:
+            _dao_cache_backend = MemoryCacheBackend(settings.DAO_CACHE_MAX_ENTRIES)
+    return _dao_cache_backend
+
+
+def set_dao_cache_backend(backend):
+    """Replace the shared backend, e.g. with a fresh MemoryCacheBackend in tests."""
+    global _dao_cache_backend
+    _dao_cache_backend = backend
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return _normalize(value.value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(item) for item in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    return value
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy list and dict results so callers cannot mutate what the cache holds."""
+    if isinstance(value, (list, dict)):
+        return copy.deepcopy(value)
+    return value
+
+
+class CachedMethod:
+    """
+    Wrapper produced by cached_method; keeps per-method hit and miss counters.
+
+    ``generation`` counts invalidations. A load records it before querying
+    and only stores its result if no invalidation happened in between, so a
+    slow load cannot put back data that a committed write already evicted.
+    """
+
+    def __init__(self, func: Callable, ttl: float):
+        self.func = func
+        self.ttl = ttl
+        self.name = func.__qualname__
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self.generation = 0
+        self._signature = inspect.signature(func)
+        self._pending: set = set()
+        functools.update_wrapper(self, func)
+
+    def make_key(self, *args, **kwargs) -> str:
+        """
+        Build the cache key from the call arguments.
+
+        Arguments are bound to the signature with defaults applied, so
+        positional, keyword and omitted-default forms of the same call share a
+        key. The owning class (first parameter) and session are left out.
+        """
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop(next(iter(self._signature.parameters)), None)
+        arguments.pop("session", None)
+        normalized = json.dumps(_normalize(arguments), sort_keys=True, default=str, separators=(",", ":"))
+        return f"{self.name}:{normalized}"
+
+    async def __call__(self, *args, **kwargs):
+        backend = get_dao_cache_backend()
+        key = self.make_key(*args, **kwargs)
+
+        try:
+            value = await backend.get(key)
+        except Exception as e:
+            # A broken cache must not take the endpoint down with it
+            self.errors += 1
+            print(f"Error reading cache for {self.name}: {e}")
+            return await self.func(*args, **kwargs)
+
+        if value is not _MISSING:
+            self.hits += 1
+            return _copy_result(value)
+
+        # Callers arriving after an invalidation do not join a load started before it
+        flight_key = f"{key}@{self.generation}"
+        if dao_flights.is_in_flight(flight_key):
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        value = await dao_flights.do(flight_key, lambda: self._load(backend, key, args, kwargs))
+        return _copy_result(value)
+
+    async def _load(self, backend, key: str, args: tuple, kwargs: dict) -> Any:
+        generation = self.generation
+        # The result is shared by every coalesced caller, so it is computed in
+        # a private session rather than in the first caller's transaction
+        bound = self._signature.bind(*args, **kwargs)
+        if "session" in self._signature.parameters:
+            bound.arguments["session"] = None
+        value = await self.func(*bound.args, **bound.kwargs)
+
+        if generation != self.generation:
+            # Invalidated while loading; the result may predate the write
+            return value
+        try:
+            await backend.set(key, value, self.ttl)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error writing cache for {self.name}: {e}")
+        return value
+
+    async def invalidate(self):
+        """Drop every cached result of this method."""
+        self.generation += 1
+        await get_dao_cache_backend().invalidate_prefix(f"{self.name}:")
+
+    def on_change(self, change: ChangeEvent):
+        """Evict this method's results after a committed write to a table it reads."""
+        self.evictions += 1
+        # Bumped now, not in the task, so loads already running skip their write
+        self.generation += 1
+        task = asyncio.get_running_loop().create_task(self.invalidate())
+        # Keep a reference until done so the task is not garbage collected
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
+        }
+
+
+def cached_method(ttl: Optional[float] = None, depends_on: Sequence[str] = ()):
+    """
+    Cache the results of an async DAO method.
+
+    Apply it below @classmethod. Results are keyed by the normalised call
+    arguments and kept for ``ttl`` seconds (DAO_CACHE_DEFAULT_TTL if
+    omitted) in the backend chosen by DAO_CACHE_BACKEND. A committed write
+    to any table in ``depends_on`` evicts the method's results. Only use it
+    for methods returning plain data, not ORM instances.
+    """
+    def decorator(func: Callable) -> CachedMethod:
+        method = CachedMethod(func, settings.DAO_CACHE_DEFAULT_TTL if ttl is None else ttl)
+        _cached_methods.append(method)
+        subscribe(depends_on, method.on_change)
+        return method
+    return decorator
+
+
+def dao_cache_stats() -> Dict[str, Any]:
+    """Backend state and counters of every cached DAO method."""
+    return {
+        "backend": get_dao_cache_backend().stats(),
+        "single_flight": dao_flights.stats(),
+        "methods": [method.stats() for method in _cached_methods],
+    }
@@ -0,0 +1,86 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    A committed write to one row, or to many rows when id is None.
+
+    hospital_id and blood_type are filled in when the row has them; None
+    means "unknown", so subscribers should treat it as "any".
+    """
+    table: str
+    id: Optional[int] = None
+    hospital_id: Optional[int] = None
+    blood_type: Optional[str] = None
+
+    @classmethod
+    def for_instance(cls, instance: Any, hospital_id: Any = ..., blood_type: Any = ...) -> "ChangeEvent":
+        """Build the event for an ORM instance, reading the hospital and blood type from it by default."""
+        if hospital_id is ...:
+            hospital_id = getattr(instance, "hospital_id", None)
+        if blood_type is ...:
+            blood_type = getattr(instance, "blood_type", None)
+        if isinstance(blood_type, Enum):
+            blood_type = blood_type.value
+        return cls(instance.__tablename__, instance.id, hospital_id, blood_type)
+
+
+Subscriber = Callable[[ChangeEvent], None]
+
+_subscribers: Dict[str, List[Subscriber]] = defaultdict(list)
+
+_PENDING_KEY = "pending_change_events"
+
+
+def subscribe(tables: Iterable[str], handler: Subscriber):
+    """
+    Call handler with every committed ChangeEvent for the given tables.
+
+    Handlers run synchronously right after the commit and must be cheap;
+    exceptions are reported and swallowed so one handler cannot break a
+    request or the other handlers.
+    """
+    for table in tables:
+        _subscribers[table].append(handler)
+
+
+def publish(session: AsyncSession, *events: ChangeEvent):
+    """
+    Queue events on the session; they are delivered once its transaction commits.
+
+    Nothing is delivered if the transaction rolls back, so caches are never
+    evicted for writes that did not happen, and are not refilled with the
+    old data before the new data is visible.
+    """
+    session.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+def dispatch(events: Iterable[ChangeEvent]):
+    for change in events:
+        for handler in _subscribers.get(change.table, ()):
+            try:
+                handler(change)
+            except Exception as e:
+                print(f"Error handling {change}: {e}")
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver_pending_events(session: Session):
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        dispatch(events)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_events(session: Session, transaction):
+    # Anything left when the outermost transaction ends was rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
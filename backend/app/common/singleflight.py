@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is still running await the same task and get the same result
+    (or exception). The task is shielded, so a caller that is cancelled,
+    e.g. by a client disconnect, does not cancel it for the others.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.executions += 1
+        task = asyncio.ensure_future(func())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller went away
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,31 @@
+from typing import AsyncIterator, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_response(
+    items: AsyncIterator,
+    schema: Type[BaseModel],
+    lines_per_chunk: int = 100
+) -> StreamingResponse:
+    """
+    Stream objects as newline-delimited JSON, one schema-validated object per line.
+
+    Objects are serialised as they arrive and written in small chunks, so
+    memory use does not depend on the size of the result.
+    """
+    async def body():
+        lines = []
+        async for item in items:
+            lines.append(schema.model_validate(item, from_attributes=True).model_dump_json())
+            if len(lines) >= lines_per_chunk:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
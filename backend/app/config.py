@@ -12,6 +12,28 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     SECRET_KEY: str
     ALGORITHM: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    SUMMARY_CACHE_TTL: float = 15.0
+    HOME_STATS_TTL: float = 60.0
+    HOME_STATS_MAX_STALE: float = 3600.0
+    # The principal cache lives in each worker process and writes only evict
+    # it in the process that committed them, so with several workers a role
+    # change or deactivation can take up to PRINCIPAL_CACHE_TTL to apply.
+    PRINCIPAL_CACHE_TTL: float = 60.0
+    PRINCIPAL_CACHE_SIZE: int = 4096
+    PASSWORD_HASH_CONCURRENCY: int = 4
+    # "memory" (per process) or "redis", which needs the redis extra:
+    # pip install "backend[redis]" / poetry install --extras redis
+    DAO_CACHE_BACKEND: str = "memory"
+    DAO_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    DAO_CACHE_KEY_PREFIX: str = "blood-donor:dao:"
+    DAO_CACHE_MAX_ENTRIES: int = 2048
+    DAO_CACHE_DEFAULT_TTL: float = 300.0
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
     )
@@ -25,6 +47,17 @@ def get_db_url():
             f"{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}")
 
 
+def get_pool_settings():
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    }
+
+
 def get_auth_data():
     return {"secret_key": settings.SECRET_KEY, "algorithm": settings.ALGORITHM}
 
@@ -1,6 +1,12 @@
-from app.database import async_session_maker
-from sqlalchemy import select
-from sqlalchemy.exc import SQLAlchemyError
+import enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from app.database import session_scope
+from app.dao.pagination import keyset_filter, split_page
+from app.common.events import ChangeEvent, publish
+from sqlalchemy import select, func, update, delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class BaseDAO:
@@ -8,98 +14,433 @@ class BaseDAO:
 
 
     @classmethod
-    async def find_one_or_none(cls, **filter_by):
-        async with async_session_maker() as session:
+    def _publish_bulk_change(cls, session: AsyncSession):
+        """Announce a write to an unknown set of rows; subscribers evict everything for the table."""
+        publish(session, ChangeEvent(cls.model.__tablename__))
+
+
+    @classmethod
+    async def find_one_or_none(cls, session: Optional[AsyncSession] = None, **filter_by):
+        async with session_scope(session) as session:
             query = select(cls.model).filter_by(**filter_by)
             result = await session.execute(query)
             return result.scalar_one_or_none()
 
 
     @classmethod
-    async def add(cls, **values):
+    async def add(cls, session: Optional[AsyncSession] = None, **values):
         """
         Asynchronously creates a new instance of the model with the specified values.
-        
+
         Arguments:
+            session: Optional session to run in; a private one is used if omitted.
             **values: Named parameters for creating a new instance of the model.
-            
+
         Returns:
             The created instance of the model.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             # Remove ID if it's being passed manually
             if 'id' in values:
                 del values['id']
-                
+
             new_instance = cls.model(**values)
             session.add(new_instance)
-            
-            try:
-                # Commit the session to save the new instance
-                await session.commit()
-                
-                # Create a new transaction for the refresh operation
-                # This is outside the previous transaction context
-                await session.refresh(new_instance)
-                return new_instance
-            except SQLAlchemyError as e:
-                await session.rollback()
-                raise e
+
+            # Flush instead of commit: the session scope owns the transaction
+            await session.flush()
+            await session.refresh(new_instance)
+            publish(session, ChangeEvent.for_instance(new_instance))
+            return new_instance
+
+    @classmethod
+    async def add_many(
+        cls,
+        rows: Sequence[Dict[str, Any]],
+        session: Optional[AsyncSession] = None,
+        chunk_size: int = 1000,
+        on_conflict: Optional[str] = None,
+        conflict_target: Optional[str] = None,
+        returning: bool = True
+    ) -> List[int]:
+        """
+        Insert many rows in batches.
+
+        Each chunk is sent as one statement: with returning=True SQLAlchemy
+        packs it into multi-row INSERT ... RETURNING id, otherwise it goes
+        through asyncpg executemany.
+
+        Arguments:
+            rows: Column values for each new record.
+            session: Optional session to run in; a private one is used if omitted.
+            chunk_size: Number of rows sent per statement.
+            on_conflict: None to fail on duplicates, "skip" to ignore rows that
+                violate a unique constraint, "upsert" to update the existing row.
+            conflict_target: Unique column used to detect conflicts (e.g. "email").
+                Required for "upsert"; with "skip" any unique constraint counts.
+            returning: Collect and return the IDs of the inserted rows.
+
+        Returns:
+            IDs of inserted (or upserted) rows, in input order when on_conflict
+            is None. Skipped rows are not included.
+        """
+        if on_conflict not in (None, "skip", "upsert"):
+            raise ValueError(f"Invalid on_conflict: {on_conflict}. Must be one of: skip, upsert")
+        if on_conflict == "upsert" and not conflict_target:
+            raise ValueError("conflict_target is required for on_conflict='upsert'")
+
+        rows = [{key: value for key, value in row.items() if key != 'id'} for row in rows]
+        ids: List[int] = []
+
+        async with session_scope(session) as session:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                query = cls._insert_statement(chunk, on_conflict, conflict_target)
+
+                if returning:
+                    # IDs follow input order unless rows may be skipped on conflict
+                    query = query.returning(cls.model.id, sort_by_parameter_order=on_conflict is None)
+                    result = await session.execute(query, chunk)
+                    ids.extend(result.scalars().all())
+                else:
+                    await session.execute(query, chunk)
+
+            if rows:
+                cls._publish_bulk_change(session)
+
+        return ids
+
+    @classmethod
+    def _insert_statement(cls, rows, on_conflict: Optional[str], conflict_target: Optional[str]):
+        if on_conflict is None:
+            return insert(cls.model)
+
+        query = pg_insert(cls.model)
+        index_elements = [conflict_target] if conflict_target else None
+
+        if on_conflict == "skip":
+            return query.on_conflict_do_nothing(index_elements=index_elements)
+
+        columns = sorted({key for row in rows for key in row})
+        set_ = {
+            key: query.excluded[key]
+            for key in columns
+            if key not in (conflict_target, 'id', 'created_at')
+        }
+        if 'updated_at' in cls.model.__table__.columns:
+            set_['updated_at'] = func.now()
+        return query.on_conflict_do_update(index_elements=index_elements, set_=set_)
 
     @classmethod
-    async def count(cls):
+    async def copy_records(
+        cls,
+        rows: Sequence[Dict[str, Any]],
+        session: Optional[AsyncSession] = None,
+        chunk_size: int = 10000
+    ) -> List[int]:
+        """
+        Stream rows into the table with PostgreSQL COPY.
+
+        COPY cannot return generated keys, so IDs are reserved from the
+        table's sequence first and sent along with the rows. Python-side
+        column defaults are filled in; server defaults apply to columns that
+        no row provides. There is no conflict handling: a duplicate fails
+        the whole chunk.
+
+        Arguments:
+            rows: Column values for each new record. All rows must have the same keys.
+            session: Optional session to run in; a private one is used if omitted.
+            chunk_size: Number of rows per COPY.
+
+        Returns:
+            IDs of the inserted rows, in input order.
+        """
+        table = cls.model.__table__
+        rows = [cls._apply_python_defaults(row) for row in rows]
+        if not rows:
+            return []
+
+        columns = [key for key in rows[0] if key != 'id']
+        ids: List[int] = []
+
+        async with session_scope(session) as session:
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            driver = raw_connection.driver_connection
+
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                chunk_ids = [
+                    record[0] for record in await driver.fetch(
+                        "SELECT nextval(pg_get_serial_sequence($1, 'id')) "
+                        "FROM generate_series(1, $2)",
+                        table.name, len(chunk)
+                    )
+                ]
+                records = [
+                    (new_id, *[cls._copy_value(row[key]) for key in columns])
+                    for new_id, row in zip(chunk_ids, chunk)
+                ]
+                await driver.copy_records_to_table(
+                    table.name,
+                    records=records,
+                    columns=['id', *columns]
+                )
+                ids.extend(chunk_ids)
+
+            cls._publish_bulk_change(session)
+
+        return ids
+
+    @classmethod
+    def _apply_python_defaults(cls, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        for column in cls.model.__table__.columns:
+            default = column.default
+            if column.key in row or default is None:
+                continue
+            if default.is_scalar:
+                row[column.key] = default.arg
+            elif default.is_callable:
+                row[column.key] = default.arg(None)
+        return row
+
+    @staticmethod
+    def _copy_value(value):
+        # SQLEnum columns store the enum member name
+        if isinstance(value, enum.Enum):
+            return value.name
+        return value
+
+    @classmethod
+    async def update_returning(
+        cls,
+        id: int,
+        session: Optional[AsyncSession] = None,
+        load: Sequence[str] = (),
+        **values
+    ):
+        """
+        Update a record by ID with a single UPDATE ... RETURNING statement.
+
+        Arguments:
+            id: ID of the record to update.
+            session: Optional session to run in; a private one is used if omitted.
+            load: Names of relationships to load on the returned instance.
+                Nothing is loaded unless asked for.
+            **values: Column values to set.
+
+        Returns:
+            The updated instance of the model or None if nothing is found.
+        """
+        async with session_scope(session) as session:
+            if not values:
+                query = select(cls.model).filter_by(id=id)
+            else:
+                query = (
+                    update(cls.model)
+                    .where(cls.model.id == id)
+                    .values(**values)
+                    .returning(cls.model)
+                )
+
+            if load:
+                query = query.options(*[selectinload(getattr(cls.model, name)) for name in load])
+
+            # Overwrite any copy of the row already held by this session
+            query = query.execution_options(populate_existing=True)
+
+            result = await session.execute(query)
+            instance = result.scalar_one_or_none()
+            if values and instance is not None:
+                publish(session, ChangeEvent.for_instance(instance))
+                if values.keys() & {"hospital_id", "blood_type"}:
+                    # The row moved; the keys it used to count under are unknown
+                    publish(session, ChangeEvent(cls.model.__tablename__, instance.id))
+            return instance
+
+    @classmethod
+    async def count(cls, session: Optional[AsyncSession] = None):
         """
         Count total number of records
         """
-        async with async_session_maker() as session:
-            from sqlalchemy import func
+        async with session_scope(session) as session:
             query = select(func.count()).select_from(cls.model)
             result = await session.execute(query)
             return result.scalar() or 0
 
 
     @classmethod
-    async def delete(cls, id: int) -> bool:
+    async def delete(cls, id: int, session: Optional[AsyncSession] = None) -> bool:
         """Delete a record by ID"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             obj = await session.get(cls.model, id)
             if not obj:
                 return False
-            
+
             await session.delete(obj)
-            await session.commit()
+            await session.flush()
+            publish(session, ChangeEvent.for_instance(obj))
             return True
-            
+
+
+    @classmethod
+    async def delete_where(
+        cls,
+        *where,
+        session: Optional[AsyncSession] = None,
+        cascade: Sequence = (),
+        dry_run: bool = False,
+        **filter_by
+    ) -> List[int]:
+        """
+        Delete every matching record with a single DELETE ... WHERE ... RETURNING id.
+
+        Arguments:
+            *where: Extra SQL conditions, combined with AND.
+            session: Optional session to run in; a private one is used if omitted.
+            cascade: Foreign key columns of dependent tables (e.g. Donation.blood_request_id)
+                whose rows referencing the deleted records are deleted first.
+            dry_run: Only select the matching IDs; nothing is deleted.
+            **filter_by: Filtering criteria in the form of named parameters.
+
+        Returns:
+            IDs of the deleted records, or of the records that would be deleted
+            in dry-run mode. Use len() for the count.
+        """
+        async with session_scope(session) as session:
+            if dry_run:
+                query = select(cls.model.id).where(*where).filter_by(**filter_by)
+                result = await session.execute(query)
+                return list(result.scalars().all())
+
+            matching_ids = select(cls.model.id).where(*where).filter_by(**filter_by)
+            for fk_column in cascade:
+                await session.execute(
+                    delete(fk_column.table).where(fk_column.in_(matching_ids))
+                )
+                publish(session, ChangeEvent(fk_column.table.name))
+
+            query = (
+                delete(cls.model)
+                .where(*where)
+                .filter_by(**filter_by)
+                .returning(cls.model.id)
+            )
+            result = await session.execute(query)
+            ids = list(result.scalars().all())
+            publish(session, *[
+                ChangeEvent(cls.model.__tablename__, deleted_id, filter_by.get("hospital_id"))
+                for deleted_id in ids
+            ])
+            return ids
 
     @classmethod
-    async def find_one_or_none_by_id(cls, data_id: int):
+    async def find_one_or_none_by_id(cls, data_id: int, session: Optional[AsyncSession] = None):
         """
         Asynchronously finds and returns one instance of the model by the specified criteria or None.
 
         Arguments:
             data_id: The filtering criteria in the form of a record identifier.
+            session: Optional session to run in; a private one is used if omitted.
 
         Returns:
             An instance of the model or None if nothing is found.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(cls.model).filter_by(id=data_id)
             result = await session.execute(query)
             return result.scalar_one_or_none()
-        
+
 
     @classmethod
-    async def find_all(cls, **filter_by):
+    async def find_all(cls, session: Optional[AsyncSession] = None, **filter_by):
         """
         Asynchronously finds and returns all instances of the model that match the specified criteria.
 
         Arguments:
+            session: Optional session to run in; a private one is used if omitted.
             **filter_by: Filtering criteria in the form of named parameters.
 
         Returns:
             A list of model instances.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(cls.model).filter_by(**filter_by)
             result = await session.execute(query)
-            return result.scalars().all()
\ No newline at end of file
+            return result.scalars().all()
+
+
+    @classmethod
+    async def find_page(
+        cls,
+        *where,
+        limit: int = 100,
+        after: Optional[str] = None,
+        options: Sequence = (),
+        session: Optional[AsyncSession] = None,
+        **filter_by
+    ) -> Tuple[list, Optional[str]]:
+        """
+        Find one page of matching instances ordered by id.
+
+        Arguments:
+            *where: Extra SQL conditions, combined with AND.
+            limit: Maximum number of instances to return.
+            after: Cursor returned with the previous page.
+            options: Loader options, e.g. selectinload(...).
+            session: Optional session to run in; a private one is used if omitted.
+            **filter_by: Filtering criteria in the form of named parameters.
+
+        Returns:
+            Tuple of (instances, cursor for the next page or None).
+        """
+        query = (
+            select(cls.model)
+            .options(*options)
+            .where(*where)
+            .filter_by(**filter_by)
+            .order_by(cls.model.id)
+            .limit(limit + 1)
+        )
+        if after:
+            query = query.where(keyset_filter([cls.model.id], after))
+
+        async with session_scope(session) as session:
+            result = await session.execute(query)
+            return split_page(result.scalars().all(), limit, lambda instance: (instance.id,))
+
+    @classmethod
+    async def stream(
+        cls,
+        *where,
+        options: Sequence = (),
+        yield_per: int = 500,
+        **filter_by
+    ) -> AsyncIterator:
+        """
+        Iterate over all matching instances ordered by id without loading them at once.
+
+        Rows are fetched through a server-side cursor in batches of yield_per
+        in a private session that stays open until iteration ends, so this
+        can outlive the request session (e.g. inside a StreamingResponse).
+
+        Arguments:
+            *where: Extra SQL conditions, combined with AND.
+            options: Loader options; selectinload runs once per batch.
+            yield_per: Number of rows fetched per round trip.
+            **filter_by: Filtering criteria in the form of named parameters.
+        """
+        query = (
+            select(cls.model)
+            .options(*options)
+            .where(*where)
+            .filter_by(**filter_by)
+            .order_by(cls.model.id)
+            .execution_options(yield_per=yield_per)
+        )
+
+        async with session_scope() as session:
+            result = await session.stream_scalars(query)
+            async for instance in result:
+                yield instance
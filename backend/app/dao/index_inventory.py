@@ -0,0 +1,91 @@
+from typing import Dict, List, Tuple
+
+
+# Secondary indexes each DAO query relies on, keyed by "Class.method"
+# (or "module.function" outside DAO classes). Primary keys and unique
+# constraints are left out. The index names are declared in the models'
+# __table_args__ and created by migrations c3f8a1d6e205 (donor
+# eligibility), d91e6b2f4c07 (access paths) and e4a7c2b90d18 (trigram
+# search); test_index_inventory checks that they agree.
+USER_TRIGRAM_INDEXES = (
+    "ix_users_first_name_trgm",
+    "ix_users_last_name_trgm",
+    "ix_users_email_trgm",
+    "ix_users_phone_number_trgm",
+)
+HOSPITAL_TRIGRAM_INDEXES = (
+    "ix_hospitals_name_trgm",
+    "ix_hospitals_city_trgm",
+    "ix_hospitals_region_trgm",
+)
+
+INDEX_INVENTORY: Dict[str, Tuple[str, ...]] = {
+    # Donations looked up by donor, hospital or request
+    "DonationDAO.get_donor_donations": ("ix_donations_donor_id",),
+    "DonationDAO.get_donor_donations_with_sorting": ("ix_donations_donor_id",),
+    "DonationDAO.get_hospital_donations": ("ix_donations_hospital_id",),
+    "DonationDAO.get_request_donations": ("ix_donations_blood_request_id_status",),
+    "DonationDAO.find_donation_statistics_by_region": ("ix_donations_hospital_id",),
+    "DonationDAO.analyze_donation_demographics": ("ix_donations_completed_donor_id_donation_date",),
+    "BloodRequestDAO.delete": ("ix_donations_blood_request_id_status",),
+    "BloodRequestDAO.recalculate_collected_ml": ("ix_donations_blood_request_id_status",),
+    "HospitalDAO.get_hospital_stats": (
+        "ix_hospital_staff_hospital_id",
+        "ix_blood_requests_hospital_id_status",
+        "ix_donations_hospital_id",
+    ),
+    "HospitalDAO.delete": (
+        "ix_hospital_staff_hospital_id",
+        "ix_blood_requests_hospital_id_status",
+        "ix_donations_hospital_id",
+    ),
+    "HospitalDAO.can_be_deleted": (
+        "ix_hospital_staff_hospital_id",
+        "ix_blood_requests_hospital_id_status",
+        "ix_donations_hospital_id",
+    ),
+
+    # Per-donor aggregates over completed donations
+    "DonorDAO.find_donors_by_blood_type_min_donations": ("ix_donations_completed_donor_id_donation_date",),
+    "DonorDAO.find_multi_hospital_donors": ("ix_donations_completed_donor_id_donation_date",),
+    "DonorDAO.find_universal_donors_by_region": ("ix_donations_completed_donor_id_donation_date",),
+    "HospitalStaffDAO.find_doctors_with_donor_supersets": ("ix_donations_blood_request_id_status",),
+    "matching.find_candidate_donors": (
+        "ix_donors_blood_type_next_eligible_date",
+        "ix_donations_completed_donor_id_donation_date",
+    ),
+
+    # Donor eligibility
+    "DonorDAO.find_eligible_donors_by_blood_type": ("ix_donors_blood_type_next_eligible_date",),
+    "DonorDAO.find_donors_matching_multiple_requests": (
+        "ix_donors_blood_type_next_eligible_date",
+        "ix_blood_requests_open_urgency_needed_by_date",
+    ),
+
+    # Blood requests of a hospital, by status
+    "BloodRequestDAO.get_summary": ("ix_blood_requests_hospital_id_status",),
+    "BloodRequestDAO.get_dashboard_stats": ("ix_blood_requests_hospital_id_status",),
+    "BloodRequestDAO.find_page": ("ix_blood_requests_hospital_id_status",),
+    "BloodRequestDAO.count": ("ix_blood_requests_hospital_id_status",),
+    "HospitalDAO.find_hospitals_with_identical_needs": ("ix_blood_requests_hospital_id_status",),
+
+    # Open requests by blood type, urgency and deadline
+    "BloodRequestDAO.find_hospitals_with_shortages": ("ix_blood_requests_blood_type_status_needed_by_date",),
+    "BloodRequestDAO.find_high_volume_requests": ("ix_blood_requests_open_urgency_needed_by_date",),
+    "matching.find_open_requests": ("ix_blood_requests_open_urgency_needed_by_date",),
+
+    # Trigram search (ILIKE '%term%' and word_similarity)
+    "UsersDAO.search_paginated": USER_TRIGRAM_INDEXES,
+    "SearchDAO.search": USER_TRIGRAM_INDEXES + HOSPITAL_TRIGRAM_INDEXES,
+    "HospitalDAO.find_paginated": HOSPITAL_TRIGRAM_INDEXES,
+    "TablesDAO.get_table_data": USER_TRIGRAM_INDEXES + HOSPITAL_TRIGRAM_INDEXES,
+}
+
+
+def queries_using(index_name: str) -> List[str]:
+    """DAO queries that rely on an index, e.g. to review before dropping it"""
+    return sorted(query for query, indexes in INDEX_INVENTORY.items() if index_name in indexes)
+
+
+def inventoried_indexes() -> List[str]:
+    return sorted({index for indexes in INDEX_INVENTORY.values() for index in indexes})
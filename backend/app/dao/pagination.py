@@ -0,0 +1,145 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+COUNT_EXACT = "exact"
+COUNT_APPROXIMATE = "approximate"
+COUNT_NONE = "none"
+COUNT_MODES = (COUNT_EXACT, COUNT_APPROXIMATE, COUNT_NONE)
+
+# Response header carrying the cursor for list endpoints that return a bare JSON array
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _decode_value(obj: dict):
+    if "dt" in obj:
+        return datetime.fromisoformat(obj["dt"])
+    if "d" in obj:
+        return date.fromisoformat(obj["d"])
+    return obj
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    payload = json.dumps(list(values), default=_encode_value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _matches_type(value: Any, python_type: Optional[type]) -> bool:
+    if python_type is None:
+        return True
+    if isinstance(value, bool) and python_type is not bool:
+        return False
+    if python_type is float:
+        return isinstance(value, (int, float))
+    if python_type is date:
+        return isinstance(value, date) and not isinstance(value, datetime)
+    return isinstance(value, python_type)
+
+
+def column_python_type(column) -> Optional[type]:
+    """Python type of a column or expression, or None if SQLAlchemy cannot tell."""
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def decode_cursor(cursor: str, types: Optional[Sequence[Optional[type]]] = None) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        types: Expected Python type of each value; a None entry is not checked
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the types,
+            so a forged cursor is rejected before it reaches the database
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()), object_hook=_decode_value)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    if not isinstance(values, list) or not values:
+        raise ValueError("Invalid pagination cursor")
+    if types is not None:
+        if len(values) != len(types):
+            raise ValueError("Invalid pagination cursor")
+        if not all(_matches_type(value, python_type) for value, python_type in zip(values, types)):
+            raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def validate_count_mode(count: str) -> str:
+    if count not in COUNT_MODES:
+        raise ValueError(f"Invalid count mode: {count}. Must be one of {list(COUNT_MODES)}")
+    return count
+
+
+def keyset_filter(columns: Sequence, cursor: str, descending: bool = False):
+    """
+    Build the seek condition for rows after the cursor.
+
+    The columns must be the ORDER BY columns of the query, all sorted in the
+    same direction and ending with a unique column (usually id).
+    """
+    values = decode_cursor(cursor, [column_python_type(column) for column in columns])
+
+    if len(columns) == 1:
+        return columns[0] < values[0] if descending else columns[0] > values[0]
+
+    key = tuple_(*columns)
+    bound = tuple_(*values)
+    return key < bound if descending else key > bound
+
+
+def split_page(rows: Sequence, limit: int, key) -> Tuple[list, Optional[str]]:
+    """
+    Trim a result fetched with LIMIT limit + 1 and build the next cursor.
+
+    Args:
+        rows: Rows fetched with one extra row to detect a following page
+        limit: Page size
+        key: Callable returning the sort key tuple of a row
+
+    Returns:
+        Tuple of (rows of this page, cursor for the next page or None)
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+async def approximate_count(session: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    Estimated row count of a table from planner statistics.
+
+    Returns None if the table has never been analyzed.
+    """
+    result = await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name}
+    )
+    estimate = result.scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
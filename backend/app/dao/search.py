@@ -0,0 +1,271 @@
+import re
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from sqlalchemy import case, func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import session_scope
+from app.dao.pagination import COUNT_EXACT, keyset_filter, split_page
+from app.users.models import User
+from app.hospital.models import Hospital
+
+
+# Shorter terms have no trigram to look up, so the GIN indexes cannot help
+TRIGRAM_MIN_LENGTH = 3
+
+_EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_MAX_INT4 = 2**31 - 1
+
+# Above any similarity_score, which tops out at 1, so the row a number names by id sorts first
+EXACT_ID_SCORE = 2.0
+
+
+def parse_exact_id(term: str) -> Optional[int]:
+    """
+    The id a search term names, if it is a plain number that fits an id column.
+
+    Numbers with a leading zero are treated as text, e.g. part of a phone number.
+    """
+    term = term.strip()
+    if term.isdigit() and not term.startswith("0") and int(term) <= _MAX_INT4:
+        return int(term)
+    return None
+
+
+def is_email(term: str) -> bool:
+    return bool(_EMAIL_PATTERN.fullmatch(term.strip()))
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def matching_enum_names(enum_cls: Type[Enum], term: str) -> List[str]:
+    """
+    Names of the members whose value or name contains the term.
+
+    PostgreSQL enums have no ILIKE, and the database stores member names,
+    so text searches on enum columns compare against this list instead.
+    """
+    term = term.strip().lower()
+    return [
+        member.name for member in enum_cls
+        if term in member.value.lower() or term in member.name.lower()
+    ]
+
+
+def email_match(term: str, email_column):
+    """Filter for the exact e-mail shortcut, or None if the term is not an e-mail address"""
+    if is_email(term):
+        return email_column == term.strip()
+    return None
+
+
+def is_short_term(term: str) -> bool:
+    """Whether the term is too short for the trigram indexes to narrow the scan"""
+    return len(term.strip()) < TRIGRAM_MIN_LENGTH
+
+
+def contains_filter(columns: Sequence, term: str):
+    """
+    Case-insensitive match on any of the columns.
+
+    Rendered as ILIKE '%term%', which the gin_trgm_ops indexes serve for
+    terms of TRIGRAM_MIN_LENGTH characters or more. Shorter terms would
+    match most rows through a full scan, so they only match the start of a
+    value (ILIKE 'term%'). LIKE wildcards in the term are escaped.
+    """
+    pattern = f"{escape_like(term)}%" if is_short_term(term) else f"%{escape_like(term)}%"
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
+
+
+def similarity_score(columns: Sequence, term: str):
+    """
+    How well the term matches the best of the columns, from 0 to 1.
+
+    word_similarity compares the term with the most similar part of each
+    value, so a surname typed in full ranks above a partial match inside an
+    e-mail address. NULL columns are ignored.
+    """
+    return func.coalesce(
+        func.greatest(*(func.word_similarity(term, column) for column in columns)),
+        0.0
+    )
+
+
+def contains_or_id(columns: Sequence, term: str, id_column):
+    """
+    Filter and score of a text search that also looks a number up as an id.
+
+    The row a number names scores EXACT_ID_SCORE and comes first, followed
+    by the rows containing the number in a text column (phone numbers,
+    addresses), which an id-only lookup would hide.
+
+    Returns:
+        Tuple of (filter, score)
+    """
+    where = contains_filter(columns, term)
+    score = similarity_score(columns, term)
+    exact_id = parse_exact_id(term)
+    if exact_id is not None:
+        where = or_(id_column == exact_id, where)
+        score = case((id_column == exact_id, literal(EXACT_ID_SCORE)), else_=score)
+    return where, score
+
+
+async def search_page(
+    session: AsyncSession,
+    model,
+    columns: Sequence,
+    term: str,
+    page: int = 1,
+    limit: int = 10,
+    after: Optional[str] = None,
+    count: str = COUNT_EXACT,
+    email_column=None
+) -> Tuple[list, Optional[int], Optional[str]]:
+    """
+    One page of a model's rows matching a search term, best match first.
+
+    An e-mail term is tried as an exact match first. Otherwise rows are
+    filtered with contains_or_id and ordered by (score, id) descending, so
+    the row a number names by id leads the first page; the cursor seeks on
+    that pair. Terms shorter than TRIGRAM_MIN_LENGTH only match prefixes and
+    are never counted, since no index can serve the count.
+
+    Returns:
+        Tuple of (rows, total count or None, cursor for the next page or None)
+    """
+    term = term.strip()
+    exact = email_match(term, email_column) if email_column is not None else None
+    if exact is not None:
+        rows = (await session.execute(select(model).where(exact))).scalars().all()
+        if rows:
+            first_page = page == 1 and not after
+            return (list(rows) if first_page else []), len(rows), None
+
+    where, score = contains_or_id(columns, term, model.id)
+
+    total_count = None
+    if count == COUNT_EXACT and not is_short_term(term):
+        total_count = await session.scalar(select(func.count()).select_from(model).where(where))
+
+    query = (
+        select(model, score.label("score"))
+        .where(where)
+        .order_by(score.desc(), model.id.desc())
+        .limit(limit + 1)
+    )
+    if after:
+        query = query.where(keyset_filter([score, model.id], after, descending=True))
+    else:
+        query = query.offset((page - 1) * limit)
+
+    result = await session.execute(query)
+    rows, next_cursor = split_page(result.all(), limit, lambda row: (row.score, row[0].id))
+    return [row[0] for row in rows], total_count, next_cursor
+
+
+USER_SEARCH_COLUMNS = (User.first_name, User.last_name, User.email, User.phone_number)
+HOSPITAL_SEARCH_COLUMNS = (Hospital.name, Hospital.city, Hospital.region)
+
+
+class SearchDAO:
+    """Data Access Object for the global search box across users and hospitals."""
+
+    @classmethod
+    async def search(
+        cls,
+        term: str,
+        limit: int = 10,
+        session: Optional[AsyncSession] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search users and hospitals and rank the hits together.
+
+        An e-mail address is looked up as an exact e-mail; only when that
+        finds nothing does the trigram search run. A number also matches
+        user and hospital ids, and those hits rank first with score 1.
+        Terms shorter than TRIGRAM_MIN_LENGTH only match the start of names,
+        e-mails, phones and places.
+
+        Args:
+            term: Text typed by the user
+            limit: Maximum number of hits
+
+        Returns:
+            Hits with type ("user" or "hospital"), id, label, detail and a
+            score from 0 to 1, best first
+        """
+        term = term.strip()
+        if not term:
+            return []
+
+        async with session_scope(session) as session:
+            hits = await cls._exact_hits(term, session)
+            if not hits:
+                hits = await cls._similar_hits(term, limit, session)
+
+        hits.sort(key=lambda hit: (-hit["score"], hit["type"], hit["id"]))
+        for hit in hits:
+            hit["score"] = min(hit["score"], 1.0)
+        return hits[:limit]
+
+    @classmethod
+    async def _exact_hits(cls, term: str, session: AsyncSession) -> List[Dict[str, Any]]:
+        user_filter = email_match(term, User.email)
+        if user_filter is None:
+            return []
+        hospital_filter = email_match(term, Hospital.email)
+
+        return (
+            await cls._user_hits(user_filter, literal(1.0), None, session)
+            + await cls._hospital_hits(hospital_filter, literal(1.0), None, session)
+        )
+
+    @classmethod
+    async def _similar_hits(cls, term: str, limit: int, session: AsyncSession) -> List[Dict[str, Any]]:
+        return (
+            await cls._user_hits(*contains_or_id(USER_SEARCH_COLUMNS, term, User.id), limit, session)
+            + await cls._hospital_hits(*contains_or_id(HOSPITAL_SEARCH_COLUMNS, term, Hospital.id), limit, session)
+        )
+
+    @classmethod
+    async def _user_hits(cls, where, score, limit: Optional[int], session: AsyncSession) -> List[Dict[str, Any]]:
+        query = (
+            select(User.id, User.first_name, User.last_name, User.email, score.label("score"))
+            .where(where)
+            .order_by(score.desc(), User.id)
+            .limit(limit)
+        )
+        result = await session.execute(query)
+        return [
+            {
+                "type": "user",
+                "id": row.id,
+                "label": f"{row.first_name} {row.last_name}",
+                "detail": row.email,
+                "score": float(row.score),
+            }
+            for row in result
+        ]
+
+    @classmethod
+    async def _hospital_hits(cls, where, score, limit: Optional[int], session: AsyncSession) -> List[Dict[str, Any]]:
+        query = (
+            select(Hospital.id, Hospital.name, Hospital.city, score.label("score"))
+            .where(where)
+            .order_by(score.desc(), Hospital.id)
+            .limit(limit)
+        )
+        result = await session.execute(query)
+        return [
+            {
+                "type": "hospital",
+                "id": row.id,
+                "label": row.name,
+                "detail": row.city,
+                "score": float(row.score),
+            }
+            for row in result
+        ]
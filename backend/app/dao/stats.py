@@ -0,0 +1,65 @@
+from typing import Any, Dict, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import session_scope
+from app.common.enums import DonationStatus, RequestStatus
+from app.users.models import User
+from app.donor.models import Donor
+from app.hospital.models import Hospital
+from app.blood_request.models import BloodRequest
+from app.donation.models import Donation
+
+
+def _count(model, *where):
+    return select(func.count()).select_from(model).where(*where).scalar_subquery()
+
+
+class StatsDAO:
+    """Data Access Object for cross-table aggregates shown on overview pages."""
+
+    @classmethod
+    async def get_admin_counts(cls, session: Optional[AsyncSession] = None) -> Dict[str, int]:
+        """
+        Row counts for the admin dashboard, fetched in one round trip.
+
+        Returns:
+            Dictionary with user_count, donor_count, hospital_count and blood_request_count
+        """
+        async with session_scope(session) as session:
+            query = select(
+                _count(User).label("user_count"),
+                _count(Donor).label("donor_count"),
+                _count(Hospital).label("hospital_count"),
+                _count(BloodRequest).label("blood_request_count")
+            )
+            row = (await session.execute(query)).one()
+            return dict(row._mapping)
+
+    @classmethod
+    async def get_home_stats(cls, session: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        """
+        Public statistics for the home page, fetched in one round trip.
+
+        Returns:
+            Dictionary with donor, hospital and completed donation counts,
+            collected blood volume, estimated lives saved and open requests
+        """
+        completed = Donation.status == DonationStatus.COMPLETED
+
+        async with session_scope(session) as session:
+            query = select(
+                _count(User, User.is_donor == True).label("donor_count"),
+                _count(Hospital).label("hospital_count"),
+                _count(Donation, completed).label("donation_count"),
+                select(func.coalesce(func.sum(Donation.blood_amount_ml), 0))
+                    .where(completed).scalar_subquery().label("blood_volume_ml"),
+                _count(
+                    BloodRequest,
+                    BloodRequest.status.in_([RequestStatus.PENDING, RequestStatus.APPROVED])
+                ).label("active_requests")
+            )
+            stats = dict((await session.execute(query)).one()._mapping)
+
+        # Each whole-blood donation is commonly estimated to help up to three patients
+        stats["lives_saved"] = stats["donation_count"] * 3
+        return stats
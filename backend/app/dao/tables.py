@@ -1,59 +1,118 @@
-from typing import Dict, List, Any, Optional
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Type
 from sqlalchemy import text
-from app.database import async_session_maker
+from app.database import session_scope
+from app.dao.pagination import COUNT_EXACT, COUNT_APPROXIMATE, approximate_count, decode_cursor, split_page, validate_count_mode
+from app.dao.search import escape_like, is_email, matching_enum_names, parse_exact_id
+from app.common.enums import BloodType, Department, DonationStatus, RequestStatus, StaffRole
+from sqlalchemy.ext.asyncio import AsyncSession
 
 class TablesDAO:
     """Data Access Object for direct SQL queries to database tables."""
 
+    # Python type of the sort columns that are not integer ids, for checking cursors
+    _SORT_COLUMN_TYPES = {"d.donation_date": datetime}
+
+    @staticmethod
+    def _search_filter(
+        search: str,
+        text_columns: Sequence[str] = (),
+        id_columns: Sequence[str] = (),
+        enum_columns: Optional[Dict[str, Type[Enum]]] = None,
+        email_column: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the WHERE condition and parameters for a table's search box.
+        
+        An e-mail address only matches the e-mail column, through its unique
+        index. A number also matches the id columns exactly instead of
+        casting them to text. Text columns use ILIKE, which the trigram
+        indexes serve, and enum columns are compared with the members whose
+        label contains the term, since PostgreSQL enums have no ILIKE.
+        
+        Returns:
+            Tuple of (SQL condition, query parameters)
+        """
+        search = search.strip()
+        if email_column and is_email(search):
+            return f"{email_column} = :search_email", {"search_email": search}
+        
+        conditions = []
+        params: Dict[str, Any] = {}
+        
+        if text_columns:
+            conditions.extend(f"{column} ILIKE :search" for column in text_columns)
+            params["search"] = f"%{escape_like(search)}%"
+        
+        exact_id = parse_exact_id(search)
+        if exact_id is not None and id_columns:
+            conditions.extend(f"{column} = :search_id" for column in id_columns)
+            params["search_id"] = exact_id
+        
+        for i, (column, enum_cls) in enumerate((enum_columns or {}).items()):
+            names = matching_enum_names(enum_cls, search)
+            if names:
+                conditions.append(f"{column}::text = ANY(:search_enum_{i})")
+                params[f"search_enum_{i}"] = names
+        
+        if not conditions:
+            return "FALSE", params
+        return " OR ".join(conditions), params
+
     @classmethod
     async def get_table_data(
         cls,
         table_name: str,
         page: int = 1,
         limit: int = 25,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        after: Optional[str] = None,
+        count: str = COUNT_EXACT,
+        session: Optional[AsyncSession] = None
     ) -> Dict[str, Any]:
         """
         Fetch data from a specific table with pagination and optional search.
         
+        Each table has a fixed sort key ending in its id. Passing the
+        next_cursor of the previous response as ``after`` seeks past that key
+        instead of skipping rows with OFFSET.
+        
         Args:
             table_name: The name of the table to query
-            page: Page number (1-indexed)
+            page: Page number (1-indexed); only used for OFFSET when no cursor is given
             limit: Number of records per page
             search: Optional search string for filtering
+            after: Cursor returned as next_cursor by the previous page
+            count: "exact", "approximate" (planner estimate, unfiltered only) or "none"
             
         Returns:
-            Dictionary with items, total count, current page, and total pages
+            Dictionary with items, total count, current page, total pages and next_cursor
         """
-        async with async_session_maker() as session:
-            offset = (page - 1) * limit
-            
-            # Build the SQL query based on table name
-            if search:
-                search_param = f"%{search}%"
-            else:
-                search_param = None
-                
+        validate_count_mode(count)
+        
+        async with session_scope(session) as session:
             # Define query parameters and search conditions based on table name
-            query_params = {"limit": limit, "offset": offset}
-            count_params = {}
+            query_params = {"limit": limit + 1}
             
             # Configure search conditions for specific tables
-            search_conditions = ""
+            search_filter = ""
+            search_params = {}
             
             # Build table-specific queries
             if table_name == "users":
+                sort_columns = ["id"]
+                descending = False
+                
                 if search:
-                    search_conditions = """
-                        WHERE first_name ILIKE :search 
-                        OR last_name ILIKE :search
-                        OR email ILIKE :search
-                        OR phone_number ILIKE :search
-                    """
-                    query_params["search"] = search_param
-                    count_params["search"] = search_param
+                    search_filter, search_params = cls._search_filter(
+                        search,
+                        text_columns=["first_name", "last_name", "email", "phone_number"],
+                        id_columns=["id"],
+                        email_column="email"
+                    )
                 
-                query = text(f"""
+                query = """
                     SELECT 
                         id, 
                         first_name, 
@@ -67,26 +126,28 @@ class TablesDAO:
                         created_at,
                         updated_at
                     FROM users
-                    {search_conditions}
-                    ORDER BY id
-                    LIMIT :limit OFFSET :offset
-                """)
+                    {where_clause}
+                    ORDER BY {order_clause}
+                    LIMIT :limit {offset_clause}
+                """
                 
-                count_query = text(f"""
-                    SELECT COUNT(*) as total FROM users {search_conditions}
-                """)
+                count_query = """
+                    SELECT COUNT(*) as total FROM users {count_where_clause}
+                """
                 
             elif table_name == "donors":
+                sort_columns = ["d.id"]
+                descending = False
+                
                 if search:
-                    search_conditions = """
-                        WHERE blood_type ILIKE :search
-                        OR id::text ILIKE :search
-                        OR user_id::text ILIKE :search
-                    """
-                    query_params["search"] = search_param
-                    count_params["search"] = search_param
+                    search_filter, search_params = cls._search_filter(
+                        search,
+                        text_columns=["u.first_name", "u.last_name"],
+                        id_columns=["d.id", "d.user_id"],
+                        enum_columns={"d.blood_type": BloodType}
+                    )
                 
-                query = text(f"""
+                query = """
                     SELECT 
                         d.id, 
                         d.user_id, 
@@ -103,28 +164,29 @@ class TablesDAO:
                         u.last_name
                     FROM donors d
                     JOIN users u ON d.user_id = u.id
-                    {search_conditions}
-                    ORDER BY d.id
-                    LIMIT :limit OFFSET :offset
-                """)
+                    {where_clause}
+                    ORDER BY {order_clause}
+                    LIMIT :limit {offset_clause}
+                """
                 
-                count_query = text(f"""
+                count_query = """
                     SELECT COUNT(*) as total FROM donors d
                     JOIN users u ON d.user_id = u.id
-                    {search_conditions}
-                """)
+                    {count_where_clause}
+                """
                 
             elif table_name == "hospitals":
+                sort_columns = ["id"]
+                descending = False
+                
                 if search:
-                    search_conditions = """
-                        WHERE name ILIKE :search
-                        OR city ILIKE :search
-                        OR region ILIKE :search
-                    """
-                    query_params["search"] = search_param
-                    count_params["search"] = search_param
+                    search_filter, search_params = cls._search_filter(
+                        search,
+                        text_columns=["name", "city", "region"],
+                        id_columns=["id"]
+                    )
                 
-                query = text(f"""
+                query = """
                     SELECT 
                         id, 
                         name,
@@ -138,29 +200,28 @@ class TablesDAO:
                         website,
                         created_at
                     FROM hospitals
-                    {search_conditions}
-                    ORDER BY id
-                    LIMIT :limit OFFSET :offset
-                """)
+                    {where_clause}
+                    ORDER BY {order_clause}
+                    LIMIT :limit {offset_clause}
+                """
                 
-                count_query = text(f"""
-                    SELECT COUNT(*) as total FROM hospitals {search_conditions}
-                """)
+                count_query = """
+                    SELECT COUNT(*) as total FROM hospitals {count_where_clause}
+                """
                 
             elif table_name == "hospital_staff":
+                sort_columns = ["hs.id"]
+                descending = False
+                
                 if search:
-                    search_conditions = """
-                        WHERE hs.id::text ILIKE :search
-                        OR h.name ILIKE :search
-                        OR u.first_name ILIKE :search
-                        OR u.last_name ILIKE :search
-                        OR hs.role ILIKE :search
-                        OR hs.department ILIKE :search
-                    """
-                    query_params["search"] = search_param
-                    count_params["search"] = search_param
+                    search_filter, search_params = cls._search_filter(
+                        search,
+                        text_columns=["h.name", "u.first_name", "u.last_name"],
+                        id_columns=["hs.id"],
+                        enum_columns={"hs.role": StaffRole, "hs.department": Department}
+                    )
                 
-                query = text(f"""
+                query = """
                     SELECT 
                         hs.id, 
                         hs.user_id,
@@ -175,31 +236,32 @@ class TablesDAO:
                     FROM hospital_staff hs
                     JOIN users u ON hs.user_id = u.id
                     JOIN hospitals h ON hs.hospital_id = h.id
-                    {search_conditions}
-                    ORDER BY hs.id
-                    LIMIT :limit OFFSET :offset
-                """)
+                    {where_clause}
+                    ORDER BY {order_clause}
+                    LIMIT :limit {offset_clause}
+                """
                 
-                count_query = text(f"""
+                count_query = """
                     SELECT COUNT(*) as total 
                     FROM hospital_staff hs
                     JOIN users u ON hs.user_id = u.id
                     JOIN hospitals h ON hs.hospital_id = h.id
-                    {search_conditions}
-                """)
+                    {count_where_clause}
+                """
                 
             elif table_name == "blood_requests":
+                sort_columns = ["br.id"]
+                descending = True
+                
                 if search:
-                    search_conditions = """
-                        WHERE br.id::text ILIKE :search
-                        OR br.blood_type ILIKE :search
-                        OR h.name ILIKE :search
-                        OR br.status ILIKE :search
-                    """
-                    query_params["search"] = search_param
-                    count_params["search"] = search_param
+                    search_filter, search_params = cls._search_filter(
+                        search,
+                        text_columns=["h.name"],
+                        id_columns=["br.id"],
+                        enum_columns={"br.blood_type": BloodType, "br.status": RequestStatus}
+                    )
                 
-                query = text(f"""
+                query = """
                     SELECT 
                         br.id, 
                         br.hospital_id,
@@ -213,43 +275,38 @@ class TablesDAO:
                         h.name as hospital_name,
                         u.first_name,
                         u.last_name,
-                        (
-                            SELECT COALESCE(SUM(d.blood_amount_ml), 0)
-                            FROM donations d
-                            WHERE d.blood_request_id = br.id AND d.status = 'COMPLETED'
-                        ) as collected_amount
+                        br.collected_ml as collected_amount
                     FROM blood_requests br
                     JOIN hospital_staff hs ON br.staff_id = hs.id
                     JOIN users u ON hs.user_id = u.id
                     JOIN hospitals h ON br.hospital_id = h.id
-                    {search_conditions}
-                    ORDER BY br.id DESC
-                    LIMIT :limit OFFSET :offset
-                """)
+                    {where_clause}
+                    ORDER BY {order_clause}
+                    LIMIT :limit {offset_clause}
+                """
                 
-                count_query = text(f"""
+                count_query = """
                     SELECT COUNT(*) as total 
                     FROM blood_requests br
                     JOIN hospital_staff hs ON br.staff_id = hs.id
                     JOIN users u ON hs.user_id = u.id
                     JOIN hospitals h ON br.hospital_id = h.id
-                    {search_conditions}
-                """)
+                    {count_where_clause}
+                """
                 
             elif table_name == "donations":
+                sort_columns = ["d.donation_date", "d.id"]
+                descending = True
+                
                 if search:
-                    search_conditions = """
-                        WHERE d.id::text ILIKE :search
-                        OR d.blood_type ILIKE :search
-                        OR d.status ILIKE :search
-                        OR h.name ILIKE :search
-                        OR u.first_name ILIKE :search
-                        OR u.last_name ILIKE :search
-                    """
-                    query_params["search"] = search_param
-                    count_params["search"] = search_param
+                    search_filter, search_params = cls._search_filter(
+                        search,
+                        text_columns=["h.name", "u.first_name", "u.last_name"],
+                        id_columns=["d.id"],
+                        enum_columns={"d.blood_type": BloodType, "d.status": DonationStatus}
+                    )
                 
-                query = text(f"""
+                query = """
                     SELECT 
                         d.id, 
                         d.donor_id,
@@ -268,43 +325,83 @@ class TablesDAO:
                     JOIN users u ON dn.user_id = u.id
                     JOIN hospitals h ON d.hospital_id = h.id
                     LEFT JOIN blood_requests br ON d.blood_request_id = br.id
-                    {search_conditions}
-                    ORDER BY d.donation_date DESC
-                    LIMIT :limit OFFSET :offset
-                """)
+                    {where_clause}
+                    ORDER BY {order_clause}
+                    LIMIT :limit {offset_clause}
+                """
                 
-                count_query = text(f"""
+                count_query = """
                     SELECT COUNT(*) as total 
                     FROM donations d
                     JOIN donors dn ON d.donor_id = dn.id
                     JOIN users u ON dn.user_id = u.id
                     JOIN hospitals h ON d.hospital_id = h.id
                     LEFT JOIN blood_requests br ON d.blood_request_id = br.id
-                    {search_conditions}
-                """)
+                    {count_where_clause}
+                """
             else:
                 # Handle unknown table name
                 return {
                     "items": [],
                     "total": 0,
                     "page": page,
-                    "pages": 0
+                    "pages": 0,
+                    "next_cursor": None
                 }
             
+            query_params.update(search_params)
+            conditions = [f"({search_filter})"] if search_filter else []
+            count_where_clause = f"WHERE {conditions[0]}" if conditions else ""
+            
+            if after:
+                values = decode_cursor(
+                    after, [cls._SORT_COLUMN_TYPES.get(column, int) for column in sort_columns]
+                )
+                placeholders = []
+                for i, value in enumerate(values):
+                    query_params[f"after_{i}"] = value
+                    placeholders.append(f":after_{i}")
+                operator = "<" if descending else ">"
+                conditions.append(
+                    f"({', '.join(sort_columns)}) {operator} ({', '.join(placeholders)})"
+                )
+                offset_clause = ""
+            else:
+                query_params["offset"] = (page - 1) * limit
+                offset_clause = "OFFSET :offset"
+            
+            direction = " DESC" if descending else ""
+            query = text(query.format(
+                where_clause=f"WHERE {' AND '.join(conditions)}" if conditions else "",
+                order_clause=", ".join(f"{column}{direction}" for column in sort_columns),
+                offset_clause=offset_clause
+            ))
+            
             # Execute the query
             result = await session.execute(query, query_params)
-            items = [dict(row) for row in result.mappings()]
+            rows = [dict(row) for row in result.mappings()]
+            sort_keys = [column.split(".")[-1] for column in sort_columns]
+            items, next_cursor = split_page(
+                rows, limit, lambda row: tuple(row[key] for key in sort_keys)
+            )
             
             # Get total count
-            count_result = await session.execute(count_query, count_params)
-            total = count_result.scalar()
+            total = None
+            if count == COUNT_EXACT:
+                count_params = dict(search_params)
+                count_query = text(count_query.format(count_where_clause=count_where_clause))
+                count_result = await session.execute(count_query, count_params)
+                total = count_result.scalar()
+            elif count == COUNT_APPROXIMATE and not search_filter:
+                total = await approximate_count(session, table_name)
             
             # Calculate total pages
-            pages = (total + limit - 1) // limit
+            pages = (total + limit - 1) // limit if total is not None else None
             
             return {
                 "items": items,
                 "total": total,
                 "page": page,
-                "pages": pages
-            }
\ No newline at end of file
+                "pages": pages,
+                "next_cursor": next_cursor
+            }
@@ -1,20 +1,61 @@
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Optional
 
-from sqlalchemy import func
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncAttrs
+from sqlalchemy import DDL, event, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncAttrs, AsyncSession
 from sqlalchemy.orm import DeclarativeBase, declared_attr, Mapped, mapped_column
 
-from app.config import get_db_url
+from app.config import get_db_url, get_pool_settings
+from app.monitoring.pool import InstrumentedAsyncPool
 
 
 DATABASE_URL = get_db_url()
 
 
-engine = create_async_engine(DATABASE_URL)
+engine = create_async_engine(
+    DATABASE_URL,
+    poolclass=InstrumentedAsyncPool,
+    **get_pool_settings()
+)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency providing one session per HTTP request.
+
+    The whole request runs inside a single transaction: it is committed when
+    the endpoint returns and rolled back if it raises. DAO methods called with
+    this session only flush, so a multi-DAO endpoint uses one pooled
+    connection and issues one COMMIT.
+    """
+    async with async_session_maker() as session:
+        async with session.begin():
+            yield session
+
+
+@asynccontextmanager
+async def session_scope(session: Optional[AsyncSession] = None) -> AsyncIterator[AsyncSession]:
+    """
+    Reuse the caller's session, or open a private one for a single DAO call.
+
+    A borrowed session is left untouched: its owner decides when to commit.
+    A private session is committed on success and rolled back on error.
+    """
+    if session is not None:
+        yield session
+        return
+
+    async with async_session_maker() as new_session:
+        try:
+            yield new_session
+            await new_session.commit()
+        except BaseException:
+            await new_session.rollback()
+            raise
+
+
 int_pk = Annotated[int, mapped_column(primary_key=True)]
 created_at = Annotated[datetime, mapped_column(server_default=func.now())]
 updated_at = Annotated[datetime, mapped_column(server_default=func.now(), onupdate=datetime.now)]
@@ -27,4 +68,13 @@ class Base(AsyncAttrs, DeclarativeBase):
 
     @declared_attr.directive
     def __tablename__(cls) -> str:
-        return f"{cls.__name__.lower()}s"
\ No newline at end of file
+        return f"{cls.__name__.lower()}s"
+
+
+# The trigram search indexes need pg_trgm; migrations create it too, this
+# covers metadata.create_all() in tests
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
\ No newline at end of file
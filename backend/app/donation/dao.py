@@ -1,27 +1,131 @@
 from app.dao.base import BaseDAO
 from app.donation.models import Donation
-from app.database import async_session_maker
+from app.database import session_scope
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text, update
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+from datetime import date
 from app.common.enums import BloodType, DonationStatus
+from app.common.cache import cached_method
+from app.common.events import ChangeEvent, publish
+from app.donor.models import Donor
+from app.blood_request.dao import BloodRequestDAO
+from app.donor.dao import DonorDAO
 
 
 class DonationDAO(BaseDAO):
     model = Donation
     
+    @staticmethod
+    def _contribution(donation) -> Tuple[Optional[int], int]:
+        """The request a donation counts towards and the milliliters it adds to it"""
+        if donation.blood_request_id is None or donation.status != DonationStatus.COMPLETED:
+            return donation.blood_request_id, 0
+        return donation.blood_request_id, donation.blood_amount_ml
+    
+    @classmethod
+    async def _sync_collected_ml(
+        cls,
+        before: Tuple[Optional[int], int],
+        after: Tuple[Optional[int], int],
+        session: AsyncSession
+    ):
+        """Move a donation's contribution between requests' collected_ml in the current transaction"""
+        (old_request_id, old_ml), (new_request_id, new_ml) = before, after
+        if old_request_id == new_request_id:
+            if new_request_id is not None:
+                await BloodRequestDAO.adjust_collected_ml(new_request_id, new_ml - old_ml, session=session)
+            return
+        if old_request_id is not None:
+            await BloodRequestDAO.adjust_collected_ml(old_request_id, -old_ml, session=session)
+        if new_request_id is not None:
+            await BloodRequestDAO.adjust_collected_ml(new_request_id, new_ml, session=session)
+    
     @classmethod
-    async def create_donation(cls, **donation_data) -> Donation:
-        async with async_session_maker() as session:
+    async def create_donation(cls, session: Optional[AsyncSession] = None, **donation_data) -> Donation:
+        async with session_scope(session) as session:
             donation = cls.model(**donation_data)
             session.add(donation)
-            await session.commit()
+            await session.flush()
             await session.refresh(donation)
+            await cls._count_new_donation(donation, session)
+            await cls._sync_collected_ml((None, 0), cls._contribution(donation), session)
+            publish(session, ChangeEvent.for_instance(donation))
+            return donation
+    
+    @classmethod
+    async def add(cls, session: Optional[AsyncSession] = None, **values) -> Donation:
+        async with session_scope(session) as session:
+            donation = await super().add(session=session, **values)
+            await cls._count_new_donation(donation, session)
+            await cls._sync_collected_ml((None, 0), cls._contribution(donation), session)
             return donation
     
     @classmethod
-    async def get_donor_donations(cls, donor_id: int) -> List[Donation]:
-        async with async_session_maker() as session:
+    async def _count_new_donation(cls, donation: Donation, session: AsyncSession):
+        """Add a donation inserted as completed to its donor's counters"""
+        if donation.status == DonationStatus.COMPLETED:
+            await DonorDAO.recount_donations([donation.donor_id], session=session)
+    
+    @classmethod
+    async def add_many(cls, rows: Sequence[Dict[str, Any]], session: Optional[AsyncSession] = None, **kwargs) -> List[int]:
+        """Insert donations in batches and recompute their donors' counters and their requests' collected_ml"""
+        async with session_scope(session) as session:
+            ids = await super().add_many(rows, session=session, **kwargs)
+            await cls._recalculate_counters(rows, session)
+            return ids
+    
+    @classmethod
+    async def copy_records(
+        cls,
+        rows: Sequence[Dict[str, Any]],
+        session: Optional[AsyncSession] = None,
+        recalculate: bool = True,
+        **kwargs
+    ) -> List[int]:
+        """
+        COPY donations in and recompute their donors' counters and their requests' collected_ml
+
+        Bulk loaders copying many chunks can pass recalculate=False and
+        recompute once at the end (DonorDAO.recalculate_donation_counters,
+        BloodRequestDAO.recalculate_collected_ml).
+        """
+        async with session_scope(session) as session:
+            ids = await super().copy_records(rows, session=session, **kwargs)
+            if recalculate:
+                await cls._recalculate_counters(rows, session)
+            return ids
+    
+    @classmethod
+    async def _recalculate_counters(cls, rows: Sequence[Dict[str, Any]], session: AsyncSession):
+        # Every donor of the batch, since an upsert may also take a donation out of COMPLETED
+        donor_ids = {row["donor_id"] for row in rows if row.get("donor_id") is not None}
+        if donor_ids:
+            await DonorDAO.recalculate_donation_counters(sorted(donor_ids), session=session)
+        request_ids = {row["blood_request_id"] for row in rows if row.get("blood_request_id") is not None}
+        if request_ids:
+            await BloodRequestDAO.recalculate_collected_ml(sorted(request_ids), session=session)
+    
+    @classmethod
+    async def delete(cls, id: int, session: Optional[AsyncSession] = None) -> bool:
+        """Delete a donation and take it out of its donor's counters and its request's collected_ml"""
+        async with session_scope(session) as session:
+            donation = await session.get(cls.model, id, with_for_update=True)
+            if not donation:
+                return False
+            before = cls._contribution(donation)
+            was_completed = donation.status == DonationStatus.COMPLETED
+            donor_id = donation.donor_id
+            
+            await super().delete(id, session=session)
+            if was_completed:
+                await DonorDAO.recount_donations([donor_id], session=session)
+            await cls._sync_collected_ml(before, (None, 0), session)
+            return True
+    
+    @classmethod
+    async def get_donor_donations(cls, donor_id: int, session: Optional[AsyncSession] = None) -> List[Donation]:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(cls.model)
                 .filter_by(donor_id=donor_id)
@@ -30,8 +134,8 @@ class DonationDAO(BaseDAO):
             return result.scalars().all()
     
     @classmethod
-    async def get_hospital_donations(cls, hospital_id: int) -> List[Donation]:
-        async with async_session_maker() as session:
+    async def get_hospital_donations(cls, hospital_id: int, session: Optional[AsyncSession] = None) -> List[Donation]:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(cls.model)
                 .filter_by(hospital_id=hospital_id)
@@ -40,8 +144,8 @@ class DonationDAO(BaseDAO):
             return result.scalars().all()
     
     @classmethod
-    async def get_request_donations(cls, blood_request_id: int) -> List[Donation]:
-        async with async_session_maker() as session:
+    async def get_request_donations(cls, blood_request_id: int, session: Optional[AsyncSession] = None) -> List[Donation]:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(cls.model)
                 .filter_by(blood_request_id=blood_request_id)
@@ -50,56 +154,156 @@ class DonationDAO(BaseDAO):
             return result.scalars().all()
     
     @classmethod
-    async def complete_donation(cls, donation_id: int) -> Optional[Donation]:
-        async with async_session_maker() as session:
-            donation = await session.get(cls.model, donation_id)
+    async def complete_donations(
+        cls,
+        donation_ids: Sequence[int],
+        reason: Optional[str] = None,
+        session: Optional[AsyncSession] = None
+    ) -> List[Donation]:
+        """
+        Complete scheduled donations together with everything that depends on them
+        
+        In one transaction the donations are marked completed, their donors'
+        first/last donation dates and total_donations are updated, and the
+        collected_ml of the linked requests is increased, which fulfills
+        approved requests that reach the amount needed.
+        
+        Rows are locked with SELECT ... FOR UPDATE in a fixed order (donations,
+        then donors, then requests, each by id), so concurrent completions of
+        overlapping donations wait for each other instead of deadlocking or
+        counting a donation twice.
+        
+        Args:
+            donation_ids: Donations to complete; ones that are not scheduled are skipped
+            reason: Optional note appended to each completed donation
             
-            if not donation:
-                return None
-                
-            if donation.complete():
-                await session.commit()
-                await session.refresh(donation)
-                return donation
+        Returns:
+            The donations that were completed, ordered by id
+        """
+        if not donation_ids:
+            return []
+        
+        async with session_scope(session) as session:
+            result = await session.execute(
+                select(cls.model)
+                .where(
+                    cls.model.id.in_(set(donation_ids)),
+                    cls.model.status == DonationStatus.SCHEDULED
+                )
+                .order_by(cls.model.id)
+                .with_for_update()
+            )
+            donations = list(result.scalars().all())
+            if not donations:
+                return []
             
-            return donation
+            donation_dates: Dict[int, List[date]] = {}
+            collected: Dict[int, int] = {}
+            for donation in donations:
+                donation.complete()
+                if reason:
+                    donation.notes = reason if not donation.notes else f"{donation.notes}\n{reason}"
+                donation_dates.setdefault(donation.donor_id, []).append(donation.donation_date.date())
+                request_id, amount_ml = cls._contribution(donation)
+                if request_id is not None:
+                    collected[request_id] = collected.get(request_id, 0) + amount_ml
+            
+            result = await session.execute(
+                select(Donor)
+                .where(Donor.id.in_(donation_dates))
+                .order_by(Donor.id)
+                .with_for_update()
+            )
+            for donor in result.scalars().all():
+                cls._record_donations(donor, donation_dates[donor.id])
+                publish(session, ChangeEvent(Donor.__tablename__, donor.id))
+            
+            await session.flush()
+            
+            for request_id in sorted(collected):
+                await BloodRequestDAO.adjust_collected_ml(request_id, collected[request_id], session=session)
+            
+            publish(session, *(ChangeEvent.for_instance(donation) for donation in donations))
+            return donations
+    
+    @staticmethod
+    def _record_donations(donor: Donor, dates: List[date]):
+        """Fold newly completed donation dates into a donor's counters"""
+        donor.total_donations = (donor.total_donations or 0) + len(dates)
+        first, last = min(dates), max(dates)
+        if donor.first_donation_date is None or first < donor.first_donation_date:
+            donor.first_donation_date = first
+        if donor.last_donation_date is None or last > donor.last_donation_date:
+            donor.last_donation_date = last
+    
+    @classmethod
+    async def complete_donation(
+        cls,
+        donation_id: int,
+        reason: Optional[str] = None,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[Donation]:
+        """Complete one scheduled donation; None if it does not exist or is not scheduled"""
+        completed = await cls.complete_donations([donation_id], reason, session=session)
+        return completed[0] if completed else None
     
     @classmethod
-    async def cancel_donation(cls, donation_id: int, reason: Optional[str] = None) -> Optional[Donation]:
-        """Cancel a donation"""
-        async with async_session_maker() as session:
-            donation = await session.get(cls.model, donation_id)
+    async def cancel_donation(cls, donation_id: int, reason: Optional[str] = None, session: Optional[AsyncSession] = None) -> Optional[Donation]:
+        """Cancel a scheduled donation; None if it does not exist or is not scheduled"""
+        async with session_scope(session) as session:
+            donation = await session.get(cls.model, donation_id, with_for_update=True)
             
-            if not donation:
+            if not donation or donation.status != DonationStatus.SCHEDULED:
                 return None
                 
-            if donation.cancel(reason):
-                await session.commit()
-                await session.refresh(donation)
-                return donation
+            donation.status = DonationStatus.CANCELED
             
+            if reason:
+                donation.notes = reason if not donation.notes else f"{donation.notes}\n{reason}"
+                
+            await session.flush()
+            await session.refresh(donation)
+            publish(session, ChangeEvent.for_instance(donation))
             return donation
     
     @classmethod
-    async def update_status(cls, donation_id: int, status: DonationStatus, reason: Optional[str] = None) -> Optional[Donation]:
-        async with async_session_maker() as session:
-            donation = await session.get(cls.model, donation_id)
+    async def update_status(cls, donation_id: int, status: DonationStatus, reason: Optional[str] = None, session: Optional[AsyncSession] = None) -> Optional[Donation]:
+        """
+        Set a donation's status
+        
+        Completion goes through complete_donations so the donor and request
+        are updated too; a donation that cannot be completed is returned unchanged.
+        Moving a completed donation to another status recounts its donor and
+        takes it out of its request's collected_ml.
+        """
+        async with session_scope(session) as session:
+            if status == DonationStatus.COMPLETED:
+                donation = await cls.complete_donation(donation_id, reason, session=session)
+                return donation or await session.get(cls.model, donation_id)
+            
+            donation = await session.get(cls.model, donation_id, with_for_update=True)
             
             if not donation:
                 return None
+            before = cls._contribution(donation)
+            was_completed = donation.status == DonationStatus.COMPLETED
                 
             donation.status = status
             
             if reason:
                 donation.notes = reason if not donation.notes else f"{donation.notes}\n{reason}"
                 
-            await session.commit()
+            await session.flush()
             await session.refresh(donation)
+            if was_completed:
+                await DonorDAO.recount_donations([donation.donor_id], session=session)
+            await cls._sync_collected_ml(before, cls._contribution(donation), session)
+            publish(session, ChangeEvent.for_instance(donation))
             return donation
         
     @classmethod
-    async def get_donor_donations_with_sorting(cls, donor_id: int) -> List[Donation]:
-        async with async_session_maker() as session:
+    async def get_donor_donations_with_sorting(cls, donor_id: int, session: Optional[AsyncSession] = None) -> List[Donation]:
+        async with session_scope(session) as session:
             result = await session.execute(
                 select(cls.model)
                 .filter_by(donor_id=donor_id)
@@ -108,62 +312,39 @@ class DonationDAO(BaseDAO):
             return result.scalars().all()
     
     @classmethod
-    async def complete_donation(cls, donation_id: int) -> Optional[Donation]:
-        async with async_session_maker() as session:
-            donation = await session.get(cls.model, donation_id)
-            
-            if not donation:
-                return None
-                
-            if donation.status != "scheduled":
-                return None
-                
-            donation.status = "completed"
-            donation.updated_at = datetime.now()
-            
-
-            if hasattr(donation, "donor") and donation.donor:
-                donation.donor.last_donation_date = donation.donation_date
-                donation.donor.total_donations += 1
-                
-            await session.commit()
-            await session.refresh(donation)
-            return donation
-    
-    @classmethod
-    async def cancel_donation(cls, donation_id: int, reason: Optional[str] = None) -> Optional[Donation]:
-        async with async_session_maker() as session:
-            donation = await session.get(cls.model, donation_id)
+    async def update(cls, instance_id: int, session: Optional[AsyncSession] = None, **values):
+        """
+        Update a donation, keeping its donor's counters and its request's
+        collected_ml in step when it starts or stops counting, or moves
+        """
+        async with session_scope(session) as session:
+            row = None
+            if values.keys() & {"status", "blood_amount_ml", "blood_request_id", "donor_id", "donation_date"}:
+                result = await session.execute(
+                    select(
+                        cls.model.blood_request_id,
+                        cls.model.status,
+                        cls.model.blood_amount_ml,
+                        cls.model.donor_id,
+                        cls.model.donation_date
+                    )
+                    .where(cls.model.id == instance_id)
+                    .with_for_update()
+                )
+                row = result.first()
             
-            if not donation:
-                return None
-                
-            if donation.status != "scheduled":
-                return None
-                
-            donation.status = "cancelled"
+            donation = await cls.update_returning(instance_id, session=session, **values)
+            if donation is None or row is None:
+                return donation
             
-            if reason:
-                donation.notes = reason if not donation.notes else f"{donation.notes}\n{reason}"
-                
-            await session.commit()
-            await session.refresh(donation)
+            if DonationStatus.COMPLETED in (row.status, donation.status) and (
+                row.status != donation.status
+                or row.donor_id != donation.donor_id
+                or row.donation_date != donation.donation_date
+            ):
+                await DonorDAO.recount_donations({row.donor_id, donation.donor_id}, session=session)
+            await cls._sync_collected_ml(cls._contribution(row), cls._contribution(donation), session)
             return donation
-    
-    @classmethod
-    async def update(cls, instance_id: int, **values):
-        async with async_session_maker() as session:
-            instance = await session.get(cls.model, instance_id)
-            if not instance:
-                return None
-            
-            for key, value in values.items():
-                setattr(instance, key, value)
-            
-            await session.commit()
-            await session.refresh(instance)
-            
-            return instance
         
 
     @classmethod
@@ -173,7 +354,8 @@ class DonationDAO(BaseDAO):
         min_total_ml: int = 5000,
         blood_type: Optional[str] = None,
         months: int = 3,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find hospital donation statistics grouped by region and blood type.
@@ -185,7 +367,7 @@ class DonationDAO(BaseDAO):
             months: Look back period in months
             limit: Maximum number of results
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             params = {
                 "min_donations": min_donations,
                 "min_total_ml": min_total_ml,
@@ -224,7 +406,7 @@ class DonationDAO(BaseDAO):
                 JOIN
                     donors d ON don.donor_id = d.id
                 WHERE
-                    don.donation_date > NOW() - INTERVAL ':months months'
+                    don.donation_date > NOW() - (:months * INTERVAL '1 month')
                     AND don.status = 'COMPLETED'
                     {blood_type_clause}
                 GROUP BY
@@ -267,6 +449,7 @@ class DonationDAO(BaseDAO):
         
 
     @classmethod
+    @cached_method(ttl=900, depends_on=("donations", "donors", "hospitals"))
     async def analyze_donation_demographics(
         cls,
         min_age: int = 18,
@@ -274,7 +457,8 @@ class DonationDAO(BaseDAO):
         min_donations: int = 3,
         months: int = 12,
         group_by: str = "age_group",
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Analyze donation frequency by demographics.
@@ -293,7 +477,7 @@ class DonationDAO(BaseDAO):
         if group_by not in valid_groups:
             group_by = "age_group"
         
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             case_statement = ""
             group_field = ""
             
@@ -334,7 +518,7 @@ class DonationDAO(BaseDAO):
                 JOIN
                     hospitals h ON don.hospital_id = h.id
                 WHERE 
-                    don.donation_date > NOW() - INTERVAL ':months months'
+                    don.donation_date > NOW() - (:months * INTERVAL '1 month')
                     AND don.status = 'COMPLETED'
                     AND DATE_PART('year', AGE(CURRENT_DATE, d.date_of_birth)) BETWEEN :min_age AND :max_age
                 GROUP BY 
@@ -350,7 +534,7 @@ class DonationDAO(BaseDAO):
                 ROUND(SUM(total_donated_ml) / SUM(donation_count), 2) AS avg_donation_ml,
                 MAX(donation_count) AS max_donations_by_donor,
                 SUM(total_donated_ml) AS total_donated_ml,
-                ROUND(AVG(DATE_PART('day', last_donation_date - first_donation_date) / donation_count), 2) AS avg_days_between_donations
+                ROUND(AVG(DATE_PART('day', last_donation_date - first_donation_date) / donation_count)::numeric, 2) AS avg_days_between_donations
             FROM 
                 donor_donation_counts
             GROUP BY 
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Text, Enum as SQLEnum, CheckConstraint
+from sqlalchemy import ForeignKey, Text, Enum as SQLEnum, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
 from typing import Optional
@@ -9,6 +9,17 @@ from app.common.enums import BloodType, DonationStatus
 
 class Donation(Base):
     __tablename__ = "donations"
+    __table_args__ = (
+        Index("ix_donations_donor_id", "donor_id"),
+        Index("ix_donations_hospital_id", "hospital_id"),
+        Index("ix_donations_blood_request_id_status", "blood_request_id", "status"),
+        Index(
+            "ix_donations_completed_donor_id_donation_date",
+            "donor_id",
+            "donation_date",
+            postgresql_where=text("status = 'COMPLETED'")
+        ),
+    )
     
     id: Mapped[int_pk]
     donor_id: Mapped[int] = mapped_column(ForeignKey("donors.id"))
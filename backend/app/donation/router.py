@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from typing import List, Optional
 from datetime import datetime
 
-from app.donation.schemas import DonationCreate, DonationDemographicsParams, DonationDemographicsResponse, DonationResponse, DonationStatisticsParams, DonationStatisticsResponse, DonationUpdate, DonationStatusUpdate
+from app.donation.schemas import DonationCreate, DonationDemographicsParams, DonationDemographicsResponse, DonationResponse, DonationStatisticsParams, DonationStatisticsResponse, DonationUpdate, DonationStatusUpdate, DonationBatchComplete
 from app.donation.dao import DonationDAO
 from app.donor.dao import DonorDAO
 from app.hospital.dao import HospitalDAO
 from app.blood_request.dao import BloodRequestDAO
 from app.users.dependencies import get_current_hospital_staff, get_current_user, get_admin_or_hospital_staff
 from app.users.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
+from app.dao.pagination import NEXT_CURSOR_HEADER
+from app.common.streaming import ndjson_response
+from app.common.enums import DonationStatus
 
 
 router = APIRouter(prefix='/donations', tags=['Donations'])
@@ -19,7 +24,7 @@ router = APIRouter(prefix='/donations', tags=['Donations'])
             status_code=status.HTTP_201_CREATED,
             summary="Schedule a new blood donation",
             dependencies=[Depends(get_admin_or_hospital_staff)])
-async def create_donation(donation_data: DonationCreate):
+async def create_donation(donation_data: DonationCreate, session: AsyncSession = Depends(get_session)):
     """
     Schedule a new blood donation.
     
@@ -35,7 +40,7 @@ async def create_donation(donation_data: DonationCreate):
     Raises:
         404: If the donor, hospital, or blood request doesn't exist
     """
-    donor = await DonorDAO.find_one_or_none(id=donation_data.donor_id)
+    donor = await DonorDAO.find_one_or_none(id=donation_data.donor_id, session=session)
     if not donor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,7 +53,7 @@ async def create_donation(donation_data: DonationCreate):
             detail="Donor is currently not eligible to donate blood"
         )
     
-    hospital = await HospitalDAO.find_one_or_none(id=donation_data.hospital_id)
+    hospital = await HospitalDAO.find_one_or_none(id=donation_data.hospital_id, session=session)
     if not hospital:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -56,23 +61,42 @@ async def create_donation(donation_data: DonationCreate):
         )
     
     if donation_data.blood_request_id:
-        blood_request = await BloodRequestDAO.find_one_or_none(id=donation_data.blood_request_id)
+        blood_request = await BloodRequestDAO.find_one_or_none(id=donation_data.blood_request_id, session=session)
         if not blood_request:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Blood request with ID {donation_data.blood_request_id} not found"
             )
     
-    donation = await DonationDAO.create_donation(**donation_data.dict())
+    donation = await DonationDAO.create_donation(**donation_data.dict(), session=session)
     
     return donation
 
 
+@router.get("/stream",
+           summary="Stream donations as NDJSON",
+           dependencies=[Depends(get_admin_or_hospital_staff)])
+async def stream_donations(
+    donor_id: Optional[int] = None,
+    hospital_id: Optional[int] = None,
+    blood_request_id: Optional[int] = None,
+    status: Optional[str] = None
+):
+    """
+    Stream all donations matching the filters as newline-delimited JSON.
+    
+    Accepts the same filters as GET /donations/. Rows are read through a
+    server-side cursor, so memory use stays flat however many match.
+    """
+    filters = _donation_filters(donor_id, hospital_id, blood_request_id, status)
+    return ndjson_response(DonationDAO.stream(**filters), DonationResponse)
+
+
 @router.get("/{donation_id}", 
            response_model=DonationResponse,
            summary="Get donation by ID",
            dependencies=[Depends(get_admin_or_hospital_staff)])
-async def get_donation(donation_id: int):
+async def get_donation(donation_id: int, session: AsyncSession = Depends(get_session)):
     """
     Retrieve a specific donation by ID.
     
@@ -85,7 +109,7 @@ async def get_donation(donation_id: int):
     Raises:
         404: If the donation doesn't exist
     """
-    donation = await DonationDAO.find_one_or_none(id=donation_id)
+    donation = await DonationDAO.find_one_or_none(id=donation_id, session=session)
     
     if not donation:
         raise HTTPException(
@@ -101,23 +125,50 @@ async def get_donation(donation_id: int):
            summary="Get all donations with optional filtering",
            dependencies=[Depends(get_admin_or_hospital_staff)])
 async def get_donations(
+    response: Response,
     donor_id: Optional[int] = None,
     hospital_id: Optional[int] = None,
     blood_request_id: Optional[int] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    session: AsyncSession = Depends(get_session)
 ):
     """
-    Get all donations with optional filtering by donor, hospital, blood request, or status.
+    Get donations with optional filtering by donor, hospital, blood request, or status.
+    
+    Results are ordered by id and returned one page at a time; the cursor
+    for the next page is sent in the X-Next-Cursor header.
     
     Args:
         donor_id: Filter by donor ID
         hospital_id: Filter by hospital ID
         blood_request_id: Filter by blood request ID
         status: Filter by donation status
+        limit: Maximum number of donations to return
+        after: Cursor of the previous page
         
     Returns:
         List of donations matching the filter criteria
     """
+    filters = _donation_filters(donor_id, hospital_id, blood_request_id, status)
+    
+    try:
+        donations, next_cursor = await DonationDAO.find_page(
+            limit=limit,
+            after=after,
+            session=session,
+            **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return donations
+
+
+def _donation_filters(donor_id, hospital_id, blood_request_id, status) -> dict:
     filters = {}
     
     if donor_id:
@@ -132,16 +183,14 @@ async def get_donations(
     if status:
         filters["status"] = status
     
-    donations = await DonationDAO.find_all(**filters)
-    
-    return donations
+    return filters
 
 
 @router.put("/{donation_id}", 
            response_model=DonationResponse,
            summary="Update donation details",
            dependencies=[Depends(get_admin_or_hospital_staff)])
-async def update_donation(donation_id: int, donation_data: DonationUpdate):
+async def update_donation(donation_id: int, donation_data: DonationUpdate, session: AsyncSession = Depends(get_session)):
     """
     Update the details of an existing donation.
     
@@ -159,7 +208,7 @@ async def update_donation(donation_id: int, donation_data: DonationUpdate):
         404: If the donation doesn't exist
         400: If the donation can't be updated due to its current status
     """
-    donation = await DonationDAO.find_one_or_none(id=donation_id)
+    donation = await DonationDAO.find_one_or_none(id=donation_id, session=session)
     
     if not donation:
         raise HTTPException(
@@ -175,7 +224,7 @@ async def update_donation(donation_id: int, donation_data: DonationUpdate):
     
     update_data = {k: v for k, v in donation_data.dict().items() if v is not None}
     
-    updated_donation = await DonationDAO.update(donation_id, **update_data)
+    updated_donation = await DonationDAO.update(donation_id, **update_data, session=session)
     
     return updated_donation
 
@@ -184,7 +233,7 @@ async def update_donation(donation_id: int, donation_data: DonationUpdate):
              response_model=DonationResponse,
              summary="Update donation status",
              dependencies=[Depends(get_admin_or_hospital_staff)])
-async def update_donation_status(donation_id: int, status_data: DonationStatusUpdate):
+async def update_donation_status(donation_id: int, status_data: DonationStatusUpdate, session: AsyncSession = Depends(get_session)):
     """
     Update the status of a donation.
     
@@ -202,7 +251,7 @@ async def update_donation_status(donation_id: int, status_data: DonationStatusUp
         404: If the donation doesn't exist
         400: If the status transition is not allowed
     """
-    donation = await DonationDAO.find_one_or_none(id=donation_id)
+    donation = await DonationDAO.find_one_or_none(id=donation_id, session=session)
     
     if not donation:
         raise HTTPException(
@@ -210,14 +259,16 @@ async def update_donation_status(donation_id: int, status_data: DonationStatusUp
             detail=f"Donation with ID {donation_id} not found"
         )
     
-    if status_data.status == "completed":
-        if not donation.complete():
+    if status_data.status == DonationStatus.COMPLETED:
+        donation = await DonationDAO.complete_donation(donation_id, status_data.reason, session=session)
+        if not donation:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="This donation cannot be marked as completed (must be in scheduled status)"
             )
-    elif status_data.status == "cancelled":
-        if not donation.cancel(status_data.reason):
+    elif status_data.status == DonationStatus.CANCELED:
+        donation = await DonationDAO.cancel_donation(donation_id, status_data.reason, session=session)
+        if not donation:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="This donation cannot be cancelled (must be in scheduled status)"
@@ -226,19 +277,38 @@ async def update_donation_status(donation_id: int, status_data: DonationStatusUp
         donation = await DonationDAO.update_status(
             donation_id,
             status_data.status,
-            status_data.reason
+            status_data.reason,
+            session=session
         )
     
-    await DonationDAO.update(donation_id, status=donation.status, notes=donation.notes)
-    
     return donation
 
 
+@router.post("/complete", 
+            response_model=List[DonationResponse],
+            summary="Complete several donations",
+            dependencies=[Depends(get_admin_or_hospital_staff)])
+async def complete_donations(batch: DonationBatchComplete, session: AsyncSession = Depends(get_session)):
+    """
+    Mark several scheduled donations as completed in one transaction.
+    
+    Donor counters and the collected amount of the linked blood requests
+    are updated together with the donations.
+    
+    Args:
+        batch: IDs of the donations to complete and an optional reason
+        
+    Returns:
+        The donations that were completed; ones that were not scheduled are skipped
+    """
+    return await DonationDAO.complete_donations(batch.donation_ids, batch.reason, session=session)
+
+
 @router.get("/donor/{donor_id}", 
            response_model=List[DonationResponse],
            summary="Get all donations for a donor",
            dependencies=[Depends(get_admin_or_hospital_staff)])
-async def get_donor_donations(donor_id: int):
+async def get_donor_donations(donor_id: int, session: AsyncSession = Depends(get_session)):
     """
     Get all donations for a specific donor.
     
@@ -251,14 +321,14 @@ async def get_donor_donations(donor_id: int):
     Raises:
         404: If the donor doesn't exist
     """
-    donor = await DonorDAO.find_one_or_none(id=donor_id)
+    donor = await DonorDAO.find_one_or_none(id=donor_id, session=session)
     if not donor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Donor with ID {donor_id} not found"
         )
     
-    donations = await DonationDAO.get_donor_donations(donor_id)
+    donations = await DonationDAO.get_donor_donations(donor_id, session=session)
     
     return donations
 
@@ -266,7 +336,7 @@ async def get_donor_donations(donor_id: int):
 @router.get("/my-donations", 
            response_model=List[DonationResponse],
            summary="Get my donation history")
-async def get_my_donations(current_user: User = Depends(get_current_user)):
+async def get_my_donations(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
     """
     Get all donations for the currently authenticated user.
     
@@ -283,7 +353,7 @@ async def get_my_donations(current_user: User = Depends(get_current_user)):
             detail="You don't have a donor role"
         )
     
-    donor = await DonorDAO.find_one_or_none(user_id=current_user.id)
+    donor = await DonorDAO.find_one_or_none(user_id=current_user.id, session=session)
     
     if not donor:
         raise HTTPException(
@@ -291,7 +361,7 @@ async def get_my_donations(current_user: User = Depends(get_current_user)):
             detail="Donor profile not found"
         )
     
-    donations = await DonationDAO.get_donor_donations(donor.id)
+    donations = await DonationDAO.get_donor_donations(donor.id, session=session)
     
     return donations
 
@@ -299,7 +369,8 @@ async def get_my_donations(current_user: User = Depends(get_current_user)):
 @router.get("/query/donation-statistics", response_model=List[DonationStatisticsResponse])
 async def get_donation_statistics_by_region(
     query_params: DonationStatisticsParams = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """Find hospital donation statistics grouped by region and blood type"""
     
@@ -308,7 +379,8 @@ async def get_donation_statistics_by_region(
         min_total_ml=query_params.min_total_ml,
         blood_type=query_params.blood_type,
         months=query_params.months,
-        limit=query_params.limit
+        limit=query_params.limit,
+        session=session
     )
     
     if not statistics:
@@ -320,7 +392,8 @@ async def get_donation_statistics_by_region(
 @router.get("/query/demographics-analysis", response_model=List[DonationDemographicsResponse])
 async def get_donation_demographics(
     query_params: DonationDemographicsParams = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """Analyze donation frequency by demographics"""
     
@@ -330,7 +403,8 @@ async def get_donation_demographics(
         min_donations=query_params.min_donations,
         months=query_params.months,
         group_by=query_params.group_by,
-        limit=query_params.limit
+        limit=query_params.limit,
+        session=session
     )
     
     if not demographics:
@@ -1,6 +1,6 @@
 from enum import Enum
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.common.enums import BloodType, DonationStatus
 
@@ -108,6 +108,19 @@ class DonationStatusUpdate(BaseModel):
         }
     }
 
+class DonationBatchComplete(BaseModel):
+    donation_ids: List[int] = Field(..., min_length=1, max_length=1000, description="IDs of the donations to complete")
+    reason: Optional[str] = Field(None, description="Note added to each completed donation")
+    
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "donation_ids": [12, 15, 21],
+                "reason": "Collection drive completed"
+            }
+        }
+    }
+
 class DonationStatisticsParams(BaseModel):
     min_donations: int = Field(10, description="Minimum number of donations received", ge=1)
     min_total_ml: int = Field(5000, description="Minimum total blood volume collected in ml", ge=500)
@@ -1,9 +1,13 @@
 from app.dao.base import BaseDAO
 from app.donor.models import Donor
-from app.database import async_session_maker
-from sqlalchemy import select, text
-from typing import Optional, List, Dict, Any
-from app.common.enums import BloodType
+from app.database import session_scope
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text, func, cast, Date, or_, update
+from typing import Optional, List, Dict, Any, Iterable, Sequence
+from app.common.enums import BloodType, DonationStatus
+from app.common.cache import cached_method
+from app.common.events import ChangeEvent, publish
+from app.donation.models import Donation
 from datetime import date
 
 
@@ -17,6 +21,7 @@ class DonorDAO(BaseDAO):
                                   date_of_birth: date,
                                   weight: float,
                                   height: float,
+                                  session: Optional[AsyncSession] = None,
                                   **additional_data) -> Donor:
         """
         Ensure a user has a donor profile, creating one if it doesn't exist.
@@ -33,7 +38,7 @@ class DonorDAO(BaseDAO):
         Returns:
             The existing or newly created Donor profile
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             # Check if profile already exists
             query = select(cls.model).filter_by(user_id=user_id)
             result = await session.execute(query)
@@ -54,14 +59,14 @@ class DonorDAO(BaseDAO):
             
             donor = cls.model(**donor_data)
             session.add(donor)
-            await session.commit()
+            await session.flush()
             await session.refresh(donor)
             
             return donor
         
 
     @classmethod
-    async def update(cls, donor_id: int, **values) -> Optional[Donor]:
+    async def update(cls, donor_id: int, session: Optional[AsyncSession] = None, **values) -> Optional[Donor]:
         """
         Update a donor profile with the given values.
         
@@ -72,29 +77,121 @@ class DonorDAO(BaseDAO):
         Returns:
             Updated Donor instance or None if not found
         """
-        async with async_session_maker() as session:
-            donor = await session.execute(select(cls.model).filter_by(id=donor_id))
-            donor = donor.scalar_one_or_none()
-            
-            if not donor:
-                return None
-            
-            for key, value in values.items():
-                if hasattr(donor, key):
-                    setattr(donor, key, value)
-            
-            await session.commit()
-            await session.refresh(donor)
-            
-            return donor
+        columns = cls.model.__table__.columns
+        values = {key: value for key, value in values.items() if key in columns}
+        return await cls.update_returning(donor_id, session=session, **values)
+
+    @classmethod
+    async def lock(cls, donor_ids: Iterable[int], session: AsyncSession) -> List[Donor]:
+        """Lock donors with SELECT ... FOR UPDATE, ordered by id like every other multi-row lock"""
+        donor_ids = set(donor_ids)
+        if not donor_ids:
+            return []
+        result = await session.execute(
+            select(cls.model)
+            .where(cls.model.id.in_(donor_ids))
+            .order_by(cls.model.id)
+            .with_for_update()
+        )
+        return list(result.scalars().all())
+
+    @classmethod
+    async def recount_donations(cls, donor_ids: Iterable[int], session: Optional[AsyncSession] = None) -> List[Donor]:
+        """
+        Recompute donors' total_donations and first/last donation dates from
+        their remaining completed donations.
+
+        Used when a donation stops counting (it leaves COMPLETED, moves to
+        another donor or is deleted), where the counters cannot simply be
+        decremented. Callers lock the affected donations first, so the lock
+        order stays donations, then donors, then requests. See
+        recalculate_donation_counters for the set-based repair of many donors.
+        """
+        donor_ids = set(donor_ids)
+        async with session_scope(session) as session:
+            donors = await cls.lock(donor_ids, session)
+            if not donors:
+                return []
+            donation_date = cast(Donation.donation_date, Date)
+            result = await session.execute(
+                select(Donation.donor_id, func.count(), func.min(donation_date), func.max(donation_date))
+                .where(
+                    Donation.donor_id.in_(donor_ids),
+                    Donation.status == DonationStatus.COMPLETED
+                )
+                .group_by(Donation.donor_id)
+            )
+            history = {donor_id: (total, first, last) for donor_id, total, first, last in result.all()}
+
+            for donor in donors:
+                donor.total_donations, donor.first_donation_date, donor.last_donation_date = \
+                    history.get(donor.id, (0, None, None))
+                publish(session, ChangeEvent(Donor.__tablename__, donor.id))
+            await session.flush()
+            return donors
+
+    @classmethod
+    async def recalculate_donation_counters(
+        cls,
+        donor_ids: Optional[Sequence[int]] = None,
+        session: Optional[AsyncSession] = None
+    ) -> List[int]:
+        """
+        Recompute total_donations and first/last donation dates from completed
+        donations and fix rows that drifted
+
+        The set-based counterpart of recount_donations, used after bulk
+        inserts and as a repair job for counters written before DonationDAO
+        kept them in step.
+
+        Args:
+            donor_ids: Donors to check; all donors if omitted
+
+        Returns:
+            IDs of the donors whose counters were corrected
+        """
+        donation_date = cast(Donation.donation_date, Date)
+
+        def completed(aggregate):
+            return select(aggregate).where(
+                Donation.donor_id == cls.model.id,
+                Donation.status == DonationStatus.COMPLETED
+            ).scalar_subquery()
+
+        total = completed(func.count())
+        first = completed(func.min(donation_date))
+        last = completed(func.max(donation_date))
+
+        async with session_scope(session) as session:
+            query = (
+                update(cls.model)
+                .where(or_(
+                    cls.model.total_donations.is_distinct_from(total),
+                    cls.model.first_donation_date.is_distinct_from(first),
+                    cls.model.last_donation_date.is_distinct_from(last)
+                ))
+                .values(total_donations=total, first_donation_date=first, last_donation_date=last)
+                .returning(cls.model.id)
+                .execution_options(synchronize_session=False)
+            )
+            if donor_ids is not None:
+                query = query.where(cls.model.id.in_(donor_ids))
+
+            result = await session.execute(query)
+            ids = list(result.scalars().all())
+            if ids:
+                cls._publish_bulk_change(session)
+            return ids
         
 
     @classmethod
+    @cached_method(ttl=300, depends_on=("donations", "donors", "users"))
     async def find_donors_by_blood_type_min_donations(
         cls,
         blood_type: str,
         min_donations: int = 1,
-        limit: int = 100
+        limit: int = 100,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find donors with specific blood type who have made at least
@@ -109,7 +206,7 @@ class DonorDAO(BaseDAO):
         if not blood_type_enum:
             return []
         
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
             SELECT 
                 u.id AS user_id,
@@ -130,6 +227,10 @@ class DonorDAO(BaseDAO):
                 donations don ON d.id = don.donor_id
             WHERE 
                 d.blood_type = :blood_type
+                -- total_donations is kept in step by DonationDAO and was backfilled
+                -- by migration f6c2a9d3b817, so donors below the threshold are
+                -- skipped before the join
+                AND d.total_donations >= :min_donations
                 AND don.status = 'COMPLETED'
             GROUP BY 
                 u.id, u.first_name, u.last_name, u.email, u.phone_number, 
@@ -160,15 +261,22 @@ class DonorDAO(BaseDAO):
         
 
     @classmethod
+    @cached_method(ttl=120, depends_on=("donors", "users"))
     async def find_eligible_donors_by_blood_type(
         cls,
         blood_type: str,
         days: int = 56,
-        limit: int = 100
+        limit: int = 100,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find eligible donors with specific blood type who haven't donated in X days.
         
+        Filters on the stored next_eligible_date, which the partial index
+        ix_donors_blood_type_next_eligible_date serves as a range scan.
+        The 56-day interval is always enforced there; days only narrows
+        the result further.
+        
         Args:
             blood_type: Blood type to search for
             days: Minimum number of days since last donation
@@ -186,7 +294,7 @@ class DonorDAO(BaseDAO):
         if not blood_type_enum:
             return []
         
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
             SELECT 
                 u.id AS user_id,
@@ -197,6 +305,7 @@ class DonorDAO(BaseDAO):
                 u.phone_number,
                 d.blood_type,
                 d.last_donation_date,
+                d.next_eligible_date,
                 CASE 
                     WHEN d.last_donation_date IS NOT NULL THEN 
                         (CURRENT_DATE - d.last_donation_date)
@@ -210,12 +319,13 @@ class DonorDAO(BaseDAO):
                 donors d ON u.id = d.user_id
             WHERE 
                 d.blood_type = :blood_type
-                AND d.is_eligible = TRUE
+                AND d.is_eligible
+                AND d.next_eligible_date <= CURRENT_DATE
                 AND (
                     d.last_donation_date IS NULL 
-                    OR (CURRENT_DATE - d.last_donation_date) >= :days
+                    OR d.last_donation_date <= CURRENT_DATE - CAST(:days AS INTEGER)
                 )
-                AND DATE_PART('year', AGE(CURRENT_DATE, d.date_of_birth)) BETWEEN 18 AND 65
+                AND d.date_of_birth > (CURRENT_DATE - INTERVAL '66 years')::date
             ORDER BY 
                 d.last_donation_date ASC NULLS FIRST,
                 u.last_name, 
@@ -236,11 +346,8 @@ class DonorDAO(BaseDAO):
                         donor_dict['blood_type'] = bt.value
                         break
                 
-                donor_dict['can_donate'] = (
-                    donor_dict['is_eligible'] and 
-                    (donor_dict['age'] >= 18 and donor_dict['age'] <= 65) and
-                    (donor_dict['days_since_donation'] is None or donor_dict['days_since_donation'] >= days)
-                )
+                # Every row passed the eligibility filters above
+                donor_dict['can_donate'] = True
                 
                 donors.append(donor_dict)
                     
@@ -248,17 +355,19 @@ class DonorDAO(BaseDAO):
         
 
     @classmethod
+    @cached_method(ttl=600, depends_on=("donations", "donors", "hospitals", "users"))
     async def find_multi_hospital_donors(
         cls,
         min_hospitals: int = 2,
         min_donations: int = 3,
         months: int = 6,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find donors who donated in multiple hospitals with at least a minimum number of total donations.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
             SELECT 
                 d.id AS donor_id,
@@ -323,7 +432,8 @@ class DonorDAO(BaseDAO):
         region: str,
         min_donations: int = 1,
         time_period_months: int = 12,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find donors who have donated to all hospitals in a specific region.
@@ -337,7 +447,7 @@ class DonorDAO(BaseDAO):
         Returns:
             List of donors who have donated to all hospitals in the region
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
             WITH region_hospitals AS (
                 -- Get all hospitals in the specified region
@@ -383,7 +493,7 @@ class DonorDAO(BaseDAO):
                 WHERE 
                     h.region = :region
                     AND don.status = 'COMPLETED'
-                    AND don.donation_date >= CURRENT_DATE - INTERVAL ':months months'
+                    AND don.donation_date >= CURRENT_DATE - (:months * INTERVAL '1 month')
                 GROUP BY 
                     d.id, d.user_id, u.first_name, u.last_name, u.email, u.phone_number, d.blood_type
                 HAVING
@@ -416,7 +526,7 @@ class DonorDAO(BaseDAO):
                     FROM blood_requests br
                     JOIN hospitals h ON br.hospital_id = h.id
                     WHERE h.region = :region
-                    AND br.request_date >= CURRENT_DATE - INTERVAL ':months months'
+                    AND br.request_date >= CURRENT_DATE - (:months * INTERVAL '1 month')
                 ) AS total_region_requests,
                 (
                     SELECT COUNT(DISTINCT h.id)
@@ -445,17 +555,19 @@ class DonorDAO(BaseDAO):
             return [dict(row) for row in result.mappings()]
         
     @classmethod
+    @cached_method(ttl=600, depends_on=("blood_requests", "donations", "donors", "hospitals", "users"))
     async def find_universal_donors_by_region(
         cls,
         region: str,
         min_donations: int = 1,
         time_period_months: int = 12,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find donors who have donated blood in all hospitals within a region.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
             WITH region_hospitals AS (
                 -- All hospitals in the region
@@ -570,13 +682,15 @@ class DonorDAO(BaseDAO):
         
   
     @classmethod
+    @cached_method(ttl=120, depends_on=("blood_requests", "donors", "hospitals", "users"))
     async def find_donors_matching_multiple_requests(
         cls,
         min_match_count: int = 2,
         max_distance_km: float = 50.0,
         region: Optional[str] = None,
         blood_type: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find donors who can potentially fulfill multiple pending blood requests.
@@ -584,7 +698,7 @@ class DonorDAO(BaseDAO):
         This helps identify donors who can make a significant impact by addressing
         multiple blood needs in their vicinity.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             # Створюємо динамічні умови для параметрів, які можуть бути None
             blood_type_filter = "TRUE" if blood_type is None else f"d.blood_type = '{blood_type}'"
             region_filter = "TRUE" if region is None else f"h.region = '{region}'"
@@ -610,7 +724,7 @@ class DonorDAO(BaseDAO):
                     users u ON d.user_id = u.id
                 WHERE
                     d.is_eligible = TRUE
-                    AND (d.ineligible_until IS NULL OR d.ineligible_until < CURRENT_DATE)
+                    AND d.next_eligible_date <= CURRENT_DATE
                     AND {blood_type_filter}
             ),
             open_requests AS (
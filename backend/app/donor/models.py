@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, text, Text, Enum as SQLEnum, CheckConstraint
+from sqlalchemy import ForeignKey, text, Text, Enum as SQLEnum, CheckConstraint, Computed, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import date
 from typing import List, Optional
@@ -13,8 +13,29 @@ class Gender(str, Enum):
     OTHER = "other"
 
 
+# Earliest day a donor may give blood: 18th birthday, 56 days after the
+# last donation and the day after a deferral ends. GREATEST skips NULLs.
+NEXT_ELIGIBLE_DATE_SQL = (
+    "GREATEST("
+    "(date_of_birth + interval '18 years')::date, "
+    "last_donation_date + 56, "
+    "ineligible_until + 1"
+    ")"
+)
+
+
 class Donor(Base):
     __tablename__ = "donors"
+    __table_args__ = (
+        Index(
+            "ix_donors_blood_type_next_eligible_date",
+            "blood_type",
+            "next_eligible_date",
+            postgresql_where=text("is_eligible")
+        ),
+    )
+    # Fetch next_eligible_date with RETURNING instead of lazy loading it after writes
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int_pk]
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), unique=True)
@@ -42,6 +63,10 @@ class Donor(Base):
 
     is_eligible: Mapped[bool] = mapped_column(default=True, server_default=text('true'))
     ineligible_until: Mapped[Optional[date]] = mapped_column(nullable=True)
+    next_eligible_date: Mapped[Optional[date]] = mapped_column(
+        Computed(NEXT_ELIGIBLE_DATE_SQL, persisted=True),
+        comment="Computed by the database from date of birth, last donation and deferral"
+    )
     health_notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     created_at: Mapped[created_at]
@@ -61,6 +86,10 @@ class Donor(Base):
     @property
     def can_donate(self) -> bool:
         today = date.today()
+        if self.next_eligible_date is not None:
+            return self.is_eligible and self.next_eligible_date <= today and self.age <= 65
+        
+        # Not flushed yet, so the database has not computed next_eligible_date
         age_eligible = 18 <= self.age <= 65
         
         time_eligible = True
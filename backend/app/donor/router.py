@@ -6,6 +6,8 @@ from app.donor.dao import DonorDAO
 from app.users.dao import UsersDAO
 from app.users.models import User
 from app.users.dependencies import get_admin_or_hospital_staff, get_current_admin_user, get_current_hospital_staff, get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
 
 
 router = APIRouter(prefix='/donors', tags=['Donors'])
@@ -17,13 +19,14 @@ router = APIRouter(prefix='/donors', tags=['Donors'])
             summary="Register as a donor")
 async def create_donor_profile(
     profile_data: DonorProfileCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Create a donor profile for the current user.
     This also sets the donor role for the user.
     """
-    updated_user = await UsersDAO.set_single_role(current_user.id, "donor")
+    updated_user = await UsersDAO.set_single_role(current_user.id, "donor", session=session)
     
     donor = await DonorDAO.ensure_donor_profile(
         user_id=current_user.id,
@@ -31,7 +34,8 @@ async def create_donor_profile(
         gender=profile_data.gender,
         date_of_birth=profile_data.date_of_birth,
         weight=profile_data.weight,
-        height=profile_data.height
+        height=profile_data.height,
+        session=session
     )
     
     return donor
@@ -41,7 +45,7 @@ async def create_donor_profile(
            response_model=DonorProfileResponse,
            status_code=status.HTTP_200_OK,
            summary="Get my donor profile")
-async def get_my_donor_profile(current_user: User = Depends(get_current_user)):
+async def get_my_donor_profile(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
     """
     Retrieve the donor profile for the currently authenticated user.
     
@@ -57,7 +61,7 @@ async def get_my_donor_profile(current_user: User = Depends(get_current_user)):
             detail="You don't have a donor role"
         )
     
-    donor = await DonorDAO.find_one_or_none(user_id=current_user.id)
+    donor = await DonorDAO.find_one_or_none(user_id=current_user.id, session=session)
     
     if not donor:
         raise HTTPException(
@@ -73,7 +77,7 @@ async def get_my_donor_profile(current_user: User = Depends(get_current_user)):
            status_code=status.HTTP_200_OK,
            summary="Get donor profile by ID",
            dependencies=[Depends(get_current_admin_user)])
-async def get_donor_profile(donor_id: int):
+async def get_donor_profile(donor_id: int, session: AsyncSession = Depends(get_session)):
     """
     Retrieve a donor profile by ID (admin only).
     
@@ -86,7 +90,7 @@ async def get_donor_profile(donor_id: int):
     Raises:
         404: If the donor profile doesn't exist
     """
-    donor = await DonorDAO.find_one_or_none(id=donor_id)
+    donor = await DonorDAO.find_one_or_none(id=donor_id, session=session)
     
     if not donor:
         raise HTTPException(
@@ -103,7 +107,8 @@ async def get_donor_profile(donor_id: int):
            summary="Update my donor profile")
 async def update_my_donor_profile(
     profile_data: DonorProfileCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Update the donor profile for the currently authenticated user.
@@ -123,7 +128,7 @@ async def update_my_donor_profile(
             detail="You don't have a donor role"
         )
     
-    donor = await DonorDAO.find_one_or_none(user_id=current_user.id)
+    donor = await DonorDAO.find_one_or_none(user_id=current_user.id, session=session)
     
     if not donor:
         raise HTTPException(
@@ -138,7 +143,8 @@ async def update_my_donor_profile(
         gender=profile_data.gender,
         date_of_birth=profile_data.date_of_birth,
         weight=profile_data.weight,
-        height=profile_data.height
+        height=profile_data.height,
+        session=session
     )
     
     return updated_donor
@@ -151,7 +157,8 @@ async def update_my_donor_profile(
              dependencies=[Depends(get_admin_or_hospital_staff)])
 async def update_donor_eligibility(
     donor_id: int, 
-    eligibility_data: DonorEligibilityUpdate
+    eligibility_data: DonorEligibilityUpdate,
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Update eligibility status for a donor (admin only) & (hospital_staff).
@@ -171,7 +178,7 @@ async def update_donor_eligibility(
         404: If the donor profile doesn't exist
     """
 
-    donor = await DonorDAO.find_one_or_none(id=donor_id)
+    donor = await DonorDAO.find_one_or_none(id=donor_id, session=session)
     
     if not donor:
         raise HTTPException(
@@ -191,7 +198,7 @@ async def update_donor_eligibility(
         update_data["health_notes"] = None
         update_data["ineligible_until"] = None
     
-    updated_donor = await DonorDAO.update(donor_id, **update_data)
+    updated_donor = await DonorDAO.update(donor_id, **update_data, session=session)
     
     return updated_donor
 
@@ -199,7 +206,7 @@ async def update_donor_eligibility(
 @router.get("/my-eligibility", 
            status_code=status.HTTP_200_OK,
            summary="Check my donation eligibility")
-async def check_my_eligibility(current_user: User = Depends(get_current_user)):
+async def check_my_eligibility(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)):
     """
     Check your own eligibility to donate blood.
     
@@ -216,7 +223,7 @@ async def check_my_eligibility(current_user: User = Depends(get_current_user)):
             detail="You don't have a donor role"
         )
     
-    donor = await DonorDAO.find_one_or_none(user_id=current_user.id)
+    donor = await DonorDAO.find_one_or_none(user_id=current_user.id, session=session)
     
     if not donor:
         raise HTTPException(
@@ -275,6 +282,7 @@ async def check_my_eligibility(current_user: User = Depends(get_current_user)):
         "age_eligible": age_eligible,
         "time_since_last_donation_eligible": time_eligible,
         "ineligible_until": donor.ineligible_until,
+        "next_eligible_date": donor.next_eligible_date,
         "health_notes": donor.health_notes,
         "message": message
     }
@@ -285,14 +293,16 @@ async def check_my_eligibility(current_user: User = Depends(get_current_user)):
 @router.get("/query/by-blood-type-min-donations", response_model=List[DonorWithDonationsResponse])
 async def get_donors_by_blood_type_min_donations(
     query_params: DonorBloodTypeQueryParams = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """Query donors with specific blood type who have made at least the minimum number of donations"""
     
     donors = await DonorDAO.find_donors_by_blood_type_min_donations(
         blood_type=query_params.blood_type,
         min_donations=query_params.min_donations,
-        limit=query_params.limit
+        limit=query_params.limit,
+        session=session
     )
     
     if not donors:
@@ -304,14 +314,16 @@ async def get_donors_by_blood_type_min_donations(
 @router.get("/query/eligible-donors-by-blood-type", response_model=List[EligibleDonorResponse])
 async def get_eligible_donors_by_blood_type(
     query_params: EligibleDonorParams = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """Find eligible donors with specific blood type who haven't donated in X days"""
     
     eligible_donors = await DonorDAO.find_eligible_donors_by_blood_type(
         blood_type=query_params.blood_type,
         days=query_params.days_since_donation,
-        limit=query_params.limit
+        limit=query_params.limit,
+        session=session
     )
     
     return eligible_donors
@@ -320,7 +332,8 @@ async def get_eligible_donors_by_blood_type(
 @router.get("/query/multi-hospital-donors", response_model=List[MultiHospitalDonorResponse])
 async def get_multi_hospital_donors(
     query_params: MultiHospitalDonorParams = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """Find donors who have donated at multiple hospitals within a time period"""
     
@@ -328,7 +341,8 @@ async def get_multi_hospital_donors(
         min_hospitals=query_params.min_hospitals,
         min_donations=query_params.min_donations,
         months=query_params.months,
-        limit=query_params.limit
+        limit=query_params.limit,
+        session=session
     )
     
     if not donors:
@@ -345,7 +359,8 @@ async def get_multi_hospital_donors(
 )
 async def get_universal_donors_by_region(
     query: UniversalDonorRequest = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Find donors who have donated to all hospitals in a specified region.
@@ -356,5 +371,6 @@ async def get_universal_donors_by_region(
         region=query.region,
         min_donations=query.min_donations,
         time_period_months=query.time_period_months,
-        limit=query.limit
+        limit=query.limit,
+        session=session
     )
\ No newline at end of file
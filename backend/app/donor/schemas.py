@@ -134,6 +134,7 @@ class DonorProfileResponse(BaseModel):
 
     is_eligible: bool
     ineligible_until: Optional[date] = None
+    next_eligible_date: Optional[date] = None
     health_notes: Optional[str] = None
     
 
@@ -160,6 +161,7 @@ class DonorProfileResponse(BaseModel):
                 "total_donations": 3,
                 "is_eligible": True,
                 "ineligible_until": None,
+                "next_eligible_date": "2025-03-12",
                 "health_notes": None,
                 "age": 35,
                 "can_donate": True,
@@ -176,6 +178,7 @@ class DonorEligibilityResponse(BaseModel):
     age_eligible: bool
     time_since_last_donation_eligible: bool
     ineligible_until: Optional[date] = None
+    next_eligible_date: Optional[date] = None
     health_notes: Optional[str] = None
     message: str
     
@@ -187,6 +190,7 @@ class DonorEligibilityResponse(BaseModel):
                 "age_eligible": True,
                 "time_since_last_donation_eligible": True,
                 "ineligible_until": None,
+                "next_eligible_date": "2025-03-12",
                 "health_notes": None,
                 "message": "You are eligible to donate blood."
             }
@@ -1,11 +1,16 @@
 from app.dao.base import BaseDAO
+from app.dao.pagination import COUNT_EXACT, COUNT_APPROXIMATE, approximate_count, keyset_filter, split_page, validate_count_mode
 from app.hospital.models import Hospital
-from app.database import async_session_maker
-from sqlalchemy import func, select, or_, text
+from app.database import session_scope
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, text
 from app.common.enums import DonationStatus, RequestStatus
 from typing import List, Optional, Tuple, Dict, Any
 from app.hospital_staff.models import HospitalStaff
 from app.blood_request.models import BloodRequest
+from app.donation.models import Donation
+from app.common.cache import cached_method
+from app.dao.search import HOSPITAL_SEARCH_COLUMNS, search_page
 from sqlalchemy import func, select
 
 
@@ -13,48 +18,75 @@ class HospitalDAO(BaseDAO):
     model = Hospital
 
     @classmethod
-    async def find_paginated(cls, page: int = 1, limit: int = 10, search: Optional[str] = None) -> Tuple[List[Hospital], int]:
+    async def find_paginated(
+        cls,
+        page: int = 1,
+        limit: int = 10,
+        search: Optional[str] = None,
+        after: Optional[str] = None,
+        count: str = COUNT_EXACT,
+        session: Optional[AsyncSession] = None
+    ) -> Tuple[List[Hospital], Optional[int], Optional[str]]:
         """
         Find hospitals with pagination and optional search
         
+        Results are ordered by (name, id). Pass the returned cursor as
+        ``after`` to seek to the next page instead of using OFFSET. With a
+        search term they are ranked by trigram similarity instead, with the
+        hospital a numeric term names by id first.
+        
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), used only when no cursor is given
             limit: Number of items per page
             search: Optional search term for hospital name, city, or region
+            after: Cursor returned with the previous page
+            count: "exact", "approximate" (unfiltered lists only) or "none"
             
         Returns:
-            Tuple of (list of hospitals, total count)
+            Tuple of (list of hospitals, total count or None, next page cursor or None)
         """
-        offset = (page - 1) * limit
+        validate_count_mode(count)
         
-        async with async_session_maker() as session:
-            # Base query
-            query = select(cls.model)
-            count_query = select(func.count(cls.model.id))
-            
-            # Apply search filter if provided
+        async with session_scope(session) as session:
             if search:
-                search_pattern = f"%{search}%"
-                search_filter = or_(
-                    cls.model.name.ilike(search_pattern),
-                    cls.model.city.ilike(search_pattern),
-                    cls.model.region.ilike(search_pattern)
+                return await search_page(
+                    session,
+                    cls.model,
+                    HOSPITAL_SEARCH_COLUMNS,
+                    search,
+                    page=page,
+                    limit=limit,
+                    after=after,
+                    count=count
                 )
-                query = query.where(search_filter)
-                count_query = count_query.where(search_filter)
+            
+            # Base query
+            query = select(cls.model)
             
             # Get total count
-            total_count = await session.scalar(count_query)
+            total_count = None
+            if count == COUNT_EXACT:
+                total_count = await session.scalar(select(func.count(cls.model.id)))
+            elif count == COUNT_APPROXIMATE:
+                total_count = await approximate_count(session, cls.model.__tablename__)
             
             # Get paginated results
-            query = query.order_by(cls.model.name).offset(offset).limit(limit)
+            sort_columns = [cls.model.name, cls.model.id]
+            query = query.order_by(*sort_columns).limit(limit + 1)
+            if after:
+                query = query.where(keyset_filter(sort_columns, after))
+            else:
+                query = query.offset((page - 1) * limit)
+            
             result = await session.execute(query)
-            hospitals = result.scalars().all()
+            hospitals, next_cursor = split_page(
+                result.scalars().all(), limit, lambda hospital: (hospital.name, hospital.id)
+            )
             
-            return hospitals, total_count
+            return hospitals, total_count, next_cursor
 
     @classmethod
-    async def get_hospital_stats(cls, hospital_id: int) -> Optional[Dict[str, Any]]:
+    async def get_hospital_stats(cls, hospital_id: int, session: Optional[AsyncSession] = None) -> Optional[Dict[str, Any]]:
         """
         Get statistics for a specific hospital
         
@@ -64,7 +96,7 @@ class HospitalDAO(BaseDAO):
         Returns:
             Dictionary with statistics or None if hospital not found
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             # Check if hospital exists
             hospital = await session.get(cls.model, hospital_id)
             if not hospital:
@@ -119,27 +151,50 @@ class HospitalDAO(BaseDAO):
             }
 
     @classmethod
-    async def delete(cls, id: int) -> bool:
+    def _deletable_conditions(cls, cascade_donations: bool = False) -> list:
+        """SQL conditions a hospital must satisfy to be deleted"""
+        conditions = [
+            ~select(HospitalStaff.id).where(HospitalStaff.hospital_id == cls.model.id).exists(),
+            ~select(BloodRequest.id).where(BloodRequest.hospital_id == cls.model.id).exists(),
+        ]
+        if not cascade_donations:
+            conditions.append(
+                ~select(Donation.id).where(Donation.hospital_id == cls.model.id).exists()
+            )
+        return conditions
+
+    @classmethod
+    async def delete(
+        cls,
+        id: int,
+        session: Optional[AsyncSession] = None,
+        cascade_donations: bool = False
+    ) -> bool:
         """
         Delete a hospital by ID
         
+        The deletability check and the delete run as one guarded
+        DELETE ... WHERE NOT EXISTS (...) statement, so staff or requests
+        added concurrently cannot slip in between check and delete.
+        
         Args:
             id: ID of the hospital to delete
+            cascade_donations: Also delete donations recorded at the hospital
             
         Returns:
             True if successful, False otherwise
         """
-        async with async_session_maker() as session:
-            async with session.begin():
-                hospital = await session.get(cls.model, id)
-                if not hospital:
-                    return False
-                
-                await session.delete(hospital)
-                return True
+        cascade = (Donation.hospital_id,) if cascade_donations else ()
+        deleted_ids = await cls.delete_where(
+            *cls._deletable_conditions(cascade_donations),
+            session=session,
+            cascade=cascade,
+            id=id
+        )
+        return bool(deleted_ids)
 
     @classmethod
-    async def update(cls, id: int, **values) -> Optional[Hospital]:
+    async def update(cls, id: int, session: Optional[AsyncSession] = None, **values) -> Optional[Hospital]:
         """
         Update a hospital by ID
         
@@ -150,22 +205,11 @@ class HospitalDAO(BaseDAO):
         Returns:
             Updated hospital or None if not found
         """
-        async with async_session_maker() as session:
-            hospital = await session.get(cls.model, id)
-            if not hospital:
-                return None
-            
-            for key, value in values.items():
-                if value is not None:  
-                    setattr(hospital, key, value)
-            
-            await session.commit()
-            
-            await session.refresh(hospital)
-            return hospital
+        values = {key: value for key, value in values.items() if value is not None}
+        return await cls.update_returning(id, session=session, **values)
             
     @classmethod
-    async def can_be_deleted(cls, hospital_id: int) -> bool:
+    async def can_be_deleted(cls, hospital_id: int, session: Optional[AsyncSession] = None) -> bool:
         """
         Check if a hospital can be safely deleted
         
@@ -175,28 +219,19 @@ class HospitalDAO(BaseDAO):
         Returns:
             True if hospital can be deleted, False otherwise
         """
-        async with async_session_maker() as session:
-            
-            staff_count_query = select(func.count(HospitalStaff.id)).where(
-                HospitalStaff.hospital_id == hospital_id
-            )
-            staff_count = await session.scalar(staff_count_query) or 0
-            if staff_count > 0:
-                return False
-            
-            requests_count_query = select(func.count(BloodRequest.id)).where(
-                BloodRequest.hospital_id == hospital_id
-            )
-            requests_count = await session.scalar(requests_count_query) or 0
-            if requests_count > 0:
-                return False
-            
-            return True
+        deletable_ids = await cls.delete_where(
+            *cls._deletable_conditions(),
+            session=session,
+            dry_run=True,
+            id=hospital_id
+        )
+        return bool(deletable_ids)
         
 
     @classmethod
-    async def find_hospitals_with_identical_needs(cls, reference_hospital_id, time_period_days=30, min_shortage_percent=25.0, limit=50):
-        async with async_session_maker() as session:
+    @cached_method(ttl=300, depends_on=("blood_requests", "hospitals"))
+    async def find_hospitals_with_identical_needs(cls, reference_hospital_id, time_period_days=30, min_shortage_percent=25.0, limit=50, session: Optional[AsyncSession] = None):
+        async with session_scope(session) as session:
             query = text("""
             WITH reference_hospital_needs AS (
                 -- Calculate blood type shortages for reference hospital
@@ -206,26 +241,14 @@ class HospitalDAO(BaseDAO):
                     br.blood_type,
                     COUNT(DISTINCT br.id) AS request_count,
                     SUM(br.amount_needed_ml) AS total_needed_ml,
-                    SUM(COALESCE(d.collected_ml, 0)) AS total_collected_ml,
-                    SUM(br.amount_needed_ml) - SUM(COALESCE(d.collected_ml, 0)) AS shortage_ml,
-                    (SUM(br.amount_needed_ml) - SUM(COALESCE(d.collected_ml, 0))) * 100.0 / 
+                    SUM(br.collected_ml) AS total_collected_ml,
+                    SUM(br.amount_needed_ml) - SUM(br.collected_ml) AS shortage_ml,
+                    (SUM(br.amount_needed_ml) - SUM(br.collected_ml)) * 100.0 / 
                         NULLIF(SUM(br.amount_needed_ml), 0) AS shortage_percent
                 FROM 
                     hospitals h
                 JOIN 
                     blood_requests br ON h.id = br.hospital_id
-                LEFT JOIN (
-                    -- Subquery to get sum of collected blood by request
-                    SELECT 
-                        blood_request_id,
-                        SUM(blood_amount_ml) AS collected_ml
-                    FROM 
-                        donations
-                    WHERE 
-                        status = 'COMPLETED'
-                    GROUP BY 
-                        blood_request_id
-                ) d ON br.id = d.blood_request_id
                 WHERE 
                     h.id = :reference_hospital_id
                     AND br.status IN ('PENDING', 'APPROVED')
@@ -233,7 +256,7 @@ class HospitalDAO(BaseDAO):
                 GROUP BY 
                     h.id, h.name, br.blood_type
                 HAVING 
-                    (SUM(br.amount_needed_ml) - SUM(COALESCE(d.collected_ml, 0))) * 100.0 / 
+                    (SUM(br.amount_needed_ml) - SUM(br.collected_ml)) * 100.0 / 
                     NULLIF(SUM(br.amount_needed_ml), 0) >= :min_shortage_percent
                 ORDER BY 
                     br.blood_type
@@ -248,26 +271,14 @@ class HospitalDAO(BaseDAO):
                     br.blood_type,
                     COUNT(DISTINCT br.id) AS request_count,
                     SUM(br.amount_needed_ml) AS total_needed_ml,
-                    SUM(COALESCE(d.collected_ml, 0)) AS total_collected_ml,
-                    SUM(br.amount_needed_ml) - SUM(COALESCE(d.collected_ml, 0)) AS shortage_ml,
-                    (SUM(br.amount_needed_ml) - SUM(COALESCE(d.collected_ml, 0))) * 100.0 / 
+                    SUM(br.collected_ml) AS total_collected_ml,
+                    SUM(br.amount_needed_ml) - SUM(br.collected_ml) AS shortage_ml,
+                    (SUM(br.amount_needed_ml) - SUM(br.collected_ml)) * 100.0 / 
                         NULLIF(SUM(br.amount_needed_ml), 0) AS shortage_percent
                 FROM 
                     hospitals h
                 JOIN 
                     blood_requests br ON h.id = br.hospital_id
-                LEFT JOIN (
-                    -- Subquery to get sum of collected blood by request
-                    SELECT 
-                        blood_request_id,
-                        SUM(blood_amount_ml) AS collected_ml
-                    FROM 
-                        donations
-                    WHERE 
-                        status = 'COMPLETED'
-                    GROUP BY 
-                        blood_request_id
-                ) d ON br.id = d.blood_request_id
                 WHERE 
                     h.id != :reference_hospital_id
                     AND br.status IN ('PENDING', 'APPROVED')
@@ -275,7 +286,7 @@ class HospitalDAO(BaseDAO):
                 GROUP BY 
                     h.id, h.name, h.city, h.region, br.blood_type
                 HAVING
-                    (SUM(br.amount_needed_ml) - SUM(COALESCE(d.collected_ml, 0))) * 100.0 / 
+                    (SUM(br.amount_needed_ml) - SUM(br.collected_ml)) * 100.0 / 
                     NULLIF(SUM(br.amount_needed_ml), 0) >= :min_shortage_percent
             ),
             ref_blood_types AS (
@@ -351,22 +362,22 @@ class HospitalDAO(BaseDAO):
         
 
     @classmethod
-    async def get_all_hospitals(cls, limit=100):
+    async def get_all_hospitals(cls, limit=100, session: Optional[AsyncSession] = None):
         """Get all hospitals with an optional limit"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(cls.model).limit(limit)
             result = await session.execute(query)
             return result.scalars().all()
         
     @classmethod
-    async def get_unique_regions(cls) -> List[str]:
+    async def get_unique_regions(cls, session: Optional[AsyncSession] = None) -> List[str]:
         """
         Get a list of all unique regions where hospitals are located.
         
         Returns:
             List of unique region names sorted alphabetically
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(cls.model.region).distinct().order_by(cls.model.region)
             result = await session.execute(query)
             regions = result.scalars().all()
@@ -376,17 +387,19 @@ class HospitalDAO(BaseDAO):
         
 
     @classmethod
+    @cached_method(ttl=900, depends_on=("blood_requests", "hospitals"))
     async def find_hospitals_with_similar_blood_request_patterns(
         cls, 
         min_similarity_percent: float = 50.0,
         min_request_count: int = 3,
         time_period_months: int = 24,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Знаходить пари лікарень з подібними патернами запитів на групи крові.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text(f"""
             WITH blood_requests_by_hospital AS (
                 -- Запити на кров по кожній лікарні 
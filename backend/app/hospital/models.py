@@ -1,4 +1,4 @@
-from sqlalchemy import Enum as SQLEnum, Text
+from sqlalchemy import Enum as SQLEnum, Index, Text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import List, Optional
 from app.database import Base, int_pk, str_uniq, created_at, updated_at
@@ -7,6 +7,10 @@ from app.common.enums import HospitalType
 
 class Hospital(Base):
     __tablename__ = "hospitals"
+    __table_args__ = tuple(
+        Index(f"ix_hospitals_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+        for column in ("name", "city", "region")
+    )
     
     id: Mapped[int_pk]
     name: Mapped[str_uniq]
@@ -13,6 +13,8 @@ from app.hospital.dao import HospitalDAO
 from app.users.dependencies import get_current_admin_user, get_current_hospital_staff
 from app.users.models import User
 import math
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
 
 
 router = APIRouter(prefix="/api/hospitals", tags=["Hospitals"])
@@ -22,21 +24,22 @@ router = APIRouter(prefix="/api/hospitals", tags=["Hospitals"])
 @router.post("/", response_model=HospitalResponse, status_code=status.HTTP_201_CREATED)
 async def create_hospital(
     hospital_data: HospitalCreate,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: User = Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Create a new hospital
     
     Requires admin privileges
     """
-    existing_hospital = await HospitalDAO.find_one_or_none(name=hospital_data.name)
+    existing_hospital = await HospitalDAO.find_one_or_none(name=hospital_data.name, session=session)
     if existing_hospital:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Hospital with name '{hospital_data.name}' already exists"
         )
     
-    new_hospital = await HospitalDAO.add(**hospital_data.model_dump())
+    new_hospital = await HospitalDAO.add(**hospital_data.model_dump(), session=session)
     return new_hospital
 
 
@@ -44,32 +47,53 @@ async def create_hospital(
 async def list_hospitals(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Items per page"),
-    search: Optional[str] = Query(None, description="Search term for hospital name, city or region")
+    search: Optional[str] = Query(None, description="Search term for hospital name, city or region"),
+    after: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    count: str = Query("exact", pattern="^(exact|approximate|none)$", description="How to compute the total"),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     List hospitals with pagination and optional search
+    
+    Hospitals are ordered by name. Pass next_cursor as ``after`` to get the
+    following page without OFFSET; ``page`` is only used when no cursor is given.
     """
-    hospitals, total = await HospitalDAO.find_paginated(page=page, limit=size, search=search)
+    try:
+        hospitals, total, next_cursor = await HospitalDAO.find_paginated(
+            page=page,
+            limit=size,
+            search=search,
+            after=after,
+            count=count,
+            session=session
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    total_pages = math.ceil(total / size) if total > 0 else 1
+    if total is None:
+        total_pages = None
+    else:
+        total_pages = math.ceil(total / size) if total > 0 else 1
     
     return {
         "items": hospitals,
         "total": total,
         "page": page,
         "size": size,
-        "pages": total_pages
+        "pages": total_pages,
+        "next_cursor": next_cursor
     }
 
 
 @router.get("/{hospital_id}", response_model=HospitalResponse)
 async def get_hospital(
-    hospital_id: int = Path(..., ge=1, description="The ID of the hospital to retrieve")
+    hospital_id: int = Path(..., ge=1, description="The ID of the hospital to retrieve"),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Get hospital details by ID
     """
-    hospital = await HospitalDAO.find_one_or_none_by_id(hospital_id)
+    hospital = await HospitalDAO.find_one_or_none_by_id(hospital_id, session=session)
     if not hospital:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -83,14 +107,15 @@ async def get_hospital(
 async def update_hospital(
     hospital_data: HospitalUpdate,
     hospital_id: int = Path(..., ge=1, description="The ID of the hospital to update"),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: User = Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Update hospital details
     
     Requires admin privileges
     """
-    hospital = await HospitalDAO.find_one_or_none_by_id(hospital_id)
+    hospital = await HospitalDAO.find_one_or_none_by_id(hospital_id, session=session)
     if not hospital:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -98,7 +123,7 @@ async def update_hospital(
         )
     
     if hospital_data.name and hospital_data.name != hospital.name:
-        existing_hospital = await HospitalDAO.find_one_or_none(name=hospital_data.name)
+        existing_hospital = await HospitalDAO.find_one_or_none(name=hospital_data.name, session=session)
         if existing_hospital and existing_hospital.id != hospital_id:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -106,28 +131,28 @@ async def update_hospital(
             )
     
     update_data = {k: v for k, v in hospital_data.model_dump().items() if v is not None}
-    updated_hospital = await HospitalDAO.update(hospital_id, **update_data)
+    updated_hospital = await HospitalDAO.update(hospital_id, **update_data, session=session)
     
     return updated_hospital
 
 
 @router.delete("/{hospital_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_hospital(hospital_id: int = Path(...), current_user: User = Depends(get_current_admin_user)):
-    hospital = await HospitalDAO.find_one_or_none_by_id(hospital_id)
+async def delete_hospital(hospital_id: int = Path(...), current_user: User = Depends(get_current_admin_user), session: AsyncSession = Depends(get_session)):
+    hospital = await HospitalDAO.find_one_or_none_by_id(hospital_id, session=session)
     if not hospital:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Hospital with ID {hospital_id} not found"
         )
     
-    can_delete = await HospitalDAO.can_be_deleted(hospital_id)
+    can_delete = await HospitalDAO.can_be_deleted(hospital_id, session=session)
     if not can_delete:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail="Cannot delete hospital with associated staff or blood requests"
+            detail="Cannot delete hospital with associated staff, blood requests or donations"
         )
     
-    success = await HospitalDAO.delete(hospital_id)
+    success = await HospitalDAO.delete(hospital_id, session=session)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -139,12 +164,13 @@ async def delete_hospital(hospital_id: int = Path(...), current_user: User = Dep
 
 @router.get("/{hospital_id}/stats", response_model=HospitalStatsResponse)
 async def get_hospital_stats(
-    hospital_id: int = Path(..., ge=1, description="The ID of the hospital")
+    hospital_id: int = Path(..., ge=1, description="The ID of the hospital"),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Get hospital statistics including staff count, blood requests, and donations
     """
-    stats = await HospitalDAO.get_hospital_stats(hospital_id)
+    stats = await HospitalDAO.get_hospital_stats(hospital_id, session=session)
     if not stats:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -162,7 +188,8 @@ async def get_hospital_stats(
 )
 async def get_hospitals_with_identical_needs(
     query: IdenticalNeedsRequest = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Find hospitals with identical blood type needs as a reference hospital.
@@ -172,5 +199,6 @@ async def get_hospitals_with_identical_needs(
         reference_hospital_id=query.reference_hospital_id,
         time_period_days=query.time_period_days,
         min_shortage_percent=query.min_shortage_percent,
-        limit=query.limit
+        limit=query.limit,
+        session=session
     )
\ No newline at end of file
@@ -66,10 +66,11 @@ class HospitalResponse(HospitalBase):
 class HospitalListResponse(BaseModel):
     """Schema for paginated list of hospitals"""
     items: List[HospitalResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
     class Config:
         json_schema_extra = {
@@ -93,7 +94,8 @@ class HospitalListResponse(BaseModel):
                 "total": 10,
                 "page": 1,
                 "size": 10,
-                "pages": 1
+                "pages": 1,
+                "next_cursor": None
             }
         }
 
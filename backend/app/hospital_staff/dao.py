@@ -1,11 +1,15 @@
 from app.dao.base import BaseDAO
 from app.hospital_staff.models import HospitalStaff
-from app.database import async_session_maker
+from app.hospital.models import Hospital
+from app.users.models import User
+from app.database import session_scope
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 from sqlalchemy.orm import joinedload
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.common.enums import BloodType
+from app.common.cache import cached_method
 
 
 class HospitalStaffDAO(BaseDAO):
@@ -15,7 +19,8 @@ class HospitalStaffDAO(BaseDAO):
     async def ensure_hospital_staff_profile(cls, user_id: int, 
                                           hospital_id: int,
                                           role: str = None,
-                                          department: str = None) -> HospitalStaff:
+                                          department: str = None,
+                                          session: Optional[AsyncSession] = None) -> HospitalStaff:
         """
         Ensure a user has a hospital staff profile, creating one if it doesn't exist.
         
@@ -28,7 +33,7 @@ class HospitalStaffDAO(BaseDAO):
         Returns:
             The existing or newly created HospitalStaff profile
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             # Check if profile already exists
             query = select(cls.model).filter_by(user_id=user_id)
             result = await session.execute(query)
@@ -51,13 +56,13 @@ class HospitalStaffDAO(BaseDAO):
                 
             staff = cls.model(**staff_data)
             session.add(staff)
-            await session.commit()
+            await session.flush()
             await session.refresh(staff)
             
             return staff
         
     @classmethod
-    async def update(cls, staff_id: int, **values) -> Optional[HospitalStaff]:
+    async def update(cls, staff_id: int, session: Optional[AsyncSession] = None, **values) -> Optional[HospitalStaff]:
         """
         Update a hospital staff profile with the given values.
         
@@ -68,40 +73,57 @@ class HospitalStaffDAO(BaseDAO):
         Returns:
             Updated HospitalStaff instance or None if not found
         """
-        async with async_session_maker() as session:
-            staff = await session.execute(select(cls.model).filter_by(id=staff_id))
-            staff = staff.scalar_one_or_none()
-            
-            if not staff:
-                return None
-            
-            for key, value in values.items():
-                if hasattr(staff, key):
-                    setattr(staff, key, value)
-            await session.commit()
-            await session.refresh(staff)
-            
-            return staff
+        columns = cls.model.__table__.columns
+        values = {key: value for key, value in values.items() if key in columns}
+        return await cls.update_returning(staff_id, session=session, **values)
         
     @classmethod
-    async def find_one_or_none_with_hospital(cls, **filter_by):
+    async def find_one_or_none_with_hospital(cls, session: Optional[AsyncSession] = None, **filter_by):
         """Find staff profile with hospital relationship eagerly loaded"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(cls.model).options(
                 joinedload(cls.model.hospital)
             ).filter_by(**filter_by)
             
             result = await session.execute(query)
             return result.scalar_one_or_none()
+    
+    @classmethod
+    async def find_user_with_profile(
+        cls,
+        user_id: int,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[Tuple[User, Optional[HospitalStaff], Optional[Hospital]]]:
+        """
+        Load a user together with their staff profile and hospital in one query
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            Tuple of (user, staff profile or None, hospital or None),
+            or None if the user does not exist
+        """
+        async with session_scope(session) as session:
+            query = select(User, cls.model, Hospital).outerjoin(
+                cls.model, cls.model.user_id == User.id
+            ).outerjoin(
+                Hospital, Hospital.id == cls.model.hospital_id
+            ).where(User.id == user_id)
+            
+            row = (await session.execute(query)).first()
+            return tuple(row) if row else None
         
 
     @classmethod
+    @cached_method(ttl=600, depends_on=("blood_requests", "hospital_staff", "hospitals", "users"))
     async def find_staff_by_performance(
         cls,
         min_requests: int = 5,
         min_fulfillment_rate: float = 70.0,
         months: int = 6,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find hospital staff by their blood request fulfillment rate.
@@ -112,7 +134,7 @@ class HospitalStaffDAO(BaseDAO):
             months: Look back period in months
             limit: Maximum number of results
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
             WITH staff_stats AS (
                 SELECT
@@ -162,7 +184,7 @@ class HospitalStaffDAO(BaseDAO):
                 (SELECT COUNT(DISTINCT br.blood_type) 
                 FROM blood_requests br 
                 WHERE br.staff_id = ss.staff_id 
-                AND br.created_at > NOW() - INTERVAL ':months months') AS blood_type_count,
+                AND br.created_at > NOW() - (:months * INTERVAL '1 month')) AS blood_type_count,
                 (SELECT STRING_AGG(DISTINCT br.blood_type::text, ', ')
                 FROM blood_requests br 
                 WHERE br.staff_id = ss.staff_id 
@@ -206,17 +228,19 @@ class HospitalStaffDAO(BaseDAO):
         
 
     @classmethod
+    @cached_method(ttl=600, depends_on=("blood_requests", "hospital_staff", "hospitals", "users"))
     async def find_staff_with_matching_request_patterns(
         cls,
         min_blood_types: int = 2,
         min_similarity_percent: float = 90.0,
         time_period_months: int = 6,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Find pairs of hospital staff who have created the same pattern of blood type requests.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = text("""
             WITH staff_request_patterns AS (
                 -- Calculate the blood type request patterns for each staff member
@@ -370,12 +394,14 @@ class HospitalStaffDAO(BaseDAO):
         
 
     @classmethod
+    @cached_method(ttl=900, depends_on=("blood_requests", "donations", "donors", "hospital_staff", "hospitals", "users"))
     async def find_doctors_with_donor_supersets(
         cls, 
         min_donor_count: int = 2,  # Знижено з 3 до 2
         min_similarity_percent: float = 50.0,  # Новий параметр - мінімальний % спільних донорів
         specific_hospital_id: Optional[int] = None, 
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Знаходить пари лікарів, де множина донорів першого значною мірою перекривається 
@@ -387,7 +413,7 @@ class HospitalStaffDAO(BaseDAO):
             specific_hospital_id: ID конкретної лікарні (необов'язково)
             limit: Максимальна кількість результатів
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             # Формуємо умову для фільтрації по лікарні
             hospital_filter = "TRUE" if specific_hospital_id is None else f"hs.hospital_id = {specific_hospital_id}"
             
@@ -548,12 +574,14 @@ class HospitalStaffDAO(BaseDAO):
             return [dict(row) for row in result.mappings()]
             
     @classmethod
+    @cached_method(ttl=3600, depends_on=("blood_requests", "hospitals"))
     async def find_seasonal_blood_request_patterns(
         cls,
         min_request_count: int = 10,
         analysis_years: int = 2,
         region: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[AsyncSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Аналізує сезонні тренди і патерни в запитах на кров різних типів.
@@ -567,7 +595,7 @@ class HospitalStaffDAO(BaseDAO):
             region: Обмеження аналізу одним регіоном (опціонально)
             limit: Максимальна кількість результатів
         """
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             # Формуємо умову для фільтрації по регіону
             region_filter = "TRUE" if region is None else f"h.region = '{region}'"
             
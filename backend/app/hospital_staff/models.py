@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import ForeignKey, Text, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import List
 from enum import Enum as PyEnum
@@ -7,6 +7,9 @@ from app.common.enums import StaffRole, Department
 
 class HospitalStaff(Base):
     __tablename__ = "hospital_staff"
+    __table_args__ = (
+        Index("ix_hospital_staff_hospital_id", "hospital_id"),
+    )
     
     id: Mapped[int_pk]
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), unique=True)
@@ -4,10 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.hospital_staff.dao import HospitalStaffDAO
 from app.hospital_staff.schemas import HospitalStaffProfileCreate, HospitalStaffProfileResponse, MatchingStaffPatternsRequest, MatchingStaffPatternsResponse, StaffPerformanceParams, StaffPerformanceResponse
 from app.users.dao import UsersDAO
-from app.users.dependencies import get_admin_or_hospital_staff, get_current_hospital_staff, get_current_user
+from app.users.dependencies import StaffContext, get_admin_or_hospital_staff, get_current_hospital_staff, get_current_staff_context, get_current_user
 from app.users.models import User
 from app.hospital.dao import HospitalDAO
 from app.donor.dao import DonorDAO
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
 
 
 router = APIRouter(prefix='/hospital-staff', tags=['Hospital Staff'])
@@ -19,7 +21,8 @@ router = APIRouter(prefix='/hospital-staff', tags=['Hospital Staff'])
             summary="Register as hospital staff")
 async def create_hospital_staff_profile(
     profile_data: HospitalStaffProfileCreate,
-    current_user: User = Depends(get_current_hospital_staff)
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Create a hospital staff profile for the current user.
@@ -35,27 +38,28 @@ async def create_hospital_staff_profile(
         404: If the specified hospital doesn't exist
         400: If user already has a hospital staff profile
     """
-    hospital = await HospitalDAO.find_one_or_none(id=profile_data.hospital_id)
+    hospital = await HospitalDAO.find_one_or_none(id=profile_data.hospital_id, session=session)
     if not hospital:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Hospital with ID {profile_data.hospital_id} not found"
         )
     
-    existing_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
-    if existing_profile:
+    if staff_context.staff:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User already has a hospital staff profile"
         )
     
-    updated_user = await UsersDAO.set_single_role(current_user.id, "hospital_staff")
+    current_user = staff_context.user
+    updated_user = await UsersDAO.set_single_role(current_user.id, "hospital_staff", session=session)
     
     staff = await HospitalStaffDAO.ensure_hospital_staff_profile(
         user_id=current_user.id,
         hospital_id=profile_data.hospital_id,
         role=profile_data.role,
-        department=profile_data.department
+        department=profile_data.department,
+        session=session
     )
     
     return staff
@@ -65,7 +69,7 @@ async def create_hospital_staff_profile(
            response_model=HospitalStaffProfileResponse,
            status_code=status.HTTP_200_OK,
            summary="Get my hospital staff profile")
-async def get_my_hospital_staff_profile(current_user: User = Depends(get_current_hospital_staff)):
+async def get_my_hospital_staff_profile(staff_context: StaffContext = Depends(get_current_staff_context)):
     """
     Retrieve the hospital staff profile for the currently authenticated user.
     
@@ -75,22 +79,20 @@ async def get_my_hospital_staff_profile(current_user: User = Depends(get_current
     Raises:
         404: If the user doesn't have a hospital staff profile
     """
-    
-    donor = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
-    
-    if not donor:
+    if not staff_context.staff:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Donor profile not found"
+            detail="Hospital staff profile not found"
         )
     
-    return donor
+    return staff_context.staff
 
 
 @router.get("/query/staff-performance", response_model=List[StaffPerformanceResponse])
 async def get_staff_by_performance(
     query_params: StaffPerformanceParams = Depends(),
-    current_user: User = Depends(get_admin_or_hospital_staff)
+    current_user: User = Depends(get_admin_or_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """Find hospital staff by their blood request fulfillment rate"""
     
@@ -98,7 +100,8 @@ async def get_staff_by_performance(
         min_requests=query_params.min_requests,
         min_fulfillment_rate=query_params.min_fulfillment_rate,
         months=query_params.months,
-        limit=query_params.limit
+        limit=query_params.limit,
+        session=session
     )
     
     if not staff:
@@ -115,7 +118,8 @@ async def get_staff_by_performance(
 )
 async def get_staff_with_matching_patterns(
     query: MatchingStaffPatternsRequest = Depends(),
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Find pairs of hospital staff who have created the same pattern of blood type requests.
@@ -126,7 +130,8 @@ async def get_staff_with_matching_patterns(
         min_blood_types=query.min_blood_types,
         min_similarity_percent=query.min_similarity_percent,
         time_period_months=query.time_period_months,
-        limit=query.limit
+        limit=query.limit,
+        session=session
     )
 
 from fastapi import APIRouter, Depends, Query
@@ -141,14 +146,16 @@ async def find_doctors_with_donor_supersets(
     min_similarity_percent: float = Query(50.0, description="Minimum percentage of shared donors"),
     specific_hospital_id: Optional[int] = Query(None, description="Filter by specific hospital"),
     limit: int = Query(50, description="Maximum number of results"),
-    current_staff = Depends(get_current_hospital_staff)
+    current_staff = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ) -> List[Dict[str, Any]]:
     """Find pairs of doctors where one doctor's donor set significantly overlaps with another's."""
     return await HospitalStaffDAO.find_doctors_with_donor_supersets(
         min_donor_count=min_donor_count,
         min_similarity_percent=min_similarity_percent,
         specific_hospital_id=specific_hospital_id,
-        limit=limit
+        limit=limit,
+        session=session
     )
 
 @router.get("/analytics/hospital-blood-patterns")
@@ -157,14 +164,16 @@ async def find_hospitals_with_similar_blood_request_patterns(
     min_request_count: int = Query(5, description="Minimum number of blood requests per hospital"),
     time_period_months: int = Query(12, description="Period in months to analyze"),
     limit: int = Query(50, description="Maximum number of results"),
-    current_staff = Depends(get_current_hospital_staff)
+    current_staff = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ) -> List[Dict[str, Any]]:
     """Find pairs of hospitals with similar blood request patterns."""
     return await HospitalDAO.find_hospitals_with_similar_blood_request_patterns(
         min_similarity_percent=min_similarity_percent,
         min_request_count=min_request_count,
         time_period_months=time_period_months,
-        limit=limit
+        limit=limit,
+        session=session
     )
 
 @router.get("/analytics/multi-request-donors")
@@ -174,7 +183,8 @@ async def find_donors_matching_multiple_requests(
     region: Optional[str] = Query(None, description="Filter by specific region"),
     blood_type: Optional[str] = Query(None, description="Filter by specific blood type"),
     limit: int = Query(50, description="Maximum number of results"),
-    current_staff = Depends(get_current_hospital_staff)
+    current_staff = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ) -> List[Dict[str, Any]]:
     """Find donors who can potentially fulfill multiple pending blood requests."""
     return await DonorDAO.find_donors_matching_multiple_requests(
@@ -182,7 +192,8 @@ async def find_donors_matching_multiple_requests(
         max_distance_km=max_distance_km,
         region=region,
         blood_type=blood_type,
-        limit=limit
+        limit=limit,
+        session=session
     )
 
 @router.get("/analytics/seasonal-blood-patterns",
@@ -193,7 +204,8 @@ async def find_seasonal_blood_request_patterns(
     analysis_years: int = Query(2, description="Number of years to analyze"),
     region: Optional[str] = Query(None, description="Filter by specific region"),
     limit: int = Query(50, description="Maximum number of results"),
-    current_staff = Depends(get_current_hospital_staff)
+    current_staff = Depends(get_current_hospital_staff),
+    session: AsyncSession = Depends(get_session)
 ) -> List[Dict[str, Any]]:
     """
     Analyze seasonal trends and patterns in blood type requests across regions.
@@ -205,5 +217,6 @@ async def find_seasonal_blood_request_patterns(
         min_request_count=min_request_count,
         analysis_years=analysis_years,
         region=region,
-        limit=limit
+        limit=limit,
+        session=session
     )
\ No newline at end of file
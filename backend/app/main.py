@@ -11,6 +11,9 @@ from app.donation.router import router as router_donation
 from app.blood_request.router import router as blood_request_router
 from app.hospital.router import router as hospital
 from app.tables.router import router as tables_router
+from app.search.router import router as search_router
+from app.monitoring.router import router as monitoring_router
+from app.matching.router import router as matching_router
 
 from app.pages.common import router as common_pages_router
 from app.pages.auth import router as auth_pages_router
@@ -35,6 +38,9 @@ app.include_router(router_donation)
 app.include_router(blood_request_router)
 app.include_router(hospital)
 app.include_router(tables_router, prefix="/api")
+app.include_router(search_router, prefix="/api")
+app.include_router(monitoring_router)
+app.include_router(matching_router)
 
 
 app.include_router(common_pages_router)
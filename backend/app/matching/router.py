@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.enums import BloodType
+from app.database import get_session
+from app.matching.schemas import RequestMatches
+from app.matching.service import match_open_requests
+from app.users.dependencies import get_admin_or_hospital_staff
+
+
+router = APIRouter(prefix='/matching', tags=['Matching'])
+
+
+@router.get("/open-requests",
+           response_model=List[RequestMatches],
+           summary="Rank compatible donors for open blood requests",
+           dependencies=[Depends(get_admin_or_hospital_staff)])
+async def get_open_request_matches(
+    region: Optional[str] = None,
+    blood_type: Optional[BloodType] = None,
+    per_request: int = Query(10, ge=1, le=50),
+    limit: int = Query(50, ge=1, le=200),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get ranked donor candidates for each open blood request.
+
+    Requests are ordered by urgency, then by needed-by date. Candidates are
+    donors who can donate today, whose blood is red-cell compatible with
+    the request, and who have donated in the request's region. First-time
+    donors match requests in any region, and requests at hospitals without
+    a region match compatible donors anywhere.
+
+    Args:
+        region: Only include requests from hospitals in this region
+        blood_type: Only include requests for this blood type
+        per_request: Maximum number of candidates per request
+        limit: Maximum number of requests
+
+    Returns:
+        Open requests with their ranked candidates
+    """
+    return await match_open_requests(
+        region=region,
+        blood_type=blood_type,
+        per_request=per_request,
+        limit=limit,
+        session=session
+    )
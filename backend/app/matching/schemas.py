@@ -0,0 +1,62 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date, datetime
+from app.common.enums import BloodType
+
+
+class MatchCandidate(BaseModel):
+    """A donor who can give blood for a request right now"""
+    donor_id: int
+    user_id: int
+    first_name: str
+    last_name: str
+    email: str
+    phone_number: Optional[str] = None
+    blood_type: BloodType
+    region: Optional[str] = Field(None, description="Region of a hospital where the donor has donated")
+    last_donation_date: Optional[date] = None
+    total_donations: int = 0
+    exact_match: bool = Field(..., description="Whether the donor has exactly the requested blood type")
+
+
+class RequestMatches(BaseModel):
+    """An open blood request with its ranked donor candidates"""
+    request_id: int
+    hospital_id: int
+    hospital_name: str
+    region: Optional[str] = None
+    blood_type: BloodType
+    urgency_level: int
+    needed_by_date: Optional[datetime] = None
+    remaining_ml: int
+    candidates: List[MatchCandidate]
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "request_id": 17,
+                "hospital_id": 3,
+                "hospital_name": "Lviv Regional Hospital",
+                "region": "Lviv",
+                "blood_type": "A+",
+                "urgency_level": 5,
+                "needed_by_date": "2025-04-02T12:00:00",
+                "remaining_ml": 900,
+                "candidates": [
+                    {
+                        "donor_id": 42,
+                        "user_id": 51,
+                        "first_name": "Olena",
+                        "last_name": "Kovalenko",
+                        "email": "olena@example.com",
+                        "phone_number": "+380671234567",
+                        "blood_type": "A+",
+                        "region": "Lviv",
+                        "last_donation_date": "2024-11-20",
+                        "total_donations": 6,
+                        "exact_match": True
+                    }
+                ]
+            }
+        }
+    }
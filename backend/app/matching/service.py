@@ -0,0 +1,231 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import session_scope
+from app.common.enums import BloodType, DonationStatus, RequestStatus
+from app.users.models import User
+from app.donor.models import Donor
+from app.hospital.models import Hospital
+from app.blood_request.models import BloodRequest
+from app.donation.models import Donation
+
+
+# One bit per blood type, so a set of types is a single int
+BLOOD_TYPE_BITS: Dict[BloodType, int] = {blood_type: 1 << i for i, blood_type in enumerate(BloodType)}
+
+
+def _antigens(blood_type: BloodType) -> frozenset:
+    """Red cell antigens of a type: A and/or B from ABO, D when Rh positive"""
+    abo, rh = blood_type.value[:-1], blood_type.value[-1]
+    antigens = set(abo) - {"O"}
+    if rh == "+":
+        antigens.add("D")
+    return frozenset(antigens)
+
+
+def to_mask(blood_types: Iterable[BloodType]) -> int:
+    mask = 0
+    for blood_type in blood_types:
+        mask |= BLOOD_TYPE_BITS[blood_type]
+    return mask
+
+
+def from_mask(mask: int) -> List[BloodType]:
+    return [blood_type for blood_type, bit in BLOOD_TYPE_BITS.items() if mask & bit]
+
+
+# Red cells can be given when the donor carries no antigen the recipient lacks
+DONOR_MASKS: Dict[BloodType, int] = {
+    recipient: to_mask(
+        donor for donor in BloodType if _antigens(donor) <= _antigens(recipient)
+    )
+    for recipient in BloodType
+}
+
+RECIPIENT_MASKS: Dict[BloodType, int] = {
+    donor: to_mask(recipient for recipient in BloodType if DONOR_MASKS[recipient] & BLOOD_TYPE_BITS[donor])
+    for donor in BloodType
+}
+
+
+def is_compatible(donor: BloodType, recipient: BloodType) -> bool:
+    return bool(DONOR_MASKS[recipient] & BLOOD_TYPE_BITS[donor])
+
+
+def compatible_donor_types(recipient: BloodType) -> List[BloodType]:
+    """
+    Donor types whose red cells a recipient can receive, best first
+
+    Types that can give to fewer recipients come first, so the exact type
+    is preferred and universal O- donors are kept for patients who need them.
+    """
+    return sorted(
+        from_mask(DONOR_MASKS[recipient]),
+        key=lambda donor: bin(RECIPIENT_MASKS[donor]).count("1")
+    )
+
+
+async def find_open_requests(
+    region: Optional[str] = None,
+    blood_type: Optional[BloodType] = None,
+    limit: int = 50,
+    session: Optional[AsyncSession] = None
+) -> List[Dict[str, Any]]:
+    """Open requests that still need blood, most urgent and soonest needed first"""
+    remaining_ml = BloodRequest.amount_needed_ml - BloodRequest.collected_ml
+
+    async with session_scope(session) as session:
+        query = (
+            select(
+                BloodRequest.id.label("request_id"),
+                BloodRequest.hospital_id,
+                Hospital.name.label("hospital_name"),
+                Hospital.region,
+                BloodRequest.blood_type,
+                BloodRequest.urgency_level,
+                BloodRequest.needed_by_date,
+                remaining_ml.label("remaining_ml")
+            )
+            .join(Hospital, Hospital.id == BloodRequest.hospital_id)
+            .where(
+                BloodRequest.status.in_([RequestStatus.PENDING, RequestStatus.APPROVED]),
+                remaining_ml > 0
+            )
+            .order_by(
+                BloodRequest.urgency_level.desc(),
+                BloodRequest.needed_by_date.asc().nulls_last(),
+                BloodRequest.id
+            )
+            .limit(limit)
+        )
+        if region is not None:
+            query = query.where(Hospital.region == region)
+        if blood_type is not None:
+            query = query.where(BloodRequest.blood_type == blood_type)
+
+        result = await session.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+
+async def find_candidate_donors(
+    donor_types: List[BloodType],
+    regions: Optional[List[str]] = None,
+    session: Optional[AsyncSession] = None
+) -> List[Dict[str, Any]]:
+    """
+    Donors of the given types who can donate today, one row per region
+
+    A donor's regions are those of the hospitals where they completed a
+    donation. First-time donors have none yet; they are returned once with
+    region None and count as candidates for any region. With regions=None
+    every region is included.
+    """
+    donor_regions = (
+        select(Donation.donor_id, Hospital.region)
+        .join(Hospital, Hospital.id == Donation.hospital_id)
+        .where(Donation.status == DonationStatus.COMPLETED)
+        .distinct()
+        .subquery()
+    )
+
+    async with session_scope(session) as session:
+        query = (
+            select(
+                Donor.id.label("donor_id"),
+                Donor.user_id,
+                User.first_name,
+                User.last_name,
+                User.email,
+                User.phone_number,
+                Donor.blood_type,
+                donor_regions.c.region,
+                Donor.last_donation_date,
+                Donor.total_donations
+            )
+            .join(User, User.id == Donor.user_id)
+            .outerjoin(donor_regions, donor_regions.c.donor_id == Donor.id)
+            .where(
+                Donor.blood_type.in_(donor_types),
+                Donor.is_eligible == True,
+                Donor.next_eligible_date <= func.current_date(),
+                Donor.date_of_birth > text("CURRENT_DATE - INTERVAL '66 years'")
+            )
+            .order_by(Donor.last_donation_date.asc().nulls_first(), Donor.id)
+        )
+        if regions is not None:
+            # Filtered after the join, so donors who only gave elsewhere do not look region-less
+            query = query.where(or_(donor_regions.c.region.in_(regions), donor_regions.c.region.is_(None)))
+        result = await session.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+
+async def match_open_requests(
+    region: Optional[str] = None,
+    blood_type: Optional[BloodType] = None,
+    per_request: int = 10,
+    limit: int = 50,
+    session: Optional[AsyncSession] = None
+) -> List[Dict[str, Any]]:
+    """
+    Rank compatible donor candidates for each open blood request
+
+    Candidates are blocked in one query on the donor types compatible with
+    any of the requests and on the requests' regions, then grouped into
+    (blood type, region) buckets. Each request only reads the buckets of
+    its compatible types in its own region, so the work grows with the
+    candidate set rather than with donors x requests. First-time donors,
+    who have no region yet, go into the buckets of every requested region.
+    Requests at hospitals without a region are matched against compatible
+    donors from any region.
+
+    Args:
+        region: Only match requests from hospitals in this region
+        blood_type: Only match requests for this blood type
+        per_request: Maximum number of candidates per request
+        limit: Maximum number of requests, most urgent and soonest needed first
+
+    Returns:
+        Requests in rank order, each with its candidates. Within a request,
+        donors of the exact type come first, then the other compatible types
+        from least to most universal; each type is ordered by the longest
+        time since the last donation.
+    """
+    async with session_scope(session) as session:
+        requests = await find_open_requests(region, blood_type, limit, session=session)
+        if not requests:
+            return []
+
+        type_mask = 0
+        for request in requests:
+            type_mask |= DONOR_MASKS[request["blood_type"]]
+        request_regions = {request["region"] for request in requests}
+        regions = None if None in request_regions else sorted(request_regions)
+
+        donors = await find_candidate_donors(from_mask(type_mask), regions, session=session)
+
+    by_region: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+    by_type: Dict[BloodType, Dict[int, Dict[str, Any]]] = defaultdict(dict)
+    for donor in donors:
+        donor_regions = request_regions - {None} if donor["region"] is None else [donor["region"]]
+        for donor_region in donor_regions:
+            by_region[(donor["blood_type"], donor_region)].append(donor)
+        by_type[donor["blood_type"]].setdefault(donor["donor_id"], donor)
+
+    matches = []
+    for request in requests:
+        candidates = []
+        for donor_type in compatible_donor_types(request["blood_type"]):
+            if len(candidates) >= per_request:
+                break
+            if request["region"] is None:
+                bucket = by_type[donor_type].values()
+            else:
+                bucket = by_region[(donor_type, request["region"])]
+            for donor in bucket:
+                candidates.append({**donor, "exact_match": donor_type == request["blood_type"]})
+                if len(candidates) >= per_request:
+                    break
+        matches.append({**request, "candidates": candidates})
+
+    return matches
@@ -0,0 +1,46 @@
+"""Add collected_ml to blood_requests
+
+Revision ID: b7e2c4d91a3f
+Revises: 85ad94556f79
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4d91a3f'
+down_revision: Union[str, None] = '85ad94556f79'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blood_requests', sa.Column(
+        'collected_ml',
+        sa.Integer(),
+        server_default=sa.text('0'),
+        nullable=False,
+        comment='Blood collected from completed donations in milliliters, kept in step by DonationDAO'
+    ))
+    # Backfill from the donations recorded so far
+    op.execute("""
+        UPDATE blood_requests br
+        SET collected_ml = d.collected_ml
+        FROM (
+            SELECT blood_request_id, SUM(blood_amount_ml) AS collected_ml
+            FROM donations
+            WHERE status = 'COMPLETED' AND blood_request_id IS NOT NULL
+            GROUP BY blood_request_id
+        ) d
+        WHERE d.blood_request_id = br.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('blood_requests', 'collected_ml')
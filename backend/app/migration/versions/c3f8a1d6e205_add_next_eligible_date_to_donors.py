@@ -0,0 +1,53 @@
+"""Add generated next_eligible_date to donors
+
+Revision ID: c3f8a1d6e205
+Revises: b7e2c4d91a3f
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d6e205'
+down_revision: Union[str, None] = 'b7e2c4d91a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('donors', sa.Column(
+        'next_eligible_date',
+        sa.Date(),
+        sa.Computed(
+            "GREATEST("
+            "(date_of_birth + interval '18 years')::date, "
+            "last_donation_date + 56, "
+            "ineligible_until + 1"
+            ")",
+            persisted=True
+        ),
+        nullable=True,
+        comment='Computed by the database from date of birth, last donation and deferral'
+    ))
+    op.create_index(
+        'ix_donors_blood_type_next_eligible_date',
+        'donors',
+        ['blood_type', 'next_eligible_date'],
+        unique=False,
+        postgresql_where=sa.text('is_eligible')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_donors_blood_type_next_eligible_date',
+        table_name='donors',
+        postgresql_where=sa.text('is_eligible')
+    )
+    op.drop_column('donors', 'next_eligible_date')
@@ -0,0 +1,67 @@
+"""Add access path indexes used by the DAO queries
+
+Revision ID: d91e6b2f4c07
+Revises: c3f8a1d6e205
+Create Date: 2026-10-18 12:00:00.000000
+
+The indexes are built with CREATE INDEX CONCURRENTLY so that writes to
+donations and blood requests are not blocked while they build. That
+cannot run inside a transaction, hence the autocommit block. If a build
+fails, PostgreSQL leaves an INVALID index behind; the IF NOT EXISTS /
+IF EXISTS guards let the revision be rerun after dropping it.
+See app/dao/index_inventory.py for the queries each index serves.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91e6b2f4c07'
+down_revision: Union[str, None] = 'c3f8a1d6e205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+OPEN_REQUEST = "status IN ('PENDING', 'APPROVED')"
+COMPLETED_DONATION = "status = 'COMPLETED'"
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_donations_donor_id', 'donations', ['donor_id'], None),
+    ('ix_donations_hospital_id', 'donations', ['hospital_id'], None),
+    ('ix_donations_blood_request_id_status', 'donations', ['blood_request_id', 'status'], None),
+    ('ix_donations_completed_donor_id_donation_date', 'donations', ['donor_id', 'donation_date'], COMPLETED_DONATION),
+    ('ix_blood_requests_hospital_id_status', 'blood_requests', ['hospital_id', 'status'], None),
+    ('ix_blood_requests_blood_type_status_needed_by_date', 'blood_requests', ['blood_type', 'status', 'needed_by_date'], None),
+    ('ix_blood_requests_open_urgency_needed_by_date', 'blood_requests', [sa.text('urgency_level DESC'), 'needed_by_date'], OPEN_REQUEST),
+    ('ix_hospital_staff_hospital_id', 'hospital_staff', ['hospital_id'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
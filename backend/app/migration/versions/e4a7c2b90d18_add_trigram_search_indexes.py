@@ -0,0 +1,63 @@
+"""Add trigram search indexes on users and hospitals
+
+Revision ID: e4a7c2b90d18
+Revises: d91e6b2f4c07
+Create Date: 2026-10-18 13:00:00.000000
+
+GIN gin_trgm_ops indexes let ILIKE '%term%' and word_similarity searches
+use an index instead of scanning the table. They are built CONCURRENTLY,
+see d91e6b2f4c07 for why that needs the autocommit block.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2b90d18'
+down_revision: Union[str, None] = 'd91e6b2f4c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column) pairs searched by UsersDAO, HospitalDAO, SearchDAO and TablesDAO
+SEARCH_COLUMNS = [
+    ('users', 'first_name'),
+    ('users', 'last_name'),
+    ('users', 'email'),
+    ('users', 'phone_number'),
+    ('hospitals', 'name'),
+    ('hospitals', 'city'),
+    ('hospitals', 'region'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for table, column in SEARCH_COLUMNS:
+            op.create_index(
+                f'ix_{table}_{column}_trgm',
+                table,
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, column in reversed(SEARCH_COLUMNS):
+            op.drop_index(
+                f'ix_{table}_{column}_trgm',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
+    # pg_trgm is left installed; other objects in the database may use it
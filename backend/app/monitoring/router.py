@@ -0,0 +1,91 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends
+
+from app.monitoring.pool import checkout_wait_histogram, get_pool_metrics
+from app.users.dependencies import get_current_admin_user
+from app.users.cache import principal_cache
+from app.common.cache import dao_cache_stats
+from app.users.security import hashing_pool
+from app.blood_request.dao import BloodRequestDAO
+from app.pages.common import home_stats_cache
+
+
+router = APIRouter(
+    prefix='/monitoring',
+    tags=['Monitoring'],
+    dependencies=[Depends(get_current_admin_user)]
+)
+
+
+@router.get("/pool",
+           response_model=Dict[str, Any],
+           summary="Get database connection pool metrics")
+async def get_pool_status():
+    """
+    Report the current state of the database connection pool.
+
+    Returns:
+        Pool size, checked-out and idle connections, overflow in use and a
+        cumulative histogram of how long requests waited for a connection
+    """
+    return get_pool_metrics()
+
+
+@router.post("/pool/reset",
+            response_model=Dict[str, Any],
+            summary="Reset the checkout wait histogram")
+async def reset_pool_histogram():
+    """
+    Clear the checkout wait histogram, e.g. before a load test.
+
+    Returns:
+        Pool metrics right after the reset
+    """
+    checkout_wait_histogram.reset()
+    return get_pool_metrics()
+
+
+@router.get("/caches",
+           response_model=List[Dict[str, Any]],
+           summary="Get in-process cache statistics")
+async def get_cache_stats():
+    """
+    Report size and hit/miss counters of the in-process caches.
+
+    Returns:
+        One entry per cache
+    """
+    return [
+        principal_cache.stats(),
+        BloodRequestDAO._summary_cache.stats(),
+        home_stats_cache.stats(),
+    ]
+
+
+@router.get("/password-hashing",
+           response_model=Dict[str, Any],
+           summary="Get password hashing pool metrics")
+async def get_password_hashing_status():
+    """
+    Report the load on the bcrypt hashing pool.
+
+    Returns:
+        Concurrency cap, hashes running, callers waiting for a slot (and the
+        peak of that queue) and hashes completed
+    """
+    return hashing_pool.stats()
+
+
+@router.get("/dao-cache",
+           response_model=Dict[str, Any],
+           summary="Get cached DAO method statistics")
+async def get_dao_cache_stats():
+    """
+    Report the DAO method cache backend and per-method counters.
+
+    Returns:
+        Backend name and size, plus TTL, hits, misses and backend errors
+        for every cached DAO method
+    """
+    return dao_cache_stats()
@@ -1,3 +1,4 @@
+import asyncio
 import math
 from typing import Optional
 from fastapi import APIRouter, Query, Request, Depends, HTTPException, status
@@ -7,8 +8,9 @@ from app.users.dependencies import get_current_admin_user
 from app.users.models import User
 from app.users.dao import UsersDAO
 from app.hospital.dao import HospitalDAO
-from app.blood_request.dao import BloodRequestDAO
-from app.donor.dao import DonorDAO
+from app.dao.stats import StatsDAO
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
 
 router = APIRouter(prefix="/pages/admin", tags=["Admin Pages"])
 
@@ -17,24 +19,21 @@ router = APIRouter(prefix="/pages/admin", tags=["Admin Pages"])
 async def admin_dashboard(request: Request, current_user: User = Depends(get_current_admin_user)):
     """
     Render the admin dashboard main page.
-    """
-    user_count = await UsersDAO.count()
-    hospital_count = await HospitalDAO.count() if hasattr(HospitalDAO, "count") else 0
-    blood_request_count = await BloodRequestDAO.count() if hasattr(BloodRequestDAO, "count") else 0
-    donor_count = await DonorDAO.count() if hasattr(DonorDAO, "count") else 0
     
-    # Get recent users for dashboard display
-    recent_users = await UsersDAO.find_recent(limit=5)
+    The counts and the recent users list are independent, so they are
+    fetched concurrently, each in its own session.
+    """
+    counts, recent_users = await asyncio.gather(
+        StatsDAO.get_admin_counts(),
+        UsersDAO.find_recent(limit=5)
+    )
     
     return templates.TemplateResponse(
         "admin/dashboard.html", 
         {
             "request": request, 
             "user": current_user,
-            "user_count": user_count,
-            "hospital_count": hospital_count,
-            "blood_request_count": blood_request_count,
-            "donor_count": donor_count,
+            **counts,
             "recent_users": recent_users
         }
     )
@@ -45,28 +44,40 @@ async def admin_users_list(
     request: Request, 
     current_user: User = Depends(get_current_admin_user),
     page: int = 1,
-    search: str = ""
+    search: str = "",
+    after: Optional[str] = None,
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Render the user management page.
+    
+    "Next" links carry a cursor so deep pages are sought by id instead of
+    OFFSET; the unfiltered total comes from planner statistics.
     """
-    # Get paginated list of users
-    # Assuming you have these methods in your DAO
     users_per_page = 10
     
-    if search:
-        users, total = await UsersDAO.search_paginated(
-            search_term=search,
-            page=page,
-            limit=users_per_page
-        )
-    else:
-        users, total = await UsersDAO.find_paginated(
-            page=page, 
-            limit=users_per_page
-        )
+    try:
+        if search:
+            users, total, next_cursor = await UsersDAO.search_paginated(
+                search_term=search,
+                page=page,
+                limit=users_per_page,
+                after=after,
+                session=session
+            )
+        else:
+            users, total, next_cursor = await UsersDAO.find_paginated(
+                page=page, 
+                limit=users_per_page,
+                after=after,
+                count="approximate",
+                session=session
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    total_pages = (total + users_per_page - 1) // users_per_page
+    total = total or 0
+    total_pages = max((total + users_per_page - 1) // users_per_page, page + (1 if next_cursor else 0))
     
     return templates.TemplateResponse(
         "admin/users/list.html", 
@@ -77,7 +88,8 @@ async def admin_users_list(
             "page": page,
             "total_pages": total_pages,
             "total_users": total,
-            "search": search
+            "search": search,
+            "next_cursor": next_cursor
         }
     )
 
@@ -86,12 +98,13 @@ async def admin_users_list(
 async def admin_edit_user(
     request: Request, 
     user_id: int,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: User = Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Render the edit user page.
     """
-    user_to_edit = await UsersDAO.find_one_or_none(id=user_id)
+    user_to_edit = await UsersDAO.find_one_or_none(id=user_id, session=session)
     
     if not user_to_edit:
         raise HTTPException(
@@ -114,17 +127,31 @@ async def admin_hospitals_list(
     request: Request, 
     page: int = Query(1, ge=1),
     search: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_admin_user)
+    after: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Render the hospitals management page.
     """
-    # Get hospitals with pagination
+    # Get hospitals with pagination; "next" links seek past a (name, id) cursor
     page_size = 10
-    hospitals, total = await HospitalDAO.find_paginated(page=page, limit=page_size, search=search)
+    try:
+        hospitals, total, next_cursor = await HospitalDAO.find_paginated(
+            page=page,
+            limit=page_size,
+            search=search,
+            after=after,
+            count="exact" if search else "approximate",
+            session=session
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     # Calculate pagination data
+    total = total or 0
     total_pages = math.ceil(total / page_size) if total > 0 else 1
+    total_pages = max(total_pages, page + (1 if next_cursor else 0))
     
     return templates.TemplateResponse(
         "admin/hospitals/list.html",
@@ -135,7 +162,8 @@ async def admin_hospitals_list(
             "total": total,
             "page": page,
             "total_pages": total_pages,
-            "search": search or ""
+            "search": search or "",
+            "next_cursor": next_cursor
         }
     )
 
@@ -165,7 +193,8 @@ async def hospital_create_page(
 async def hospital_edit_page(
     request: Request,
     hospital_id: int,
-    current_user: User = Depends(get_current_admin_user)
+    current_user: User = Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Render hospital edit page
@@ -173,12 +202,12 @@ async def hospital_edit_page(
     Requires admin privileges
     """
     # Get hospital data
-    hospital = await HospitalDAO.find_one_or_none_by_id(hospital_id)
+    hospital = await HospitalDAO.find_one_or_none_by_id(hospital_id, session=session)
     if not hospital:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
     
     # Get hospital stats
-    stats = await HospitalDAO.get_hospital_stats(hospital_id)
+    stats = await HospitalDAO.get_hospital_stats(hospital_id, session=session)
     
     return templates.TemplateResponse(
         "admin/hospitals/edit.html",
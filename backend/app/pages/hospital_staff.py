@@ -2,91 +2,45 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, Query, Request, HTTPException, status
 from fastapi.responses import HTMLResponse
 from app.config import templates
-from app.users.dependencies import get_current_hospital_staff
+from app.users.dependencies import StaffContext, get_current_hospital_staff, get_current_staff_context
 from app.users.models import User
-from app.hospital_staff.dao import HospitalStaffDAO
 from app.hospital.dao import HospitalDAO
 from app.blood_request.dao import BloodRequestDAO
 from sqlalchemy import desc
 from app.common.enums import RequestStatus, BloodType
-from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
 
 router = APIRouter(prefix="/pages/hospital_staff", tags=["Hospital Staff Pages"])
 
 @router.get("/dashboard", name="hospital_staff_dashboard")
 async def hospital_staff_dashboard(
     request: Request, 
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """Render the hospital staff dashboard page"""
     
     # Get staff profile with hospital information
-    staff_profile = await HospitalStaffDAO.find_one_or_none(
-        user_id=current_user.id,
-    )
+    staff_profile = staff_context.staff
     
     if not staff_profile:
         raise HTTPException(status_code=404, detail="Hospital staff profile not found")
     
     # Get hospital details
-    hospital = await HospitalDAO.find_one_or_none(id=staff_profile.hospital_id)
+    hospital = staff_context.hospital
     
     # Get recent blood requests for this hospital (limit to 5)
     recent_requests = await BloodRequestDAO.find_all(
         hospital_id=staff_profile.hospital_id,
         order_by=[desc(BloodRequestDAO.model.request_date)],
-        limit=5
-    )
-    
-    # Get blood request stats for this hospital
-    pending_count = await BloodRequestDAO.count(
-        hospital_id=staff_profile.hospital_id,
-        status=RequestStatus.PENDING
-    )
-    
-    approved_count = await BloodRequestDAO.count(
-        hospital_id=staff_profile.hospital_id,
-        status=RequestStatus.APPROVED
-    )
-    
-    fulfilled_count = await BloodRequestDAO.count(
-        hospital_id=staff_profile.hospital_id,
-        status=RequestStatus.FULFILLED
-    )
-    
-    critical_count = await BloodRequestDAO.count_by_min_urgency(
-        hospital_id=staff_profile.hospital_id,
-        urgency_min=4,
-        status_list=[RequestStatus.PENDING, RequestStatus.APPROVED]
-    )
-    
-    # Calculate stats for last 30 days
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    requests_last_30_days = await BloodRequestDAO.count(
-        hospital_id=staff_profile.hospital_id,
-        request_date_after=thirty_days_ago
-    )
-    
-    fulfilled_last_30_days = await BloodRequestDAO.count(
-        hospital_id=staff_profile.hospital_id,
-        status=RequestStatus.FULFILLED,
-        request_date_after=thirty_days_ago
+        limit=5,
+        session=session
     )
     
-    # Calculate fulfillment rate
-    fulfillment_rate = 0
-    if requests_last_30_days > 0:
-        fulfillment_rate = round((fulfilled_last_30_days / requests_last_30_days) * 100)
-    
-    # Get request counts by blood type
-    blood_type_counts = {}
-    for blood_type in BloodType:
-        count = await BloodRequestDAO.count(
-            hospital_id=staff_profile.hospital_id,
-            blood_type=blood_type,
-            status_list=[RequestStatus.PENDING, RequestStatus.APPROVED]
-        )
-        blood_type_counts[blood_type.value] = count
+    # All dashboard figures come from a single grouped query
+    stats = await BloodRequestDAO.get_dashboard_stats(staff_profile.hospital_id, session=session)
     
     return templates.TemplateResponse(
         "hospital_staff/dashboard.html",
@@ -96,16 +50,7 @@ async def hospital_staff_dashboard(
             "staff": staff_profile,
             "hospital": hospital,
             "recent_requests": recent_requests,
-            "stats": {
-                "pending_count": pending_count,
-                "approved_count": approved_count,
-                "fulfilled_count": fulfilled_count,
-                "critical_count": critical_count,
-                "requests_last_30_days": requests_last_30_days,
-                "fulfilled_last_30_days": fulfilled_last_30_days,
-                "fulfillment_rate": fulfillment_rate,
-                "blood_type_counts": blood_type_counts
-            },
+            "stats": stats,
             "blood_types": [bt.value for bt in BloodType]
         }
     )
@@ -113,15 +58,17 @@ async def hospital_staff_dashboard(
 @router.get("/create-blood-request", name="create_blood_request_page")
 async def create_blood_request_page(
     request: Request,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """Render the create blood request page"""
     
-    staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+    staff_profile = staff_context.staff
     if not staff_profile:
         raise HTTPException(status_code=404, detail="Hospital staff profile not found")
     
-    hospital = await HospitalDAO.find_one_or_none(id=staff_profile.hospital_id)
+    hospital = staff_context.hospital
     
     return templates.TemplateResponse(
         "hospital_staff/create_request.html",
@@ -137,15 +84,17 @@ async def create_blood_request_page(
 @router.get("/blood-requests", name="blood_requests_page")
 async def blood_requests_page(
     request: Request,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """Render the blood requests management page"""
     
-    staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+    staff_profile = staff_context.staff
     if not staff_profile:
         raise HTTPException(status_code=404, detail="Hospital staff profile not found")
     
-    hospital = await HospitalDAO.find_one_or_none(id=staff_profile.hospital_id)
+    hospital = staff_context.hospital
     
     return templates.TemplateResponse(
         "hospital_staff/blood_requests.html",
@@ -163,11 +112,13 @@ async def blood_requests_page(
 async def blood_request_detail_page(
     request: Request,
     request_id: int,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """View details of a specific blood request"""
     # Get hospital staff profile
-    staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+    staff_profile = staff_context.staff
     
     if not staff_profile:
         raise HTTPException(
@@ -175,10 +126,10 @@ async def blood_request_detail_page(
             detail="Hospital staff profile not found"
         )
     
-    # Get hospital details separately to avoid detached instance error
-    hospital = await HospitalDAO.find_one_or_none(id=staff_profile.hospital_id)
+    # Hospital was loaded together with the staff profile
+    hospital = staff_context.hospital
     
-    blood_request = await BloodRequestDAO.find_one_with_all_relations(request_id)
+    blood_request = await BloodRequestDAO.find_one_with_all_relations(request_id, session=session)
     
     if not blood_request or blood_request.hospital_id != staff_profile.hospital_id:
         raise HTTPException(
@@ -203,10 +154,12 @@ async def blood_request_detail_page(
 async def edit_blood_request_page(
     request: Request,
     request_id: int,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """Edit a specific blood request"""
-    staff_profile = await HospitalStaffDAO.find_one_or_none(user_id=current_user.id)
+    staff_profile = staff_context.staff
     
     if not staff_profile:
         raise HTTPException(
@@ -214,9 +167,9 @@ async def edit_blood_request_page(
             detail="Hospital staff profile not found"
         )
     
-    hospital = await HospitalDAO.find_one_or_none(id=staff_profile.hospital_id)
+    hospital = staff_context.hospital
     
-    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id)
+    blood_request = await BloodRequestDAO.find_one_or_none(id=request_id, session=session)
     
     if not blood_request or blood_request.hospital_id != staff_profile.hospital_id:
         raise HTTPException(
@@ -247,16 +200,16 @@ async def edit_blood_request_page(
 @router.get("/custom-queries", name="Custom queries")
 async def custom_queries_page(
     request: Request,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
-    staff_profile = await HospitalStaffDAO.find_one_or_none(
-        user_id=current_user.id,
-    )
+    staff_profile = staff_context.staff
 
     if not staff_profile:
         raise HTTPException(status_code=404, detail="Hospital staff profile not found")
 
-    hospital = await HospitalDAO.find_one_or_none(id=staff_profile.hospital_id)
+    hospital = staff_context.hospital
 
     return templates.TemplateResponse(
         "hospital_staff/custom_queries.html", 
@@ -277,20 +230,20 @@ async def custom_queries_page(
 )
 async def get_advanced_analytics_page(
     request: Request,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Serves the advanced analytics page for hospital staff.
     This page contains complex parameterized queries for blood donation analysis.
     """
-    staff = await HospitalStaffDAO.find_one_or_none(
-        user_id=current_user.id,
-    )
+    staff = staff_context.staff
         
-    hospital = await HospitalDAO.find_one_or_none(id=staff.hospital_id)
+    hospital = staff_context.hospital
     
     # Get all hospitals for dropdowns
-    all_hospitals = await HospitalDAO.get_all_hospitals(200)
+    all_hospitals = await HospitalDAO.get_all_hospitals(200, session=session)
     
     # Get blood types for filtering
     blood_types = [bt.value for bt in BloodType]
@@ -327,26 +280,26 @@ async def hospital_staff_all_tables(request: Request):
 )
 async def get_multiple_comparison_analytics_page(
     request: Request,
-    current_user: User = Depends(get_current_hospital_staff)
+    current_user: User = Depends(get_current_hospital_staff),
+    staff_context: StaffContext = Depends(get_current_staff_context),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Render the multiple comparison analytics dashboard with complex queries
     that compare multiple sets and relationships between entities.
     """
     # Отримуємо профіль персоналу лікарні
-    staff_profile = await HospitalStaffDAO.find_one_or_none(
-        user_id=current_user.id,
-    )
+    staff_profile = staff_context.staff
     
     if not staff_profile:
         raise HTTPException(status_code=404, detail="Hospital staff profile not found")
     
     # Отримуємо інформацію про лікарню
-    hospital = await HospitalDAO.find_one_or_none(id=staff_profile.hospital_id)
+    hospital = staff_context.hospital
     
     # Отримуємо дані для випадаючих списків
-    all_hospitals = await HospitalDAO.get_all_hospitals()
-    regions = await HospitalDAO.get_unique_regions()
+    all_hospitals = await HospitalDAO.get_all_hospitals(session=session)
+    regions = await HospitalDAO.get_unique_regions(session=session)
     blood_types = list(BloodType)
     
     return templates.TemplateResponse(
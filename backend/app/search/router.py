@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List
+from app.users.dependencies import get_current_admin_user
+from app.dao.search import SearchDAO
+from app.search.schemas import SearchHit
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"],
+    dependencies=[Depends(get_current_admin_user)]
+)
+
+
+@router.get("", response_model=List[SearchHit])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Name, e-mail, phone, city, region or id"),
+    limit: int = Query(10, ge=1, le=50),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Search users and hospitals from one box, best match first.
+    
+    A number is looked up as an id and an e-mail address as an exact
+    e-mail; anything else is matched by trigram similarity.
+    """
+    return await SearchDAO.search(q, limit=limit, session=session)
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class SearchHit(BaseModel):
+    """One user or hospital found by the global search"""
+    type: str = Field(..., description='"user" or "hospital"')
+    id: int
+    label: str
+    detail: Optional[str] = None
+    score: float = Field(..., description="Similarity to the search term, from 0 to 1")
@@ -3,6 +3,8 @@ from typing import Dict, Any, Optional
 from app.users.dependencies import get_current_user
 from app.users.models import User
 from app.dao.tables import TablesDAO
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
 
 router = APIRouter(
     prefix="/tables",
@@ -16,11 +18,17 @@ async def get_table_data(
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1),
     limit: int = Query(25, ge=1, le=100),
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    after: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    count: str = Query("exact", pattern="^(exact|approximate|none)$", description="How to compute the total"),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Get paginated data from a specific database table.
     Only hospital staff and admins can access this endpoint.
+    
+    Pass next_cursor from a response as ``after`` to fetch the following
+    page by seeking on the table's sort key instead of OFFSET.
     """
     if not (current_user.is_hospital_staff or current_user.is_admin):
         raise HTTPException(
@@ -39,11 +47,17 @@ async def get_table_data(
             detail=f"Invalid table name. Must be one of: {', '.join(allowed_tables)}"
         )
     
-    data = await TablesDAO.get_table_data(
-        table_name=table_name,
-        page=page,
-        limit=limit,
-        search=search
-    )
+    try:
+        data = await TablesDAO.get_table_data(
+            table_name=table_name,
+            page=page,
+            limit=limit,
+            search=search,
+            after=after,
+            count=count,
+            session=session
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return data
\ No newline at end of file
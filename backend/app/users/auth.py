@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 from pydantic import EmailStr
 from app.config import get_auth_data
 from app.users.dao import UsersDAO
-from app.users.security import verify_password
+from app.users.security import verify_and_update_password_async
 
 
 def create_access_token(data: dict, expires_delta: timedelta = timedelta(days=30)) -> str:
@@ -18,8 +18,9 @@ def create_access_token(data: dict, expires_delta: timedelta = timedelta(days=30
         str: The encoded JWT token.
     """
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=30)
-    to_encode.update({"exp": expire})
+    issued_at = datetime.now(timezone.utc)
+    expire = issued_at + timedelta(days=30)
+    to_encode.update({"exp": expire, "iat": issued_at})
     auth_data = get_auth_data()
     encoded_jwt = jwt.encode(to_encode, auth_data['secret_key'],
                              algorithm=auth_data['algorithm'])
@@ -36,8 +37,17 @@ async def authenticate_user(email: EmailStr, password: str):
 
     Returns:
         The authenticated user object if authentication is successful, otherwise None.
+    
+    Verification runs in the hashing pool. If the stored hash uses outdated
+    settings it is replaced with a fresh one.
     """
     user = await UsersDAO.find_one_or_none(email=email)
-    if not user or verify_password(plain_password=password, hashed_password=user.password) is False:
+    if not user:
         return None
+    
+    verified, new_hash = await verify_and_update_password_async(password, user.password)
+    if not verified:
+        return None
+    if new_hash:
+        user = await UsersDAO.update(user.id, password=new_hash)
     return user
\ No newline at end of file
@@ -0,0 +1,78 @@
+from typing import Dict, Optional, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from app.config import settings
+from app.common.cache import TTLCache
+from app.common.events import ChangeEvent, subscribe
+from app.users.models import User
+
+
+# Authenticated users keyed by (user_id, token iat). Entries are column
+# snapshots, never instances owned by a session, so a rollback elsewhere
+# cannot expire them. The cache and its eviction are per process: another
+# worker keeps serving its own copy until PRINCIPAL_CACHE_TTL runs out.
+principal_cache = TTLCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    name="principals"
+)
+
+
+def _snapshot(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+# Evictions per user, plus one counter for clearing everything. A load
+# reads the generation before querying and only caches its result if no
+# eviction happened in between, so a slow load cannot put back a user that
+# a committed write already evicted.
+_generations: Dict[int, int] = {}
+_clear_generation = 0
+
+
+def principal_generation(user_id: int) -> Tuple[int, int]:
+    """Return the user's eviction generation; read it before loading the user."""
+    return _clear_generation, _generations.get(user_id, 0)
+
+
+def cache_principal(user_id: int, issued_at: Optional[int], user: User, generation: Tuple[int, int]):
+    if generation != principal_generation(user_id):
+        # Evicted while loading; the snapshot may predate the write
+        return
+    principal_cache.set((user_id, issued_at), _snapshot(user))
+
+
+async def get_cached_principal(user_id: int, issued_at: Optional[int], session: AsyncSession) -> Optional[User]:
+    """
+    Return the cached user attached to the session, without a database round trip.
+
+    Returns:
+        User instance, or None on a cache miss
+    """
+    snapshot = principal_cache.get((user_id, issued_at))
+    if snapshot is None:
+        return None
+
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await session.merge(user, load=False)
+
+
+def invalidate_principal(user_id: int):
+    """Forget every cached token of a user, e.g. after a role change."""
+    _generations[user_id] = _generations.get(user_id, 0) + 1
+    principal_cache.invalidate_where(lambda key: key[0] == user_id)
+
+
+def _evict_principal(change: ChangeEvent):
+    global _clear_generation
+    if change.id is None:
+        _clear_generation += 1
+        _generations.clear()
+        principal_cache.clear()
+    else:
+        invalidate_principal(change.id)
+
+
+subscribe([User.__tablename__], _evict_principal)
@@ -1,17 +1,21 @@
 from app.dao.base import BaseDAO
+from app.dao.pagination import COUNT_EXACT, COUNT_APPROXIMATE, approximate_count, keyset_filter, split_page, validate_count_mode
 from app.users.models import User
-from app.database import async_session_maker
+from app.database import session_scope
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, select
 from app.donor.dao import DonorDAO
 from app.hospital_staff.dao import HospitalStaffDAO
+from app.common.events import ChangeEvent, publish
+from app.dao.search import USER_SEARCH_COLUMNS, search_page
 
 class UsersDAO(BaseDAO):
     model = User
 
 
     @classmethod
-    async def set_single_role(cls, user_id: int, role_name: str) -> Optional[User]:
+    async def set_single_role(cls, user_id: int, role_name: str, session: Optional[AsyncSession] = None) -> Optional[User]:
         """
         Set a single role for a user, making it the only active role.
         The 'user' role remains always active.
@@ -27,91 +31,123 @@ class UsersDAO(BaseDAO):
         if role_name not in valid_roles:
             raise ValueError(f"Invalid role: {role_name}. Must be one of {valid_roles}")
 
-        async with async_session_maker() as session:
-            async with session.begin():
-                # Find the user
-                user = await session.execute(select(cls.model).filter_by(id=user_id))
-                user = user.scalar_one_or_none()
-                
-                if not user:
-                    return None
-                
-                user.is_admin = False
-                user.is_super_admin = False
-                user.is_donor = False
-                user.is_hospital_staff = False
-                
-                if role_name == "admin":
-                    user.is_admin = True
-                elif role_name == "super_admin":
-                    user.is_super_admin = True
-                elif role_name == "donor":
-                    user.is_donor = True
-                elif role_name == "hospital_staff":
-                    user.is_hospital_staff = True
-
-                session.add(user)
-                
+        async with session_scope(session) as session:
+            # Find the user
+            user = await session.execute(select(cls.model).filter_by(id=user_id))
+            user = user.scalar_one_or_none()
+            
+            if not user:
+                return None
+            
+            user.is_admin = False
+            user.is_super_admin = False
+            user.is_donor = False
+            user.is_hospital_staff = False
+            
+            if role_name == "admin":
+                user.is_admin = True
+            elif role_name == "super_admin":
+                user.is_super_admin = True
+            elif role_name == "donor":
+                user.is_donor = True
+            elif role_name == "hospital_staff":
+                user.is_hospital_staff = True
+
+            session.add(user)
+            await session.flush()
             await session.refresh(user)
+            publish(session, ChangeEvent.for_instance(user))
                 
             return user
         
 
 
     @classmethod
-    async def find_paginated(cls, page: int = 1, limit: int = 10):
-        """Find users with pagination"""
-        offset = (page - 1) * limit
-        
-        async with async_session_maker() as session:
-            # Get total count
-            total_count_query = select(func.count(User.id))
-            total_count = await session.scalar(total_count_query)
-            
-            # Get users for the page
-            query = select(User).order_by(User.id).offset(offset).limit(limit)
+    async def find_paginated(
+        cls,
+        page: int = 1,
+        limit: int = 10,
+        after: Optional[str] = None,
+        count: str = COUNT_EXACT,
+        session: Optional[AsyncSession] = None
+    ):
+        """
+        Find users with pagination.
+
+        Pages are sought by id: pass the returned cursor as ``after`` to get
+        the next page without OFFSET. ``page`` is only used when no cursor is
+        given. ``count`` is "exact", "approximate" (planner estimate) or
+        "none" (total is None).
+
+        Returns:
+            Tuple of (users, total count, cursor for the next page or None)
+        """
+        validate_count_mode(count)
+
+        async with session_scope(session) as session:
+            if count == COUNT_EXACT:
+                total_count = await session.scalar(select(func.count(User.id)))
+            elif count == COUNT_APPROXIMATE:
+                total_count = await approximate_count(session, User.__tablename__)
+            else:
+                total_count = None
+
+            query = cls._page_query(select(User), page, limit, after)
             result = await session.execute(query)
-            users = result.scalars().all()
-            
-            return users, total_count
+            users, next_cursor = split_page(result.scalars().all(), limit, lambda user: (user.id,))
+
+            return users, total_count, next_cursor
 
     @classmethod
-    async def search_paginated(cls, search_term: str, page: int = 1, limit: int = 10):
-        """Search users with pagination"""
-        offset = (page - 1) * limit
-        search_pattern = f"%{search_term}%"
-        
-        async with async_session_maker() as session:
-            # Get total count of matching users
-            total_count_query = select(func.count(User.id)).where(
-                or_(
-                    User.first_name.ilike(search_pattern),
-                    User.last_name.ilike(search_pattern),
-                    User.email.ilike(search_pattern),
-                    User.phone_number.ilike(search_pattern)
-                )
+    async def search_paginated(
+        cls,
+        search_term: str,
+        page: int = 1,
+        limit: int = 10,
+        after: Optional[str] = None,
+        count: str = COUNT_EXACT,
+        session: Optional[AsyncSession] = None
+    ):
+        """
+        Search users with pagination, best match first.
+
+        An e-mail address is looked up as an exact e-mail. Other terms match
+        names, e-mail and phone by substring through the trigram indexes and
+        are ranked by similarity, with the user a numeric term names by id
+        first; the cursor seeks on (similarity, id). There are no statistics for a search, so
+        an "approximate" count returns None, as does any count of a one or
+        two character term, which only matches prefixes.
+
+        Returns:
+            Tuple of (users, total count, cursor for the next page or None)
+        """
+        validate_count_mode(count)
+
+        async with session_scope(session) as session:
+            return await search_page(
+                session,
+                User,
+                USER_SEARCH_COLUMNS,
+                search_term,
+                page=page,
+                limit=limit,
+                after=after,
+                count=count,
+                email_column=User.email
             )
-            total_count = await session.scalar(total_count_query)
-            
-            # Get matching users for the page
-            query = select(User).where(
-                or_(
-                    User.first_name.ilike(search_pattern),
-                    User.last_name.ilike(search_pattern),
-                    User.email.ilike(search_pattern),
-                    User.phone_number.ilike(search_pattern)
-                )
-            ).order_by(User.id).offset(offset).limit(limit)
-            
-            result = await session.execute(query)
-            users = result.scalars().all()
-            
-            return users, total_count
 
     @classmethod
-    async def find_recent(cls, limit: int = 5):
+    def _page_query(cls, query, page: int, limit: int, after: Optional[str]):
+        """Order by id and seek past the cursor, falling back to OFFSET for page numbers"""
+        query = query.order_by(User.id).limit(limit + 1)
+        if after:
+            return query.where(keyset_filter([User.id], after))
+        return query.offset((page - 1) * limit)
+
+    @classmethod
+    async def find_recent(cls, limit: int = 5, session: Optional[AsyncSession] = None):
         """Find most recently registered users"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(User).order_by(User.created_at.desc()).limit(limit)
             result = await session.execute(query)
             users = result.scalars().all()
@@ -119,9 +155,9 @@ class UsersDAO(BaseDAO):
             return users
 
     @classmethod
-    async def count(cls):
+    async def count(cls, session: Optional[AsyncSession] = None):
         """Get total count of users"""
-        async with async_session_maker() as session:
+        async with session_scope(session) as session:
             query = select(func.count(User.id))
             result = await session.scalar(query)
             
@@ -129,7 +165,7 @@ class UsersDAO(BaseDAO):
 
 
     @classmethod
-    async def update(cls, id: int, **kwargs):
+    async def update(cls, id: int, session: Optional[AsyncSession] = None, **kwargs):
         """
         Update a user by ID with the provided keyword arguments.
         
@@ -140,22 +176,4 @@ class UsersDAO(BaseDAO):
         Returns:
             The updated user object
         """
-        async with async_session_maker() as session:
-            async with session.begin():
-
-                query = select(cls.model).filter_by(id=id)
-                result = await session.execute(query)
-                user = result.scalar_one_or_none()
-                
-                if not user:
-                    return None
-                
-
-                for key, value in kwargs.items():
-                    setattr(user, key, value)
-                
-                session.add(user)
-                
-
-            await session.refresh(user)
-            return user
\ No newline at end of file
+        return await cls.update_returning(id, session=session, **kwargs)
\ No newline at end of file
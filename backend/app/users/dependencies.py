@@ -1,11 +1,29 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, Tuple
 from fastapi import Request, HTTPException, status, Depends
 from jose import jwt, JWTError
 from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_auth_data
+from app.database import get_session
 from app.users.exceptions import TokenExpiredException, NoJwtException, NoUserIdException, ForbiddenException
 from app.users.dao import UsersDAO
+from app.users.cache import cache_principal, get_cached_principal, principal_generation
 from app.users.models import User
+from app.hospital_staff.dao import HospitalStaffDAO
+from app.hospital_staff.models import HospitalStaff
+from app.hospital.models import Hospital
+
+
+async def _load_principal(user_id: int, issued_at: Optional[int], session: AsyncSession) -> Optional[User]:
+    """Resolve the token's user from the principal cache, falling back to the database"""
+    user = await get_cached_principal(user_id, issued_at, session)
+    if user is None:
+        generation = principal_generation(user_id)
+        user = await UsersDAO.find_one_or_none_by_id(user_id, session=session)
+        if user:
+            cache_principal(user_id, issued_at, user, generation)
+    return user
 
 
 def get_token(request: Request):
@@ -15,7 +33,8 @@ def get_token(request: Request):
     return token
 
 
-async def get_current_user(token: str = Depends(get_token)):
+def _decode_token(token: str) -> Tuple[int, Optional[int]]:
+    """Validate the access token and return its user id and issue time"""
     try:
         auth_data = get_auth_data()
         payload = jwt.decode(token, auth_data['secret_key'], algorithms=[auth_data['algorithm']])
@@ -31,13 +50,62 @@ async def get_current_user(token: str = Depends(get_token)):
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Не знайдено ID користувача')
 
-    user = await UsersDAO.find_one_or_none_by_id(int(user_id))
+    return int(user_id), payload.get('iat')
+
+
+async def get_current_user(token: str = Depends(get_token), session: AsyncSession = Depends(get_session)):
+    user_id, issued_at = _decode_token(token)
+
+    user = await _load_principal(user_id, issued_at, session)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Користувач не знайдент')
 
     return user
 
 
+@dataclass
+class StaffContext:
+    """Authenticated hospital staff user with their staff profile and hospital"""
+    user: User
+    staff: Optional[HospitalStaff]
+    hospital: Optional[Hospital]
+
+
+async def get_current_staff_context(
+    token: str = Depends(get_token),
+    session: AsyncSession = Depends(get_session)
+) -> StaffContext:
+    """
+    Resolve the hospital staff user, staff profile and hospital in one query.
+
+    Only for endpoints that read the profile or hospital; the ones that
+    just need the user depend on get_current_hospital_staff, which is free
+    on a principal cache hit. The staff profile and hospital are None if
+    the user has no profile.
+    """
+    user_id, issued_at = _decode_token(token)
+
+    user = await get_cached_principal(user_id, issued_at, session)
+    if user is not None:
+        staff = await HospitalStaffDAO.find_one_or_none_with_hospital(user_id=user_id, session=session)
+        hospital = staff.hospital if staff else None
+    else:
+        generation = principal_generation(user_id)
+        row = await HospitalStaffDAO.find_user_with_profile(user_id, session=session)
+        if not row:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Користувач не знайдент')
+        user, staff, hospital = row
+        cache_principal(user_id, issued_at, user, generation)
+
+    if not user.is_hospital_staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail='Недостатньо прав користувача! Доступ дозволено лише медичному персоналу.'
+        )
+
+    return StaffContext(user=user, staff=staff, hospital=hospital)
+
+
 async def get_current_admin_user(current_user: User = Depends(get_current_user)):
     if current_user.is_admin:
         return current_user
@@ -64,7 +132,10 @@ def get_admin_or_hospital_staff(current_user: User = Depends(get_current_user)):
     )
 
 
-async def get_current_user_optional(request: Request) -> Optional[User]:
+async def get_current_user_optional(
+    request: Request,
+    session: AsyncSession = Depends(get_session)
+) -> Optional[User]:
     """
     Get the current user if authenticated, or None if not authenticated.
     Unlike get_current_user, this doesn't raise an exception for anonymous users.
@@ -87,7 +158,7 @@ async def get_current_user_optional(request: Request) -> Optional[User]:
         if not user_id:
             return None
             
-        user = await UsersDAO.find_one_or_none_by_id(int(user_id))
+        user = await _load_principal(int(user_id), payload.get('iat'), session)
         return user
     except JWTError:
         return None
\ No newline at end of file
@@ -1,10 +1,14 @@
-from sqlalchemy import text
+from sqlalchemy import Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base, str_uniq, int_pk, created_at, updated_at
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = tuple(
+        Index(f"ix_users_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+        for column in ("first_name", "last_name", "email", "phone_number")
+    )
     id: Mapped[int_pk]
     phone_number: Mapped[str_uniq]
     first_name: Mapped[str]
@@ -1,24 +1,29 @@
-from fastapi import APIRouter, Body, HTTPException, Response, status, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Body, HTTPException, Query, Response, status, Depends
 
 from app.users.dependencies import get_current_user, get_current_admin_user
-from app.users.schemas import PasswordChange, RoleResponse, RoleUpdate, UserRegister, UserAuth
+from app.users.schemas import PasswordChange, RoleResponse, RoleUpdate, UserRegister, UserAuth, UserResponse
 from app.users.dao import UsersDAO
-from app.users.security import get_password_hash
+from app.users.security import get_password_hash_async, verify_password_async
 from app.users.auth import authenticate_user, create_access_token
 from app.users.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_session
+from app.dao.pagination import NEXT_CURSOR_HEADER
+from app.common.streaming import ndjson_response
 
 router = APIRouter(prefix='/auth', tags=['Auth'])
 
 
 @router.post("/register")
-async def register_user(user_data: UserRegister) -> dict:
-    user = await UsersDAO.find_one_or_none(email=user_data.email)
+async def register_user(user_data: UserRegister, session: AsyncSession = Depends(get_session)) -> dict:
+    user = await UsersDAO.find_one_or_none(email=user_data.email, session=session)
     if user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                             detail='User already exists')
     user_dict = user_data.model_dump()
-    user_dict['password'] = get_password_hash(user_data.password)
-    await UsersDAO.add(**user_dict)
+    user_dict['password'] = await get_password_hash_async(user_data.password)
+    await UsersDAO.add(**user_dict, session=session)
     return {'message': f'You are successfully registered!'}
 
 
@@ -47,9 +52,39 @@ async def logout_user(response: Response):
     return {'message': 'User successfully logged out!'}
 
 
-@router.get("/all_users")
-async def get_all_users(user_data: User = Depends(get_current_admin_user)):
-    return await UsersDAO.find_all()
+@router.get("/all_users", response_model=List[UserResponse])
+async def get_all_users(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    user_data: User = Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    List users ordered by id, one page at a time.
+    
+    The cursor for the next page is returned in the X-Next-Cursor header;
+    it is absent on the last page. Use /auth/all_users/stream to export all users.
+    """
+    try:
+        users, next_cursor = await UsersDAO.find_page(limit=limit, after=after, session=session)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return users
+
+
+@router.get("/all_users/stream", summary="Stream all users as NDJSON")
+async def stream_all_users(user_data: User = Depends(get_current_admin_user)):
+    """
+    Stream every user as newline-delimited JSON (one UserResponse per line).
+    
+    Rows are read through a server-side cursor, so memory use stays flat
+    regardless of the number of users.
+    """
+    return ndjson_response(UsersDAO.stream(), UserResponse)
 
 
 @router.put("/users/{user_id}/role", 
@@ -58,7 +93,7 @@ async def get_all_users(user_data: User = Depends(get_current_admin_user)):
            summary="Set a single role for a user",
            description="Sets a single exclusive role for a user, removing all other roles except the basic user role.",
            dependencies=[Depends(get_current_admin_user)])
-async def set_user_role(user_id: int, role_data: RoleUpdate):
+async def set_user_role(user_id: int, role_data: RoleUpdate, session: AsyncSession = Depends(get_session)):
     """
     Set a single exclusive role for a user.
     
@@ -73,7 +108,7 @@ async def set_user_role(user_id: int, role_data: RoleUpdate):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                            detail="Cannot set USER as a single role - it's always enabled")
     
-    updated_user = await UsersDAO.set_single_role(user_id, role_data.role)
+    updated_user = await UsersDAO.set_single_role(user_id, role_data.role, session=session)
     
     if not updated_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, 
@@ -84,7 +119,7 @@ async def set_user_role(user_id: int, role_data: RoleUpdate):
 
 
 from fastapi import Path
-from app.users.schemas import UserUpdate, UserResponse
+from app.users.schemas import UserUpdate
 
 @router.put("/users/{user_id}", 
            response_model=UserResponse,
@@ -93,7 +128,8 @@ from app.users.schemas import UserUpdate, UserResponse
            dependencies=[Depends(get_current_admin_user)])
 async def update_user(
     user_id: int = Path(..., title="The ID of the user to update"),
-    user_data: UserUpdate = Body(..., title="Updated user information")
+    user_data: UserUpdate = Body(..., title="Updated user information"),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Update a user's details.
@@ -105,7 +141,7 @@ async def update_user(
     Returns:
         The updated user
     """
-    user = await UsersDAO.find_one_or_none(id=user_id)
+    user = await UsersDAO.find_one_or_none(id=user_id, session=session)
     
     if not user:
         raise HTTPException(
@@ -115,7 +151,7 @@ async def update_user(
     
     # Check if email is already taken by another user
     if user_data.email != user.email:
-        existing_user = await UsersDAO.find_one_or_none(email=user_data.email)
+        existing_user = await UsersDAO.find_one_or_none(email=user_data.email, session=session)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -124,7 +160,7 @@ async def update_user(
     
     # Check if phone number is already taken by another user
     if user_data.phone_number != user.phone_number:
-        existing_user = await UsersDAO.find_one_or_none(phone_number=user_data.phone_number)
+        existing_user = await UsersDAO.find_one_or_none(phone_number=user_data.phone_number, session=session)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -132,7 +168,7 @@ async def update_user(
             )
     
     # Update user
-    updated_user = await UsersDAO.update(user_id, **user_data.model_dump())
+    updated_user = await UsersDAO.update(user_id, **user_data.model_dump(), session=session)
     
     return updated_user
 
@@ -141,7 +177,7 @@ async def update_user(
               status_code=status.HTTP_204_NO_CONTENT,
               summary="Delete a user",
               dependencies=[Depends(get_current_admin_user)])
-async def delete_user(user_id: int = Path(..., title="The ID of the user to delete")):
+async def delete_user(user_id: int = Path(..., title="The ID of the user to delete"), session: AsyncSession = Depends(get_session)):
     """
     Delete a user.
     
@@ -151,7 +187,7 @@ async def delete_user(user_id: int = Path(..., title="The ID of the user to dele
     Returns:
         204 No Content response
     """
-    user = await UsersDAO.find_one_or_none(id=user_id)
+    user = await UsersDAO.find_one_or_none(id=user_id, session=session)
     
     if not user:
         raise HTTPException(
@@ -167,7 +203,7 @@ async def delete_user(user_id: int = Path(..., title="The ID of the user to dele
         )
     
     # Delete user
-    await UsersDAO.delete(user_id)
+    await UsersDAO.delete(user_id, session=session)
     
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -178,7 +214,8 @@ async def delete_user(user_id: int = Path(..., title="The ID of the user to dele
           summary="Update current user's profile")
 async def update_profile(
     user_data: UserUpdate = Body(..., title="Updated user information"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Update the current user's profile details.
@@ -193,7 +230,7 @@ async def update_profile(
     
     # Check if email is already taken by another user
     if user_data.email != current_user.email:
-        existing_user = await UsersDAO.find_one_or_none(email=user_data.email)
+        existing_user = await UsersDAO.find_one_or_none(email=user_data.email, session=session)
         if existing_user and existing_user.id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -202,7 +239,7 @@ async def update_profile(
     
     # Check if phone number is already taken by another user
     if user_data.phone_number != current_user.phone_number:
-        existing_user = await UsersDAO.find_one_or_none(phone_number=user_data.phone_number)
+        existing_user = await UsersDAO.find_one_or_none(phone_number=user_data.phone_number, session=session)
         if existing_user and existing_user.id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -210,7 +247,7 @@ async def update_profile(
             )
     
     # Update user
-    updated_user = await UsersDAO.update(user_id, **user_data.model_dump())
+    updated_user = await UsersDAO.update(user_id, **user_data.model_dump(), session=session)
     
     return updated_user
 
@@ -220,7 +257,8 @@ async def update_profile(
           summary="Change current user's password")
 async def change_password(
     password_data: PasswordChange = Body(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Change the current user's password.
@@ -232,10 +270,9 @@ async def change_password(
         Success message
     """
     # Verify current password
-    user = await UsersDAO.find_one_or_none(id=current_user.id)
+    user = await UsersDAO.find_one_or_none(id=current_user.id, session=session)
     
-    from app.users.security import verify_password
-    if not verify_password(password_data.current_password, user.password):
+    if not await verify_password_async(password_data.current_password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect current password"
@@ -249,8 +286,7 @@ async def change_password(
         )
     
     # Update password
-    from app.users.security import get_password_hash
-    hashed_password = get_password_hash(password_data.new_password)
-    await UsersDAO.update(current_user.id, password=hashed_password)
+    hashed_password = await get_password_hash_async(password_data.new_password)
+    await UsersDAO.update(current_user.id, password=hashed_password, session=session)
     
     return {"message": "Password changed successfully"}
\ No newline at end of file
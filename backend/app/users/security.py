@@ -1,9 +1,67 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
 from passlib.context import CryptContext
+from app.config import settings
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class HashingPool:
+    """
+    Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so running it in threads keeps
+    the event loop responsive. At most ``concurrency`` hashes run at once;
+    further callers wait on a semaphore and are counted in ``waiting``.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.waiting = 0
+        self.max_waiting = 0
+        self.running = 0
+        self.completed = 0
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="password-hash")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run(self, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A semaphore is bound to the loop it is first used in
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+        }
+
+
+hashing_pool = HashingPool(settings.PASSWORD_HASH_CONCURRENCY)
+
+
 def get_password_hash(password: str) -> str:
     """
     Hashes a plain text password using bcrypt.
@@ -28,4 +86,24 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if the password matches, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the hashing pool instead of on the event loop."""
+    return await hashing_pool.run(pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool instead of on the event loop."""
+    return await hashing_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its hash is outdated, in the hashing pool.
+
+    Returns:
+        Tuple of (whether the password matches, new hash to store or None)
+    """
+    return await hashing_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
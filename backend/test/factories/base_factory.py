@@ -1,6 +1,7 @@
+from collections import defaultdict
 from faker import Faker
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union
-from sqlalchemy import select
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar, Union
+from sqlalchemy import and_, insert, or_, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 T = TypeVar('T')
@@ -13,28 +14,41 @@ class BaseFactory:
     @classmethod
     async def create(cls, session: AsyncSession, **kwargs) -> T:
         """Create and persist a model instance"""
-        obj = cls.build(**kwargs)
-        session.add(obj)
-        await session.flush()
-        await session.refresh(obj)
-        return obj
+        return (await cls.create_many(session, [kwargs]))[0]
+
+    @classmethod
+    async def create_many(cls, session: AsyncSession, rows: Sequence[Dict[str, Any]]) -> List[T]:
+        """Create one instance per dict of overrides with a single INSERT ... RETURNING"""
+        batch = FactoryBatch(session)
+        pending = [batch.add(cls, **row) for row in rows]
+        await batch.flush()
+        return [item.instance for item in pending]
         
     @classmethod
     def build(cls, **kwargs) -> T:
         """Build but don't persist a model instance"""
+        return cls.model(**cls.values(**kwargs))
+
+    @classmethod
+    def values(cls, **kwargs) -> Dict[str, Any]:
+        """Column values of a new instance: defaults with kwargs applied"""
         if cls.model is None:
             raise NotImplementedError("Subclasses must define 'model'")
-        return cls.model(**{**cls._get_defaults(), **kwargs})
+        return {**cls._get_defaults(), **kwargs}
     
     @classmethod
     def _get_defaults(cls) -> Dict[str, Any]:
         """Get default values for model fields"""
         return {}
+
+    @classmethod
+    async def after_insert(cls, session: AsyncSession, instances: List[T]):
+        """Hook run after each INSERT, for state the DAOs would normally keep in step"""
         
     @classmethod
     async def create_batch(cls, session: AsyncSession, size: int, **kwargs) -> List[T]:
         """Create multiple instances with same base attributes"""
-        return [await cls.create(session, **kwargs) for _ in range(size)]
+        return await cls.create_many(session, [kwargs] * size)
 
     @classmethod
     def build_batch(cls, size: int, **kwargs) -> List[T]:
@@ -44,18 +58,110 @@ class BaseFactory:
     @classmethod
     async def ensure_exists(cls, session, **kwargs):
         """Get entity if exists, or create if not"""
+        return (await cls.ensure_exists_many(session, [kwargs]))[0]
+
+    @classmethod
+    async def ensure_exists_many(cls, session: AsyncSession, rows: Sequence[Dict[str, Any]]) -> List[T]:
+        """
+        Get or create one entity per dict of attributes.
+
+        Existing entities are looked up with one SELECT for all rows and the
+        missing ones are created with one INSERT. Attributes the model does
+        not have are ignored for matching but still passed to create.
+        """
         model_class = cls.model
-        
-        # Build query dynamically based on kwargs
-        query = select(model_class)
-        for key, value in kwargs.items():
-            if hasattr(model_class, key):
-                query = query.where(getattr(model_class, key) == value)
-        
-        result = await session.execute(query)
-        entity = result.scalars().first()
-        
-        if entity is None:
-            entity = await cls.create(session, **kwargs)
-            
-        return entity
\ No newline at end of file
+        keys = [
+            tuple(sorted((key, value) for key, value in row.items() if hasattr(model_class, key)))
+            for row in rows
+        ]
+
+        found = {}
+        conditions = [
+            and_(true(), *(getattr(model_class, name) == value for name, value in key))
+            for key in set(keys)
+        ]
+        if conditions:
+            result = await session.execute(select(model_class).where(or_(*conditions)))
+            for entity in result.scalars():
+                for key in keys:
+                    if key not in found and all(getattr(entity, name) == value for name, value in key):
+                        found[key] = entity
+
+        missing = {}
+        for key, row in zip(keys, rows):
+            if key not in found and key not in missing:
+                missing[key] = row
+        if missing:
+            found.update(zip(missing, await cls.create_many(session, list(missing.values()))))
+
+        return [found[key] for key in keys]
+
+
+class Pending:
+    """A row queued in a FactoryBatch; instance is set once the batch is flushed"""
+
+    def __init__(self, factory: Type[BaseFactory], values: Dict[str, Any]):
+        self.factory = factory
+        self.values = values
+        self.instance = None
+
+    @property
+    def depth(self) -> int:
+        """How many rows deep the chain of rows this one refers to is"""
+        return max((value.depth + 1 for value in self.values.values() if isinstance(value, Pending)), default=0)
+
+    @property
+    def id(self) -> int:
+        if self.instance is None:
+            raise RuntimeError(f"{self.factory.__name__} row is not flushed yet")
+        return self.instance.id
+
+
+class FactoryBatch:
+    """
+    Creates rows of several factories with one multi-row INSERT ... RETURNING per model.
+
+    Values may refer to other queued rows, e.g. user_id=<Pending user>.
+    flush() inserts rows in dependency order, users and hospitals before
+    donors and staff, those before requests and donations, replacing each
+    reference with the id the database returned for it:
+
+        batch = FactoryBatch(session)
+        user = batch.add(UserFactory, is_donor=True)
+        donor = batch.add(DonorFactory, user_id=user)
+        await batch.flush()
+        donor.instance.user_id == user.instance.id
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.pending: List[Pending] = []
+
+    def add(self, factory: Type[BaseFactory], **kwargs) -> Pending:
+        item = Pending(factory, factory.values(**kwargs))
+        self.pending.append(item)
+        return item
+
+    def insert_order(self) -> List[List[Pending]]:
+        """Queued rows grouped per INSERT: by depth, then by model in order of appearance"""
+        groups: Dict[tuple, List[Pending]] = defaultdict(list)
+        for item in self.pending:
+            groups[(item.depth, item.factory.model)].append(item)
+        return [groups[key] for key in sorted(groups, key=lambda key: key[0])]
+
+    async def flush(self):
+        for group in self.insert_order():
+            model = group[0].factory.model
+            rows = [
+                {key: value.id if isinstance(value, Pending) else value for key, value in item.values.items()}
+                for item in group
+            ]
+            result = await self.session.scalars(
+                insert(model).returning(model, sort_by_parameter_order=True),
+                rows
+            )
+            instances = result.all()
+            for item, instance in zip(group, instances):
+                item.instance = instance
+            await group[0].factory.after_insert(self.session, instances)
+        self.pending = []
@@ -1,9 +1,14 @@
 import random
 from datetime import datetime, timedelta
 from sqlalchemy import func, select
+from sqlalchemy.orm.util import identity_key
 from app.donation.models import Donation
 from app.common.enums import DonationStatus, BloodType
 from app.hospital.models import Hospital
+from app.blood_request.models import BloodRequest
+from app.blood_request.dao import BloodRequestDAO
+from app.donor.dao import DonorDAO
+from app.donor.models import Donor
 from .base_factory import BaseFactory, fake
 from .donor_factory import DonorFactory
 from .hospital_factory import HospitalFactory
@@ -26,6 +31,31 @@ class DonationFactory(BaseFactory):
             "notes": fake.paragraph() if random.random() > 0.5 else None
         }
     
+    @classmethod
+    async def after_insert(cls, session, instances):
+        """
+        Recompute the donors' counters and collected_ml of the requests the
+        new donations count towards.
+
+        Factories insert donations directly rather than through DonationDAO,
+        which would otherwise keep them in step.
+        """
+        donor_ids = sorted({d.donor_id for d in instances})
+        await DonorDAO.recalculate_donation_counters(donor_ids, session=session)
+        request_ids = sorted({d.blood_request_id for d in instances if d.blood_request_id is not None})
+        if request_ids:
+            await BloodRequestDAO.recalculate_collected_ml(request_ids, session=session)
+
+        # The UPDATEs bypass the identity map, so reload rows already loaded in this session
+        for model, ids, columns in [
+            (Donor, donor_ids, ["total_donations", "first_donation_date", "last_donation_date", "next_eligible_date"]),
+            (BloodRequest, request_ids, ["collected_ml"]),
+        ]:
+            for id in ids:
+                instance = session.identity_map.get(identity_key(model, id))
+                if instance is not None:
+                    await session.refresh(instance, columns)
+    
     @classmethod
     async def create_with_relations(cls, session, **kwargs):
         """Create donation with all required relations"""
@@ -3,6 +3,11 @@ from sqlalchemy import select
 from app.users.models import User
 from .base_factory import BaseFactory, fake
 
+# Hashed once: bcrypt is deliberately slow and would dominate batch creation
+PASSWORD = "Password123!"
+PASSWORD_HASH = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+
 class UserFactory(BaseFactory):
     model = User
     
@@ -13,12 +18,6 @@ class UserFactory(BaseFactory):
         last_name = fake.last_name()
         
 
-        password = "Password123!"
-        hashed_password = bcrypt.hashpw(
-            password.encode('utf-8'), 
-            bcrypt.gensalt()
-        ).decode('utf-8')
-
         @classmethod
         async def ensure_exists(cls, session, **kwargs):
             """Get entity if exists, or create if not"""
@@ -43,7 +42,7 @@ class UserFactory(BaseFactory):
             "last_name": last_name,
             "email": f"{first_name.lower()}.{last_name.lower()}@{fake.domain_name()}",
             "phone_number": f"+380{fake.numerify('#########')}",
-            "password": hashed_password,
+            "password": PASSWORD_HASH,
             "is_user": True,
             "is_admin": False,
             "is_super_admin": False,
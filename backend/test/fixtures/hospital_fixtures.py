@@ -3,6 +3,7 @@ import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.hospital.models import Hospital
 from app.hospital_staff.models import HospitalStaff
+from test.factories.base_factory import FactoryBatch
 from test.factories.hospital_factory import HospitalFactory
 from test.factories.hospital_staff_factory import HospitalStaffFactory
 from test.factories.user_factory import UserFactory
@@ -15,13 +16,8 @@ async def hospital(db_session: AsyncSession):
 @pytest_asyncio.fixture
 async def hospital_staff_user(db_session: AsyncSession, hospital):
     """Create a user with hospital staff role for testing"""
-    user = await UserFactory.create(
-        db_session, 
-        is_hospital_staff=True
-    )
-    staff = await HospitalStaffFactory.create(
-        db_session,
-        user_id=user.id,
-        hospital_id=hospital.id
-    )
-    return user
\ No newline at end of file
+    batch = FactoryBatch(db_session)
+    user = batch.add(UserFactory, is_hospital_staff=True)
+    batch.add(HospitalStaffFactory, user_id=user, hospital_id=hospital.id)
+    await batch.flush()
+    return user.instance
\ No newline at end of file
@@ -2,6 +2,7 @@ import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
+from test.factories.base_factory import FactoryBatch
 from test.factories.user_factory import UserFactory
 from test.factories.donor_factory import DonorFactory
 from test.factories.hospital_factory import HospitalFactory
@@ -21,49 +22,39 @@ async def blood_donation_scenario(db_session: AsyncSession):
     - Donation linked to the request
     """
 
-    hospital = await HospitalFactory.create(db_session)
-    
+    batch = FactoryBatch(db_session)
+    hospital = batch.add(HospitalFactory)
+    staff_user = batch.add(UserFactory, is_hospital_staff=True)
+    staff = batch.add(HospitalStaffFactory, user_id=staff_user, hospital_id=hospital)
 
-    staff_user = await UserFactory.create(db_session, is_hospital_staff=True)
-    staff = await HospitalStaffFactory.create(
-        db_session,
-        user_id=staff_user.id,
-        hospital_id=hospital.id
-    )
-
-    donor_user = await UserFactory.create(db_session, is_donor=True)
-    donor = await DonorFactory.create(
-        db_session,
-        user_id=donor_user.id,
-        blood_type=BloodType.A_POSITIVE
-    )
-    
+    donor_user = batch.add(UserFactory, is_donor=True)
+    donor = batch.add(DonorFactory, user_id=donor_user, blood_type=BloodType.A_POSITIVE)
 
-    blood_request = await BloodRequestFactory.create(
-        db_session,
-        hospital_id=hospital.id,
-        staff_id=staff.id,
+    blood_request = batch.add(
+        BloodRequestFactory,
+        hospital_id=hospital,
+        staff_id=staff,
         blood_type=BloodType.A_POSITIVE,
         status=RequestStatus.APPROVED
     )
-    
-
-    donation = await DonationFactory.create(
-        db_session,
-        donor_id=donor.id,
-        hospital_id=hospital.id,
-        blood_request_id=blood_request.id,
+    donation = batch.add(
+        DonationFactory,
+        donor_id=donor,
+        hospital_id=hospital,
+        blood_request_id=blood_request,
         blood_type=BloodType.A_POSITIVE,
         status=DonationStatus.COMPLETED
     )
-    
+
+    # One INSERT per model: users and the hospital, then staff and donor, then the request, then the donation
+    await batch.flush()
 
     return {
-        "hospital": hospital,
-        "staff_user": staff_user,
-        "staff": staff,
-        "donor_user": donor_user,
-        "donor": donor,
-        "blood_request": blood_request,
-        "donation": donation
+        "hospital": hospital.instance,
+        "staff_user": staff_user.instance,
+        "staff": staff.instance,
+        "donor_user": donor_user.instance,
+        "donor": donor.instance,
+        "blood_request": blood_request.instance,
+        "donation": donation.instance
     }
\ No newline at end of file
@@ -3,6 +3,7 @@ import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.users.models import User
 from app.donor.models import Donor
+from test.factories.base_factory import FactoryBatch
 from test.factories.user_factory import UserFactory
 from test.factories.donor_factory import DonorFactory
 
@@ -22,12 +23,8 @@ async def admin_user(db_session: AsyncSession):
 @pytest_asyncio.fixture
 async def donor_user(db_session: AsyncSession):
     """Create a user with donor role for testing"""
-    user = await UserFactory.create(
-        db_session, 
-        is_donor=True
-    )
-    donor = await DonorFactory.create(
-        db_session,
-        user_id=user.id
-    )
-    return user
\ No newline at end of file
+    batch = FactoryBatch(db_session)
+    user = batch.add(UserFactory, is_donor=True)
+    batch.add(DonorFactory, user_id=user)
+    await batch.flush()
+    return user.instance
\ No newline at end of file
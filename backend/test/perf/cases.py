@@ -0,0 +1,108 @@
+import functools
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.common.enums import BloodType
+from app.blood_request.dao import BloodRequestDAO
+from app.donation.dao import DonationDAO
+from app.donor.dao import DonorDAO
+from app.hospital.dao import HospitalDAO
+from app.hospital_staff.dao import HospitalStaffDAO
+from app.matching import service as matching
+
+PlanCall = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Any]]
+
+
+def uncached(method):
+    """
+    The method without its @cached_method wrapper.
+
+    A cache hit would skip the query, and a miss runs it in a private
+    session the harness cannot see, so cached methods are called directly.
+    """
+    wrapped = getattr(method, "__wrapped__", None)
+    if wrapped is None:
+        return method
+    return functools.partial(wrapped, method.__self__)
+
+
+async def sample_parameters(conn: AsyncConnection) -> Dict[str, Any]:
+    """Arguments that match real rows of the loaded dataset: the busiest hospital, region and blood type"""
+    hospital_id = await conn.scalar(text("""
+        SELECT hospital_id FROM blood_requests
+        GROUP BY hospital_id ORDER BY COUNT(*) DESC, hospital_id LIMIT 1
+    """))
+    region = await conn.scalar(text("""
+        SELECT region FROM hospitals
+        GROUP BY region ORDER BY COUNT(*) DESC, region LIMIT 1
+    """))
+    blood_type = await conn.scalar(text("""
+        SELECT blood_type::text FROM blood_requests
+        GROUP BY blood_type ORDER BY COUNT(*) DESC, blood_type LIMIT 1
+    """))
+    return {
+        "hospital_id": hospital_id,
+        "region": region,
+        "blood_type": BloodType[blood_type].value,
+    }
+
+
+# Analytics methods under plan regression checks, keyed like INDEX_INVENTORY
+PLAN_CASES: Dict[str, PlanCall] = {
+    "HospitalStaffDAO.find_staff_by_performance": lambda session, p: uncached(HospitalStaffDAO.find_staff_by_performance)(
+        min_requests=1, min_fulfillment_rate=0.0, session=session
+    ),
+    "HospitalStaffDAO.find_staff_with_matching_request_patterns": lambda session, p: uncached(HospitalStaffDAO.find_staff_with_matching_request_patterns)(
+        min_blood_types=1, min_similarity_percent=50.0, session=session
+    ),
+    "HospitalStaffDAO.find_doctors_with_donor_supersets": lambda session, p: uncached(HospitalStaffDAO.find_doctors_with_donor_supersets)(
+        min_donor_count=1, session=session
+    ),
+    "HospitalStaffDAO.find_seasonal_blood_request_patterns": lambda session, p: uncached(HospitalStaffDAO.find_seasonal_blood_request_patterns)(
+        min_request_count=1, session=session
+    ),
+    "DonorDAO.find_donors_by_blood_type_min_donations": lambda session, p: uncached(DonorDAO.find_donors_by_blood_type_min_donations)(
+        p["blood_type"], session=session
+    ),
+    "DonorDAO.find_eligible_donors_by_blood_type": lambda session, p: uncached(DonorDAO.find_eligible_donors_by_blood_type)(
+        p["blood_type"], session=session
+    ),
+    "DonorDAO.find_multi_hospital_donors": lambda session, p: uncached(DonorDAO.find_multi_hospital_donors)(
+        min_hospitals=1, min_donations=1, session=session
+    ),
+    "DonorDAO.find_universal_donors_by_region": lambda session, p: uncached(DonorDAO.find_universal_donors_by_region)(
+        p["region"], session=session
+    ),
+    "DonorDAO.find_donors_matching_multiple_requests": lambda session, p: uncached(DonorDAO.find_donors_matching_multiple_requests)(
+        min_match_count=1, session=session
+    ),
+    "HospitalDAO.find_hospitals_with_identical_needs": lambda session, p: uncached(HospitalDAO.find_hospitals_with_identical_needs)(
+        p["hospital_id"], session=session
+    ),
+    "HospitalDAO.find_hospitals_with_similar_blood_request_patterns": lambda session, p: uncached(HospitalDAO.find_hospitals_with_similar_blood_request_patterns)(
+        min_request_count=1, session=session
+    ),
+    "HospitalDAO.get_hospital_stats": lambda session, p: uncached(HospitalDAO.get_hospital_stats)(
+        p["hospital_id"], session=session
+    ),
+    "BloodRequestDAO.find_hospitals_with_shortages": lambda session, p: uncached(BloodRequestDAO.find_hospitals_with_shortages)(
+        p["blood_type"], session=session
+    ),
+    "BloodRequestDAO.find_high_volume_requests": lambda session, p: uncached(BloodRequestDAO.find_high_volume_requests)(
+        min_volume_ml=0, min_urgency=1, session=session
+    ),
+    "BloodRequestDAO.get_dashboard_stats": lambda session, p: uncached(BloodRequestDAO.get_dashboard_stats)(
+        p["hospital_id"], session=session
+    ),
+    "DonationDAO.find_donation_statistics_by_region": lambda session, p: uncached(DonationDAO.find_donation_statistics_by_region)(
+        min_donations=1, min_total_ml=0, session=session
+    ),
+    "DonationDAO.analyze_donation_demographics": lambda session, p: uncached(DonationDAO.analyze_donation_demographics)(
+        min_donations=1, session=session
+    ),
+    "matching.match_open_requests": lambda session, p: matching.match_open_requests(
+        region=p["region"], session=session
+    ),
+}
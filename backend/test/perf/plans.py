@@ -0,0 +1,250 @@
+import json
+import statistics
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.database import Base
+from test.scripts.generate_bulk_data import generate_bulk_data
+from test.perf.cases import PLAN_CASES, sample_parameters
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+EXPLAIN = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(baseline: Dict[str, Any], path: Path = BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+
+async def load_dataset(engine: AsyncEngine, scale: int, seed: int):
+    """
+    Recreate the schema and fill it with the synthetic dataset.
+
+    Everything in the target database is dropped first, so point the
+    harness at a database of its own. The dataset is seeded, so a given
+    scale always produces the same rows and therefore comparable plans.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    await generate_bulk_data(
+        scale=scale,
+        seed=seed,
+        session_maker=async_sessionmaker(engine, expire_on_commit=False)
+    )
+
+
+async def find_large_tables(conn: AsyncConnection, min_rows: int) -> List[str]:
+    """Tables whose planner row estimate is at least min_rows"""
+    result = await conn.execute(
+        text("""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r'
+              AND relnamespace = 'public'::regnamespace
+              AND reltuples >= :min_rows
+            ORDER BY relname
+        """),
+        {"min_rows": min_rows}
+    )
+    return list(result.scalars())
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine):
+    """Collect the SELECT statements and parameters sent to the database"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, tuple(parameters or ())))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def explain(conn: AsyncConnection, statement: str, parameters: tuple) -> Dict[str, Any]:
+    result = await conn.exec_driver_sql(EXPLAIN + statement, parameters)
+    plan = result.scalar()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+
+def summarize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The parts of an EXPLAIN ANALYZE result the harness compares.
+
+    shape lists one line per plan node, indented by depth. Actual rows are
+    per loop in PostgreSQL's output and are multiplied out here so they can
+    be compared with the estimate.
+    """
+    shape = []
+    nodes = []
+    seq_scans = set()
+
+    def walk(node: Dict[str, Any], depth: int):
+        label = node["Node Type"]
+        if "Relation Name" in node:
+            label += f" on {node['Relation Name']}"
+        if "Index Name" in node:
+            label += f" using {node['Index Name']}"
+        shape.append("  " * depth + label)
+
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.add(node["Relation Name"])
+
+        estimated = node["Plan Rows"]
+        actual = node.get("Actual Rows", 0) * node.get("Actual Loops", 1)
+        nodes.append({
+            "node": label,
+            "estimated_rows": estimated,
+            "actual_rows": actual,
+            "misestimate": round(max(estimated, actual) / max(min(estimated, actual), 1), 1),
+        })
+
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    root = plan["Plan"]
+    walk(root, 0)
+    return {
+        "shape": shape,
+        "nodes": nodes,
+        "seq_scans": sorted(seq_scans),
+        "planning_ms": plan.get("Planning Time", 0.0),
+        "execution_ms": plan.get("Execution Time", 0.0),
+        "shared_hit_blocks": root.get("Shared Hit Blocks", 0),
+        "shared_read_blocks": root.get("Shared Read Blocks", 0),
+    }
+
+
+async def profile_case(
+    engine: AsyncEngine,
+    conn: AsyncConnection,
+    call,
+    parameters: Dict[str, Any],
+    runs: int
+) -> Dict[str, Any]:
+    """
+    Run one DAO method, then EXPLAIN ANALYZE each SELECT it issued.
+
+    Every statement is explained ``runs`` times after a warm-up run; the
+    plan of the last run is kept and the timings are medians.
+    """
+    session = AsyncSession(bind=conn, expire_on_commit=False)
+    try:
+        with capture_statements(engine) as statements:
+            await call(session, parameters)
+    finally:
+        await session.close()
+
+    profiled = []
+    for statement, statement_parameters in statements:
+        await explain(conn, statement, statement_parameters)
+        summaries = [
+            summarize_plan(await explain(conn, statement, statement_parameters))
+            for _ in range(runs)
+        ]
+        summary = summaries[-1]
+        summary["planning_ms"] = round(statistics.median(s["planning_ms"] for s in summaries), 3)
+        summary["execution_ms"] = round(statistics.median(s["execution_ms"] for s in summaries), 3)
+        profiled.append(summary)
+
+    return {
+        "statements": profiled,
+        "execution_ms": round(sum(s["execution_ms"] for s in profiled), 3),
+        "seq_scans": sorted({table for s in profiled for table in s["seq_scans"]}),
+    }
+
+
+async def collect_plans(
+    engine: AsyncEngine,
+    settings: Dict[str, Any],
+    load: bool = True,
+    only: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Profile every case in PLAN_CASES against the database behind engine.
+
+    Args:
+        engine: Engine of a database dedicated to the harness
+        settings: The "settings" section of the baseline (scale, seed, runs, ...)
+        load: Recreate and reload the dataset first
+        only: Names of the cases to run, all of them if omitted
+
+    Returns:
+        Dictionary with the large tables and a profile per case
+    """
+    if load:
+        await load_dataset(engine, settings["scale"], settings["seed"])
+
+    report = {"large_tables": [], "queries": {}}
+    async with engine.connect() as conn:
+        report["large_tables"] = await find_large_tables(conn, settings["large_table_rows"])
+        parameters = await sample_parameters(conn)
+        # End the transaction the lookups above began, so each case can start its own
+        await conn.rollback()
+
+        for name, call in PLAN_CASES.items():
+            if only and name not in only:
+                continue
+            # Each case runs in its own transaction, rolled back afterwards
+            transaction = await conn.begin()
+            try:
+                report["queries"][name] = await profile_case(engine, conn, call, parameters, settings["runs"])
+            finally:
+                await transaction.rollback()
+
+    return report
+
+
+def is_recorded(name: str, baseline: Dict[str, Any]) -> bool:
+    """Whether the baseline has a profile for the case, i.e. it was recorded since the case was added"""
+    return name in baseline["queries"]
+
+
+def compare_with_baseline(
+    name: str,
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    large_tables: List[str]
+) -> List[str]:
+    """
+    Regressions of one case against the baseline, as readable messages.
+
+    A Seq Scan on a large table fails unless the baseline already has it
+    for this case. Execution time fails when it exceeds the baseline by
+    more than timing_tolerance (a fraction) plus timing_slack_ms, so that
+    fast queries do not fail on noise. A case missing from the baseline
+    has nothing to compare with; check is_recorded first.
+    """
+    settings = baseline["settings"]
+    recorded = baseline["queries"][name]
+    problems = []
+
+    accepted = set(recorded["seq_scans"])
+    for table in current["seq_scans"]:
+        if table in large_tables and table not in accepted:
+            problems.append(f"{name}: new Seq Scan on large table {table}")
+
+    limit = recorded["execution_ms"] * (1 + settings["timing_tolerance"]) + settings["timing_slack_ms"]
+    if current["execution_ms"] > limit:
+        problems.append(
+            f"{name}: execution took {current['execution_ms']:.1f} ms, "
+            f"baseline {recorded['execution_ms']:.1f} ms (limit {limit:.1f} ms)"
+        )
+
+    return problems
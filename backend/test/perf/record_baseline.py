@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+import os
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from test.perf.plans import collect_plans, load_baseline, save_baseline
+
+
+async def record_baseline(database_url: str, load: bool = True):
+    """Profile every analytics query and store the results as the new baseline"""
+    baseline = load_baseline()
+    engine = create_async_engine(database_url, echo=False)
+    try:
+        print(f"Profiling analytics queries at scale {baseline['settings']['scale']}...")
+        report = await collect_plans(engine, baseline["settings"], load=load)
+    finally:
+        await engine.dispose()
+
+    baseline["queries"] = report["queries"]
+    save_baseline(baseline)
+
+    print(f"Large tables: {', '.join(report['large_tables']) or 'none'}")
+    for name, profile in sorted(report["queries"].items()):
+        seq_scans = f" (Seq Scan on {', '.join(profile['seq_scans'])})" if profile["seq_scans"] else ""
+        print(f"✓ {name}: {profile['execution_ms']:.1f} ms{seq_scans}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record the query plan baseline in test/perf/baseline.json")
+    parser.add_argument("--database-url", default=os.environ.get("PERF_DATABASE_URL"),
+                        help="Database dedicated to the harness; it is dropped and reloaded")
+    parser.add_argument("--skip-load", action="store_true", help="Reuse the dataset already in the database")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or PERF_DATABASE_URL is required")
+
+    asyncio.run(record_baseline(args.database_url, load=not args.skip_load))
@@ -0,0 +1,66 @@
+from test.perf.plans import compare_with_baseline, is_recorded, summarize_plan
+
+PLAN = {
+    "Plan": {
+        "Node Type": "Hash Join",
+        "Plan Rows": 10,
+        "Actual Rows": 400,
+        "Actual Loops": 1,
+        "Shared Hit Blocks": 12,
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "donations", "Plan Rows": 6000, "Actual Rows": 6000, "Actual Loops": 1},
+            {"Node Type": "Index Scan", "Relation Name": "donors", "Index Name": "donors_pkey",
+             "Plan Rows": 1, "Actual Rows": 1, "Actual Loops": 400},
+        ],
+    },
+    "Planning Time": 0.2,
+    "Execution Time": 12.5,
+}
+
+SETTINGS = {"timing_tolerance": 0.5, "timing_slack_ms": 5.0}
+
+
+def profile(execution_ms, seq_scans):
+    return {"statements": [], "execution_ms": execution_ms, "seq_scans": seq_scans}
+
+
+def test_summary_records_shape_and_row_estimates():
+    summary = summarize_plan(PLAN)
+
+    assert summary["shape"] == [
+        "Hash Join",
+        "  Seq Scan on donations",
+        "  Index Scan on donors using donors_pkey",
+    ]
+    assert summary["seq_scans"] == ["donations"]
+    assert summary["nodes"][0]["misestimate"] == 40.0
+    assert summary["nodes"][2]["actual_rows"] == 400
+    assert summary["execution_ms"] == 12.5
+
+
+def test_new_seq_scan_on_large_table_fails():
+    baseline = {"settings": SETTINGS, "queries": {"q": profile(10.0, [])}}
+
+    problems = compare_with_baseline("q", profile(10.0, ["donations", "hospitals"]), baseline, ["donations"])
+
+    assert problems == ["q: new Seq Scan on large table donations"]
+
+
+def test_recorded_seq_scan_is_accepted():
+    baseline = {"settings": SETTINGS, "queries": {"q": profile(10.0, ["donations"])}}
+
+    assert compare_with_baseline("q", profile(10.0, ["donations"]), baseline, ["donations"]) == []
+
+
+def test_timing_regression_beyond_tolerance_fails():
+    baseline = {"settings": SETTINGS, "queries": {"q": profile(10.0, [])}}
+
+    assert compare_with_baseline("q", profile(19.0, []), baseline, []) == []
+    assert len(compare_with_baseline("q", profile(21.0, []), baseline, [])) == 1
+
+
+def test_case_missing_from_baseline_is_not_recorded():
+    baseline = {"settings": SETTINGS, "queries": {"q": profile(10.0, [])}}
+
+    assert is_recorded("q", baseline)
+    assert not is_recorded("new_case", baseline)
@@ -0,0 +1,375 @@
+"""
+Seeded bulk data generator for load testing and query plan checks.
+
+Unlike generate_test_data, which creates rows one by one through the
+factories, this builds plain column dicts and streams them in with
+BaseDAO.copy_records (PostgreSQL COPY), so it reaches millions of
+donations in minutes:
+
+    python -m test.scripts.generate_bulk_data --scale 100
+
+One scale unit is 10,000 users, 100 hospitals and roughly 14,000
+donations. The same seed and anchor date always produce the same rows;
+run it on an empty database (see reset_db.py) to get the same IDs too.
+"""
+import argparse
+import asyncio
+import functools
+import random
+from bisect import bisect
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate, islice
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from faker import Faker
+from sqlalchemy import text
+
+from app.database import async_session_maker
+from app.common.enums import BloodType, Department, DonationStatus, HospitalType, RequestStatus, StaffRole
+from app.donor.models import Gender
+from app.users.dao import UsersDAO
+from app.hospital.dao import HospitalDAO
+from app.donor.dao import DonorDAO
+from app.hospital_staff.dao import HospitalStaffDAO
+from app.blood_request.dao import BloodRequestDAO
+from app.donation.dao import DonationDAO
+
+# Rows per scale unit
+USERS_PER_SCALE = 10_000
+HOSPITALS_PER_SCALE = 100
+REQUESTS_PER_SCALE = 15_000
+DONOR_SHARE = 0.6
+STAFF_PER_HOSPITAL = 10
+
+HISTORY_DAYS = 3 * 365
+SCHEDULE_AHEAD_DAYS = 14
+MIN_DONATION_GAP_DAYS = 56
+
+# Approximate ABO/Rh distribution of the Ukrainian population
+BLOOD_TYPE_WEIGHTS = {
+    BloodType.A_POSITIVE: 34,
+    BloodType.O_POSITIVE: 27,
+    BloodType.B_POSITIVE: 17,
+    BloodType.AB_POSITIVE: 7,
+    BloodType.A_NEGATIVE: 6,
+    BloodType.O_NEGATIVE: 5,
+    BloodType.B_NEGATIVE: 3,
+    BloodType.AB_NEGATIVE: 1,
+}
+
+# Relative request volume per month: winter and summer (trauma season) peaks
+MONTH_WEIGHTS = [1.3, 1.2, 1.0, 0.9, 0.9, 1.1, 1.3, 1.4, 1.0, 0.9, 1.0, 1.2]
+
+URGENCY_WEIGHTS = [15, 25, 30, 20, 10]
+
+# bcrypt hash of "Password123!", the password UserFactory gives every user.
+# Hashing per user would dominate the run time and a fresh salt would make
+# the output differ between runs.
+PASSWORD_HASH = "$2b$12$GVE8IG82I61e.hyWxX.WnO7X1PbHbJKGRfEBZYPqA1QO1khesPdwq"
+
+
+def chunked(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+class BulkDataGenerator:
+    """
+    Builds the rows of every table from one seeded random generator.
+
+    The row generators must be consumed in table order (users, hospitals,
+    donors, staff, requests, donations): later tables pick from what the
+    earlier ones produced and all of them draw from the same sequence.
+    """
+
+    def __init__(self, scale: int, seed: int, anchor: date):
+        self.rng = random.Random(seed)
+        self.anchor = anchor
+
+        self.user_count = USERS_PER_SCALE * scale
+        self.hospital_count = HOSPITALS_PER_SCALE * scale
+        self.donor_count = int(self.user_count * DONOR_SHARE)
+        self.staff_count = self.hospital_count * STAFF_PER_HOSPITAL
+        self.request_count = REQUESTS_PER_SCALE * scale
+
+        # Faker is only used for small pools of names and places; drawing from
+        # them with self.rng is much faster than calling Faker per row
+        fake = Faker('uk_UA')
+        fake.seed_instance(seed)
+        self.first_names = [fake.first_name() for _ in range(300)]
+        self.last_names = [fake.last_name() for _ in range(1000)]
+        self.domains = [fake.free_email_domain() for _ in range(20)]
+        self.regions = sorted({fake.region() for _ in range(200)})
+        self.cities = {region: [fake.city() for _ in range(8)] for region in self.regions}
+        self.companies = [fake.company() for _ in range(500)]
+
+        self.blood_types = list(BLOOD_TYPE_WEIGHTS)
+        self.blood_type_weights = list(accumulate(BLOOD_TYPE_WEIGHTS.values()))
+
+        history_start = anchor - timedelta(days=HISTORY_DAYS)
+        self.history_days = [history_start + timedelta(days=n) for n in range(HISTORY_DAYS + 1)]
+        self.seasonal_weights = list(accumulate(MONTH_WEIGHTS[day.month - 1] for day in self.history_days))
+
+        # Filled in as the tables are generated
+        self.hospital_weights: List[float] = []
+        self.hospital_ids: List[int] = []
+        self.staff_by_hospital: Dict[int, List[int]] = defaultdict(list)
+        self.donor_plans: List[Tuple[BloodType, int, List[Tuple[date, DonationStatus]]]] = []
+        self.requests_by_hospital_type: Dict[Tuple[int, BloodType], List[int]] = defaultdict(list)
+        self.request_plans: List[Tuple[int, BloodType]] = []
+
+    def blood_type(self) -> BloodType:
+        return self.rng.choices(self.blood_types, cum_weights=self.blood_type_weights)[0]
+
+    def hospital_index(self) -> int:
+        return bisect(self.hospital_weights, self.rng.random() * self.hospital_weights[-1])
+
+    def at_random_hour(self, day: date) -> datetime:
+        return datetime.combine(day, time(self.rng.randint(8, 17), self.rng.randrange(0, 60, 5)))
+
+    def users(self) -> Iterator[Dict[str, Any]]:
+        """Donors first, then hospital staff, then plain users"""
+        for n in range(self.user_count):
+            first_name = self.rng.choice(self.first_names)
+            last_name = self.rng.choice(self.last_names)
+            yield {
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": f"{first_name.lower()}.{last_name.lower()}.{n}@{self.rng.choice(self.domains)}",
+                "phone_number": f"+380{n + 1:09d}",
+                "password": PASSWORD_HASH,
+                "is_user": True,
+                "is_admin": False,
+                "is_super_admin": False,
+                "is_donor": n < self.donor_count,
+                "is_hospital_staff": self.donor_count <= n < self.donor_count + self.staff_count,
+            }
+
+    def hospitals(self) -> Iterator[Dict[str, Any]]:
+        """Hospital sizes are heavy-tailed: a few regional centres take most requests"""
+        self.hospital_weights = list(accumulate(self.rng.paretovariate(1.5) for _ in range(self.hospital_count)))
+        for n in range(self.hospital_count):
+            region = self.rng.choice(self.regions)
+            kind = "Лікарня" if self.rng.random() > 0.3 else "Клініка"
+            yield {
+                "name": f"{self.rng.choice(self.companies)} {kind} №{n + 1}",
+                "hospital_type": self.rng.choice(list(HospitalType)),
+                "address": f"вул. {self.rng.choice(self.last_names)}, {self.rng.randint(1, 200)}",
+                "city": self.rng.choice(self.cities[region]),
+                "region": region,
+                "country": "Ukraine",
+                "phone_number": f"+38044{n + 1:07d}",
+                "email": f"info{n + 1}@hospital.ua",
+                "website": None,
+            }
+
+    def donation_schedule(self) -> List[Tuple[date, DonationStatus]]:
+        """
+        Dates and statuses of one donor's donations.
+
+        About 40% donate once; the rest come back at least 56 days apart,
+        so a minority of repeat donors gives most of the blood. A donation
+        after the anchor date is the donor's next scheduled visit.
+        """
+        if self.rng.random() < 0.4:
+            count = 1
+        else:
+            count = 2 + int(self.rng.expovariate(1 / 4))
+
+        last_day = self.anchor + timedelta(days=SCHEDULE_AHEAD_DAYS)
+        day = self.anchor - timedelta(days=self.rng.randint(0, HISTORY_DAYS))
+        schedule = []
+        while len(schedule) < count and day <= last_day:
+            if day > self.anchor:
+                schedule.append((day, DonationStatus.SCHEDULED))
+                break
+            roll = self.rng.random()
+            status = (
+                DonationStatus.COMPLETED if roll < 0.9
+                else DonationStatus.CANCELED if roll < 0.96
+                else DonationStatus.REJECTED
+            )
+            schedule.append((day, status))
+            day += timedelta(days=MIN_DONATION_GAP_DAYS + int(self.rng.expovariate(1 / 90)))
+        return schedule
+
+    def donors(self, user_ids: List[int]) -> Iterator[Dict[str, Any]]:
+        for user_id in user_ids[:self.donor_count]:
+            blood_type = self.blood_type()
+            schedule = self.donation_schedule()
+            self.donor_plans.append((blood_type, self.hospital_index(), schedule))
+
+            completed = [day for day, status in schedule if status == DonationStatus.COMPLETED]
+            is_eligible = self.rng.random() < 0.95
+            yield {
+                "user_id": user_id,
+                "gender": self.rng.choice([Gender.MALE, Gender.FEMALE]),
+                "date_of_birth": self.anchor - timedelta(days=self.rng.randint(18 * 365 + 5, 65 * 365)),
+                "blood_type": blood_type,
+                "weight": round(self.rng.uniform(52.0, 110.0), 1),
+                "height": round(self.rng.uniform(155.0, 195.0), 1),
+                "first_donation_date": completed[0] if completed else None,
+                "last_donation_date": completed[-1] if completed else None,
+                "total_donations": len(completed),
+                "is_eligible": is_eligible,
+                "ineligible_until": None if is_eligible else self.anchor + timedelta(days=self.rng.randint(30, 180)),
+                "health_notes": None,
+            }
+
+    def staff(self, user_ids: List[int], hospital_ids: List[int]) -> Iterator[Dict[str, Any]]:
+        """Every hospital gets at least one staff member; the rest follow hospital size"""
+        self.hospital_ids = hospital_ids
+        staff_user_ids = user_ids[self.donor_count:self.donor_count + self.staff_count]
+        for n, user_id in enumerate(staff_user_ids):
+            hospital = n if n < self.hospital_count else self.hospital_index()
+            self.staff_by_hospital[hospital].append(n)
+            yield {
+                "user_id": user_id,
+                "hospital_id": hospital_ids[hospital],
+                "role": self.rng.choice(list(StaffRole)),
+                "department": self.rng.choice(list(Department)),
+            }
+
+    def blood_requests(self, staff_ids: List[int]) -> Iterator[Dict[str, Any]]:
+        """Request dates follow MONTH_WEIGHTS; past-due requests are mostly fulfilled"""
+        for _ in range(self.request_count):
+            hospital = self.hospital_index()
+            blood_type = self.blood_type()
+            day = self.rng.choices(self.history_days, cum_weights=self.seasonal_weights)[0]
+            request_date = self.at_random_hour(day)
+            needed_by_date = request_date + timedelta(days=self.rng.randint(1, 14))
+
+            roll = self.rng.random()
+            if needed_by_date.date() < self.anchor:
+                status = (
+                    RequestStatus.FULFILLED if roll < 0.75
+                    else RequestStatus.CANCELED if roll < 0.9
+                    else RequestStatus.APPROVED
+                )
+            else:
+                status = RequestStatus.PENDING if roll < 0.5 else RequestStatus.APPROVED
+
+            self.request_plans.append((hospital, blood_type))
+            yield {
+                "hospital_id": self.hospital_ids[hospital],
+                "staff_id": staff_ids[self.rng.choice(self.staff_by_hospital[hospital])],
+                "blood_type": blood_type,
+                "amount_needed_ml": self.rng.randrange(250, 2001, 50),
+                "patient_info": None,
+                "urgency_level": self.rng.choices(range(1, 6), weights=URGENCY_WEIGHTS)[0],
+                "status": status,
+                "request_date": request_date,
+                "needed_by_date": needed_by_date,
+                "notes": None,
+            }
+
+    def donations(self, donor_ids: List[int], request_ids: List[int]) -> Iterator[Dict[str, Any]]:
+        """
+        Donors mostly give at their home hospital. About a third of the
+        donations answer a request of that hospital for the donor's type.
+        """
+        for (hospital, blood_type), request_id in zip(self.request_plans, request_ids):
+            self.requests_by_hospital_type[(hospital, blood_type)].append(request_id)
+
+        for donor_id, (blood_type, home_hospital, schedule) in zip(donor_ids, self.donor_plans):
+            for day, status in schedule:
+                hospital = home_hospital if self.rng.random() < 0.8 else self.hospital_index()
+                requests = self.requests_by_hospital_type.get((hospital, blood_type))
+                request_id = self.rng.choice(requests) if requests and self.rng.random() < 0.35 else None
+                yield {
+                    "donor_id": donor_id,
+                    "hospital_id": self.hospital_ids[hospital],
+                    "blood_request_id": request_id,
+                    "blood_amount_ml": min(500, max(250, int(self.rng.gauss(430, 40)))),
+                    "blood_type": blood_type,
+                    "donation_date": self.at_random_hour(day),
+                    "status": status,
+                    "notes": None,
+                }
+
+
+async def copy_rows(copy: Callable, label: str, rows: Iterable[Dict[str, Any]], session, chunk_size: int) -> List[int]:
+    """COPY rows in chunk by chunk, so the full table never sits in memory as dicts"""
+    started = perf_counter()
+    ids: List[int] = []
+    for chunk in chunked(rows, chunk_size):
+        ids.extend(await copy(chunk, session=session, chunk_size=chunk_size))
+    print(f"✓ {label}: {len(ids)} rows in {perf_counter() - started:.1f}s")
+    return ids
+
+
+async def generate_bulk_data(
+    scale: int = 1,
+    seed: int = 42,
+    anchor: Optional[date] = None,
+    chunk_size: int = 50_000,
+    session_maker=async_session_maker
+) -> Dict[str, int]:
+    """
+    Fill the database with a seeded synthetic dataset.
+
+    Args:
+        scale: Size multiplier; one unit is 10,000 users and 100 hospitals
+        seed: Seed for every random choice
+        anchor: Day the history ends at; today if omitted. Eligibility and
+            open requests are relative to it.
+        chunk_size: Rows per COPY
+
+    Returns:
+        Number of rows written per table
+    """
+    generator = BulkDataGenerator(scale, seed, anchor or date.today())
+    started = perf_counter()
+    print(f"Generating bulk data at scale {scale} (seed {seed}, anchor {generator.anchor})...")
+
+    async with session_maker() as session:
+        user_ids = await copy_rows(UsersDAO.copy_records, "users", generator.users(), session, chunk_size)
+        hospital_ids = await copy_rows(HospitalDAO.copy_records, "hospitals", generator.hospitals(), session, chunk_size)
+        donor_ids = await copy_rows(DonorDAO.copy_records, "donors", generator.donors(user_ids), session, chunk_size)
+        staff_ids = await copy_rows(
+            HospitalStaffDAO.copy_records, "hospital staff", generator.staff(user_ids, hospital_ids), session, chunk_size
+        )
+        request_ids = await copy_rows(
+            BloodRequestDAO.copy_records, "blood requests", generator.blood_requests(staff_ids), session, chunk_size
+        )
+        # collected_ml is recomputed once for all requests below, not per chunk
+        donation_ids = await copy_rows(
+            functools.partial(DonationDAO.copy_records, recalculate=False),
+            "donations",
+            generator.donations(donor_ids, request_ids),
+            session,
+            chunk_size
+        )
+        repaired = await BloodRequestDAO.recalculate_collected_ml(session=session)
+        print(f"✓ collected_ml set on {len(repaired)} blood requests")
+        await session.commit()
+
+    async with session_maker() as session:
+        await session.execute(text("ANALYZE"))
+        await session.commit()
+
+    counts = {
+        "users": len(user_ids),
+        "hospitals": len(hospital_ids),
+        "donors": len(donor_ids),
+        "hospital_staff": len(staff_ids),
+        "blood_requests": len(request_ids),
+        "donations": len(donation_ids),
+    }
+    print(f"\nBulk data generation complete in {perf_counter() - started:.1f}s!")
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic dataset with COPY")
+    parser.add_argument("--scale", type=int, default=1, help="Size multiplier; 1 = 10,000 users and ~14,000 donations")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor-date", type=date.fromisoformat, default=None,
+                        help="Last day of the generated history (YYYY-MM-DD), today by default")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per COPY")
+    args = parser.parse_args()
+
+    asyncio.run(generate_bulk_data(args.scale, args.seed, args.anchor_date, args.chunk_size))
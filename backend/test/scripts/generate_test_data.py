@@ -16,10 +16,11 @@ async def generate_test_data(
     donor_percentage=0.4,  # 40% of users are donors
     staff_percentage=0.15,  # 15% of users are staff
     requests_per_staff=2,
-    donations_per_donor=1.5  # Average 1.5 donations per donor
+    donations_per_donor=1.5,  # Average 1.5 donations per donor
+    session_maker=async_session_maker
 ):
     """Generate consistent test data respecting all relationships"""
-    async with async_session_maker() as session:
+    async with session_maker() as session:
         # Step 1: Create base users
         print(f"Creating {user_count} users...")
         users = []
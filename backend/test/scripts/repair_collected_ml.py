@@ -0,0 +1,19 @@
+import asyncio
+from app.database import async_session_maker
+from app.blood_request.dao import BloodRequestDAO
+
+async def repair_collected_ml():
+    """Recompute blood_requests.collected_ml from completed donations and fix any drift"""
+    print("Checking collected_ml of blood requests...")
+
+    async with async_session_maker() as session:
+        repaired = await BloodRequestDAO.recalculate_collected_ml(session=session)
+        await session.commit()
+
+    if repaired:
+        print(f"✓ Repaired {len(repaired)} blood requests: {', '.join(map(str, repaired))}")
+    else:
+        print("✓ All blood requests are in sync")
+
+if __name__ == "__main__":
+    asyncio.run(repair_collected_ml())
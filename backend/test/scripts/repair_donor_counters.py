@@ -0,0 +1,19 @@
+import asyncio
+from app.database import async_session_maker
+from app.donor.dao import DonorDAO
+
+async def repair_donor_counters():
+    """Recompute donors' total_donations and first/last donation dates from completed donations"""
+    print("Checking donation counters of donors...")
+
+    async with async_session_maker() as session:
+        repaired = await DonorDAO.recalculate_donation_counters(session=session)
+        await session.commit()
+
+    if repaired:
+        print(f"✓ Repaired {len(repaired)} donors: {', '.join(map(str, repaired))}")
+    else:
+        print("✓ All donors are in sync")
+
+if __name__ == "__main__":
+    asyncio.run(repair_donor_counters())
@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+
+from app.common.enums import DonationStatus
+from test.scripts.generate_bulk_data import MIN_DONATION_GAP_DAYS, BulkDataGenerator
+
+
+def generate(seed):
+    generator = BulkDataGenerator(scale=1, seed=seed, anchor=date(2026, 1, 1))
+    users = list(generator.users())
+    hospitals = list(generator.hospitals())
+    user_ids = list(range(1, len(users) + 1))
+    donors = list(generator.donors(user_ids))
+    staff = list(generator.staff(user_ids, list(range(1, len(hospitals) + 1))))
+    requests = list(generator.blood_requests(list(range(1, len(staff) + 1))))
+    donations = list(generator.donations(list(range(1, len(donors) + 1)), list(range(1, len(requests) + 1))))
+    return users, hospitals, donors, staff, requests, donations
+
+
+def test_same_seed_gives_identical_rows():
+    assert generate(7) == generate(7)
+    assert generate(7)[0] != generate(8)[0]
+
+
+def test_donor_history_matches_donations():
+    _, _, donors, _, _, donations = generate(7)
+
+    by_donor = {}
+    for donation in donations:
+        by_donor.setdefault(donation["donor_id"], []).append(donation)
+
+    for donor_id, donor in enumerate(donors, start=1):
+        history = by_donor.get(donor_id, [])
+        completed = [d["donation_date"].date() for d in history if d["status"] == DonationStatus.COMPLETED]
+        assert donor["total_donations"] == len(completed)
+        assert donor["last_donation_date"] == (completed[-1] if completed else None)
+        assert all(d["blood_type"] == donor["blood_type"] for d in history)
+
+        dates = [d["donation_date"].date() for d in history]
+        assert all(later - earlier >= timedelta(days=MIN_DONATION_GAP_DAYS) for earlier, later in zip(dates, dates[1:]))
@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+from itertools import count
+
+import pytest
+from sqlalchemy import event, select
+
+from app.users.dao import UsersDAO
+from app.users.models import User
+from test.factories.user_factory import UserFactory
+
+
+_email_numbers = count(1)
+
+
+def user_rows(size):
+    return [{**UserFactory.values(), "email": f"bulk{next(_email_numbers)}@example.com"} for _ in range(size)]
+
+
+@contextmanager
+def insert_statements(session):
+    """INSERT statements sent to the database while inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            statements.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def stored_users(session, ids):
+    result = await session.scalars(select(User).where(User.id.in_(ids)).order_by(User.id))
+    return result.all()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("returning", [True, False])
+async def test_add_many_sends_one_statement_per_chunk(db_session, returning):
+    rows = user_rows(5)
+
+    with insert_statements(db_session) as statements:
+        ids = await UsersDAO.add_many(rows, session=db_session, chunk_size=2, returning=returning)
+
+    assert len(statements) == 3
+    emails = [row["email"] for row in rows]
+    stored = (await db_session.scalars(select(User.email).where(User.email.in_(emails)))).all()
+    assert sorted(stored) == sorted(emails)
+    if returning:
+        assert [user.email for user in await stored_users(db_session, ids)] == emails
+    else:
+        assert ids == []
+
+
+@pytest.mark.asyncio
+async def test_add_many_skips_rows_that_conflict(db_session):
+    existing = await UserFactory.create(db_session)
+    rows = user_rows(1) + [{**UserFactory.values(), "email": existing.email, "first_name": "Дублікат"}]
+
+    ids = await UsersDAO.add_many(rows, session=db_session, on_conflict="skip")
+
+    assert len(ids) == 1 and existing.id not in ids
+    await db_session.refresh(existing)
+    assert existing.first_name != "Дублікат"
+
+
+@pytest.mark.asyncio
+async def test_add_many_upserts_on_the_conflict_target(db_session):
+    existing = await UserFactory.create(db_session)
+    rows = [{**UserFactory.values(), "email": existing.email, "first_name": "Оновлена"}]
+
+    ids = await UsersDAO.add_many(rows, session=db_session, on_conflict="upsert", conflict_target="email")
+
+    assert ids == [existing.id]
+    await db_session.refresh(existing)
+    assert existing.first_name == "Оновлена"
+
+
+@pytest.mark.asyncio
+async def test_add_many_rejects_invalid_conflict_options(db_session):
+    with pytest.raises(ValueError):
+        await UsersDAO.add_many(user_rows(1), session=db_session, on_conflict="replace")
+    with pytest.raises(ValueError):
+        await UsersDAO.add_many(user_rows(1), session=db_session, on_conflict="upsert")
+
+
+@pytest.mark.asyncio
+async def test_copy_records_assigns_ids_and_applies_defaults(db_session):
+    rows = [
+        {key: value for key, value in row.items() if not key.startswith("is_")}
+        for row in user_rows(3)
+    ]
+
+    ids = await UsersDAO.copy_records(rows, session=db_session, chunk_size=2)
+
+    assert len(set(ids)) == 3
+    users = await stored_users(db_session, ids)
+    assert [user.email for user in sorted(users, key=lambda user: ids.index(user.id))] == [row["email"] for row in rows]
+    for user in users:
+        # Python-side defaults are filled in, server defaults apply to columns no row provides
+        assert user.is_user and not user.is_admin and not user.is_donor
+        assert user.created_at is not None and user.updated_at is not None
+
+    assert await UsersDAO.copy_records([], session=db_session) == []
@@ -0,0 +1,176 @@
+import asyncio
+import pytest
+from app.common.cache import MemoryCacheBackend, StaleWhileRevalidate, TTLCache, cached_method, set_dao_cache_backend
+from app.blood_request.dao import BloodRequestDAO
+from app.common.enums import BloodType
+from app.common.events import ChangeEvent
+from app.common.singleflight import SingleFlight
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.users.cache import cache_principal, get_cached_principal, invalidate_principal, principal_generation
+from app.users.models import User
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(ttl=60)
+    cache.set("fresh", 1)
+    cache.set("stale", 2, ttl=0)
+
+    assert cache.get("fresh") == 1
+    assert cache.get("stale") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing():
+    calls = []
+
+    async def loader():
+        calls.append(None)
+        return len(calls)
+
+    cache = StaleWhileRevalidate(loader, fresh_ttl=0, max_stale=60)
+
+    assert await cache.get() == 1
+    assert await cache.get() == 1
+    await cache._refresh_task
+    assert await cache.get() == 2
+    assert (cache.misses, cache.stale_hits) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_is_keyed_by_token_and_invalidated_per_user():
+    user = User(id=7, phone_number="+380501234567", first_name="Іван", last_name="Петренко",
+                email="ivan@example.com", password="hash", is_admin=True)
+    cache_principal(7, 1700000000, user, principal_generation(7))
+
+    async with AsyncSession() as session:
+        cached = await get_cached_principal(7, 1700000000, session)
+        assert cached.email == "ivan@example.com" and cached.is_admin
+        assert cached in session
+        assert await get_cached_principal(7, 1700000001, session) is None
+
+        invalidate_principal(7)
+        assert await get_cached_principal(7, 1700000000, session) is None
+
+
+@pytest.mark.asyncio
+async def test_principal_evicted_while_loading_is_not_cached():
+    user = User(id=8, phone_number="+380501234568", first_name="Олена", last_name="Коваль",
+                email="olena@example.com", password="hash")
+    generation = principal_generation(8)
+    invalidate_principal(8)
+    cache_principal(8, 1700000000, user, generation)
+
+    async with AsyncSession() as session:
+        assert await get_cached_principal(8, 1700000000, session) is None
+
+
+class _ReportDAO:
+    calls = 0
+
+    @classmethod
+    @cached_method(ttl=60)
+    async def report(cls, blood_type: str, days: int = 30, limit: float = 50.0, session=None):
+        cls.calls += 1
+        return [{"blood_type": blood_type, "days": days}]
+
+
+@pytest.mark.asyncio
+async def test_cached_method_normalises_arguments():
+    set_dao_cache_backend(MemoryCacheBackend(maxsize=16))
+
+    first = await _ReportDAO.report("O+")
+    assert await _ReportDAO.report(BloodType.O_POSITIVE, 30, session=object()) == first
+    assert await _ReportDAO.report(blood_type="O+", limit=50) == first
+    assert _ReportDAO.calls == 1
+
+    await _ReportDAO.report("O+", days=7)
+    assert _ReportDAO.calls == 2
+    assert (_ReportDAO.report.hits, _ReportDAO.report.misses) == (2, 2)
+
+    await _ReportDAO.report.invalidate()
+    await _ReportDAO.report("O+")
+    assert _ReportDAO.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_are_coalesced():
+    flights = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def query():
+        calls.append(None)
+        await release.wait()
+        return ["O-"]
+
+    callers = [asyncio.create_task(flights.do("shortages:O-", query)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*callers)
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert (flights.executions, flights.coalesced) == (1, 4)
+    assert not flights.is_in_flight("shortages:O-")
+
+
+class _SlowDAO:
+    release = None
+
+    @classmethod
+    @cached_method(ttl=60)
+    async def shortages(cls, session=None):
+        await cls.release.wait()
+        return {"O-": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_load_started_before_invalidation_is_not_cached():
+    backend = MemoryCacheBackend(maxsize=16)
+    set_dao_cache_backend(backend)
+    _SlowDAO.release = asyncio.Event()
+
+    loading = asyncio.create_task(_SlowDAO.shortages())
+    await asyncio.sleep(0)
+    _SlowDAO.shortages.on_change(ChangeEvent("donations"))
+    _SlowDAO.release.set()
+    await loading
+
+    assert len(backend._cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_results_are_copies():
+    set_dao_cache_backend(MemoryCacheBackend(maxsize=16))
+    _SlowDAO.release = asyncio.Event()
+    _SlowDAO.release.set()
+
+    first = await _SlowDAO.shortages()
+    first["O-"].append(3)
+    first["A+"] = []
+
+    assert await _SlowDAO.shortages() == {"O-": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_summary_miss_does_not_cache_uncommitted_rows(db_session, blood_donation_scenario):
+    hospital_id = blood_donation_scenario["hospital"].id
+    BloodRequestDAO._summary_cache.clear()
+
+    summary = await BloodRequestDAO.get_summary(hospital_id, session=db_session)
+
+    assert summary["total_requests"] == 0
+    assert BloodRequestDAO._summary_cache.get(hospital_id)["total_requests"] == 0
@@ -0,0 +1,106 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import select
+
+from app.blood_request.models import BloodRequest
+from app.common.enums import BloodType, DonationStatus, RequestStatus
+from app.donation.dao import DonationDAO
+from test.factories.blood_request_factory import BloodRequestFactory
+
+
+async def collected_ml(session, request_id):
+    return await session.scalar(select(BloodRequest.collected_ml).where(BloodRequest.id == request_id))
+
+
+@pytest.fixture
+def scenario(blood_donation_scenario):
+    return blood_donation_scenario
+
+
+async def second_request(session, scenario):
+    return await BloodRequestFactory.create(
+        session,
+        hospital_id=scenario["hospital"].id,
+        staff_id=scenario["staff"].id,
+        blood_type=BloodType.A_POSITIVE,
+        amount_needed_ml=5000,
+        status=RequestStatus.APPROVED
+    )
+
+
+@pytest.mark.asyncio
+async def test_factory_donations_count_towards_their_request(db_session, scenario):
+    request, donation = scenario["blood_request"], scenario["donation"]
+
+    assert await collected_ml(db_session, request.id) == donation.blood_amount_ml
+    assert request.collected_ml == donation.blood_amount_ml
+
+
+@pytest.mark.asyncio
+async def test_collected_ml_follows_create_status_change_move_and_delete(db_session, scenario):
+    request = await second_request(db_session, scenario)
+
+    donation = await DonationDAO.create_donation(
+        session=db_session,
+        donor_id=scenario["donor"].id,
+        hospital_id=scenario["hospital"].id,
+        blood_request_id=request.id,
+        blood_type=BloodType.A_POSITIVE,
+        blood_amount_ml=400,
+        status=DonationStatus.COMPLETED
+    )
+    assert await collected_ml(db_session, request.id) == 400
+
+    await DonationDAO.update_status(donation.id, DonationStatus.REJECTED, session=db_session)
+    assert await collected_ml(db_session, request.id) == 0
+
+    await DonationDAO.update(donation.id, session=db_session, status=DonationStatus.COMPLETED, blood_amount_ml=450)
+    assert await collected_ml(db_session, request.id) == 450
+
+    original = scenario["blood_request"]
+    before = await collected_ml(db_session, original.id)
+    await DonationDAO.update(donation.id, session=db_session, blood_request_id=original.id)
+    assert await collected_ml(db_session, request.id) == 0
+    assert await collected_ml(db_session, original.id) == before + 450
+
+    assert await DonationDAO.delete(donation.id, session=db_session)
+    assert await collected_ml(db_session, original.id) == before
+
+
+@pytest.mark.asyncio
+async def test_scheduled_donation_adds_nothing_until_completed(db_session, scenario):
+    request = await second_request(db_session, scenario)
+
+    donation = await DonationDAO.create_donation(
+        session=db_session,
+        donor_id=scenario["donor"].id,
+        hospital_id=scenario["hospital"].id,
+        blood_request_id=request.id,
+        blood_type=BloodType.A_POSITIVE,
+        blood_amount_ml=300,
+        status=DonationStatus.SCHEDULED
+    )
+    assert await collected_ml(db_session, request.id) == 0
+
+    await DonationDAO.complete_donation(donation.id, session=db_session)
+    assert await collected_ml(db_session, request.id) == 300
+
+
+@pytest.mark.asyncio
+async def test_copy_records_recalculates_unless_told_not_to(db_session, scenario):
+    request = await second_request(db_session, scenario)
+    row = {
+        "donor_id": scenario["donor"].id,
+        "hospital_id": scenario["hospital"].id,
+        "blood_request_id": request.id,
+        "blood_type": BloodType.A_POSITIVE,
+        "blood_amount_ml": 350,
+        "donation_date": datetime(2026, 1, 1),
+        "status": DonationStatus.COMPLETED,
+    }
+
+    await DonationDAO.copy_records([row], session=db_session, recalculate=False)
+    assert await collected_ml(db_session, request.id) == 0
+
+    await DonationDAO.copy_records([row], session=db_session)
+    assert await collected_ml(db_session, request.id) == 700
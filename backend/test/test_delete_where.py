@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import select
+
+from app.blood_request.dao import BloodRequestDAO
+from app.blood_request.models import BloodRequest
+from app.common.enums import BloodType, DonationStatus
+from app.donation.models import Donation
+from app.hospital.dao import HospitalDAO
+from app.hospital.models import Hospital
+from test.factories.donation_factory import DonationFactory
+from test.factories.hospital_factory import HospitalFactory
+
+
+async def exists(session, model, id):
+    return await session.scalar(select(model.id).where(model.id == id)) is not None
+
+
+@pytest.fixture
+def scenario(blood_donation_scenario):
+    return blood_donation_scenario
+
+
+@pytest.mark.asyncio
+async def test_dry_run_returns_matching_ids_without_deleting(db_session, scenario):
+    request = scenario["blood_request"]
+
+    ids = await BloodRequestDAO.delete_where(session=db_session, dry_run=True, hospital_id=request.hospital_id)
+
+    assert ids == [request.id]
+    assert await exists(db_session, BloodRequest, request.id)
+
+
+@pytest.mark.asyncio
+async def test_cascade_deletes_dependent_rows_first(db_session, scenario):
+    request, donation = scenario["blood_request"], scenario["donation"]
+
+    ids = await BloodRequestDAO.delete_where(
+        BloodRequest.blood_type == BloodType.A_POSITIVE,
+        session=db_session,
+        cascade=(Donation.blood_request_id,),
+        hospital_id=request.hospital_id
+    )
+
+    assert ids == [request.id]
+    assert not await exists(db_session, BloodRequest, request.id)
+    assert not await exists(db_session, Donation, donation.id)
+
+
+@pytest.mark.asyncio
+async def test_no_match_deletes_nothing(db_session, scenario):
+    request = scenario["blood_request"]
+
+    assert await BloodRequestDAO.delete_where(session=db_session, id=request.id, hospital_id=-1) == []
+    assert await exists(db_session, BloodRequest, request.id)
+
+
+@pytest.mark.asyncio
+async def test_hospital_with_staff_or_requests_is_not_deleted(db_session, scenario):
+    hospital = scenario["hospital"]
+
+    assert not await HospitalDAO.can_be_deleted(hospital.id, session=db_session)
+    assert not await HospitalDAO.delete(hospital.id, session=db_session, cascade_donations=True)
+    assert await exists(db_session, Hospital, hospital.id)
+
+
+@pytest.mark.asyncio
+async def test_hospital_donations_block_delete_unless_cascaded(db_session, scenario):
+    hospital = await HospitalFactory.create(db_session)
+    donation = await DonationFactory.create(
+        db_session,
+        donor_id=scenario["donor"].id,
+        hospital_id=hospital.id,
+        blood_type=BloodType.A_POSITIVE,
+        status=DonationStatus.SCHEDULED
+    )
+
+    assert not await HospitalDAO.can_be_deleted(hospital.id, session=db_session)
+    assert not await HospitalDAO.delete(hospital.id, session=db_session)
+
+    assert await HospitalDAO.delete(hospital.id, session=db_session, cascade_donations=True)
+    assert not await exists(db_session, Hospital, hospital.id)
+    assert not await exists(db_session, Donation, donation.id)
+
+
+@pytest.mark.asyncio
+async def test_unused_hospital_is_deleted(db_session):
+    hospital = await HospitalFactory.create(db_session)
+
+    assert await HospitalDAO.can_be_deleted(hospital.id, session=db_session)
+    assert await HospitalDAO.delete(hospital.id, session=db_session)
+    assert not await exists(db_session, Hospital, hospital.id)
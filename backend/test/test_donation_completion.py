@@ -0,0 +1,209 @@
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app.blood_request.dao import BloodRequestDAO
+from app.common.enums import BloodType, DonationStatus, RequestStatus
+from app.donation.dao import DonationDAO
+from app.donor.dao import DonorDAO
+from app.donor.models import Donor
+from test.factories.blood_request_factory import BloodRequestFactory
+from test.factories.donor_factory import DonorFactory
+from test.factories.user_factory import UserFactory
+
+
+def test_first_donations_set_both_dates():
+    donor = SimpleNamespace(total_donations=0, first_donation_date=None, last_donation_date=None)
+
+    DonationDAO._record_donations(donor, [date(2024, 5, 1), date(2024, 3, 1)])
+
+    assert donor.total_donations == 2
+    assert donor.first_donation_date == date(2024, 3, 1)
+    assert donor.last_donation_date == date(2024, 5, 1)
+
+
+def test_backdated_donation_keeps_latest_date():
+    donor = SimpleNamespace(total_donations=3, first_donation_date=date(2023, 1, 10), last_donation_date=date(2024, 6, 1))
+
+    DonationDAO._record_donations(donor, [date(2024, 2, 1)])
+
+    assert donor.total_donations == 4
+    assert donor.first_donation_date == date(2023, 1, 10)
+    assert donor.last_donation_date == date(2024, 6, 1)
+
+
+async def fresh_donor(session):
+    user = await UserFactory.create(session, is_donor=True)
+    return await DonorFactory.create(session, user_id=user.id, blood_type=BloodType.A_POSITIVE)
+
+
+async def schedule(session, scenario, donor, request, amount_ml=300, days_ago=10, status=DonationStatus.SCHEDULED):
+    return await DonationDAO.create_donation(
+        session=session,
+        donor_id=donor.id,
+        hospital_id=scenario["hospital"].id,
+        blood_request_id=request.id if request else None,
+        blood_type=BloodType.A_POSITIVE,
+        blood_amount_ml=amount_ml,
+        donation_date=datetime(2026, 1, 1) - timedelta(days=days_ago),
+        status=status
+    )
+
+
+async def new_request(session, scenario, amount_needed_ml):
+    return await BloodRequestFactory.create(
+        session,
+        hospital_id=scenario["hospital"].id,
+        staff_id=scenario["staff"].id,
+        blood_type=BloodType.A_POSITIVE,
+        amount_needed_ml=amount_needed_ml,
+        status=RequestStatus.APPROVED
+    )
+
+
+@contextmanager
+def locked_tables(session):
+    """Tables in the order the statements sent while inside the block lock their rows"""
+    tables = []
+    pattern = re.compile(r"^(?:SELECT .*?\sFROM (\w+)\s.*FOR UPDATE|UPDATE (\w+) )", re.S)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        match = pattern.match(statement)
+        if match:
+            table = match.group(1) or match.group(2)
+            if not tables or tables[-1] != table:
+                tables.append(table)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield tables
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.asyncio
+async def test_batch_locks_donations_then_donors_then_requests(db_session, blood_donation_scenario):
+    donor = await fresh_donor(db_session)
+    request = await new_request(db_session, blood_donation_scenario, 5000)
+    donations = [await schedule(db_session, blood_donation_scenario, donor, request) for _ in range(2)]
+
+    with locked_tables(db_session) as tables:
+        await DonationDAO.complete_donations([d.id for d in donations], session=db_session)
+
+    assert tables == ["donations", "donors", "blood_requests"]
+
+
+@pytest.mark.asyncio
+async def test_batch_skips_donations_that_are_not_scheduled(db_session, blood_donation_scenario):
+    donor = await fresh_donor(db_session)
+    request = await new_request(db_session, blood_donation_scenario, 5000)
+    scheduled = await schedule(db_session, blood_donation_scenario, donor, request, days_ago=5)
+    canceled = await schedule(db_session, blood_donation_scenario, donor, request, status=DonationStatus.CANCELED)
+
+    completed = await DonationDAO.complete_donations([scheduled.id, canceled.id, 0], session=db_session)
+
+    assert [d.id for d in completed] == [scheduled.id]
+    assert canceled.status == DonationStatus.CANCELED
+    assert donor.total_donations == 1
+    assert donor.first_donation_date == donor.last_donation_date == date(2025, 12, 27)
+    assert await DonationDAO.complete_donations([scheduled.id], session=db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_fulfills_request_that_reaches_amount_needed(db_session, blood_donation_scenario):
+    donor = await fresh_donor(db_session)
+    request = await new_request(db_session, blood_donation_scenario, 500)
+    donations = [
+        await schedule(db_session, blood_donation_scenario, donor, request, amount_ml=amount_ml)
+        for amount_ml in (200, 300)
+    ]
+
+    await DonationDAO.complete_donations([donations[0].id], session=db_session)
+    await db_session.refresh(request)
+    assert request.status == RequestStatus.APPROVED
+
+    await DonationDAO.complete_donations([donations[1].id], session=db_session)
+    await db_session.refresh(request)
+    assert request.collected_ml == 500
+    assert request.status == RequestStatus.FULFILLED
+
+
+@pytest.mark.asyncio
+async def test_leaving_completed_recounts_the_donor(db_session, blood_donation_scenario):
+    donor = await fresh_donor(db_session)
+    older = await schedule(db_session, blood_donation_scenario, donor, None, days_ago=120)
+    newer = await schedule(db_session, blood_donation_scenario, donor, None, days_ago=10)
+    await DonationDAO.complete_donations([older.id, newer.id], session=db_session)
+    assert donor.total_donations == 2
+
+    await DonationDAO.update_status(newer.id, DonationStatus.REJECTED, session=db_session)
+    assert donor.total_donations == 1
+    assert donor.last_donation_date == date(2025, 9, 3)
+
+    await DonationDAO.update(newer.id, session=db_session, status=DonationStatus.COMPLETED)
+    assert donor.total_donations == 2
+    assert donor.last_donation_date == date(2025, 12, 22)
+
+    await DonationDAO.delete(older.id, session=db_session)
+    assert donor.total_donations == 1
+    assert donor.first_donation_date == date(2025, 12, 22)
+
+
+@pytest.mark.asyncio
+async def test_cascade_delete_of_request_recounts_donors(db_session, blood_donation_scenario):
+    donor = await fresh_donor(db_session)
+    request = await new_request(db_session, blood_donation_scenario, 5000)
+    kept = await schedule(db_session, blood_donation_scenario, donor, None, days_ago=120)
+    deleted = await schedule(db_session, blood_donation_scenario, donor, request, days_ago=10)
+    await DonationDAO.complete_donations([kept.id, deleted.id], session=db_session)
+
+    with locked_tables(db_session) as tables:
+        assert await BloodRequestDAO.delete(session=db_session, cascade_donations=True, id=request.id) == 1
+
+    assert tables[:2] == ["donations", "donors"]
+    assert donor.total_donations == 1
+    assert donor.first_donation_date == donor.last_donation_date == date(2025, 9, 3)
+
+
+async def counters(session, donor):
+    row = (await session.execute(
+        select(Donor.total_donations, Donor.first_donation_date, Donor.last_donation_date).where(Donor.id == donor.id)
+    )).one()
+    return tuple(row)
+
+
+@pytest.mark.asyncio
+async def test_donation_inserted_as_completed_counts_for_the_donor(db_session, blood_donation_scenario):
+    donor = await fresh_donor(db_session)
+
+    await schedule(db_session, blood_donation_scenario, donor, None, days_ago=30, status=DonationStatus.COMPLETED)
+    assert (donor.total_donations, donor.last_donation_date) == (1, date(2025, 12, 2))
+
+    row = {
+        "donor_id": donor.id,
+        "hospital_id": blood_donation_scenario["hospital"].id,
+        "blood_type": BloodType.A_POSITIVE,
+        "blood_amount_ml": 400,
+        "status": DonationStatus.COMPLETED,
+    }
+    await DonationDAO.add_many([{**row, "donation_date": datetime(2025, 6, 1)}], session=db_session)
+    await DonationDAO.copy_records([{**row, "donation_date": datetime(2025, 12, 20)}], session=db_session)
+
+    assert await counters(db_session, donor) == (3, date(2025, 6, 1), date(2025, 12, 20))
+
+
+@pytest.mark.asyncio
+async def test_drifted_donor_counters_are_repaired(db_session, blood_donation_scenario):
+    donor = await fresh_donor(db_session)
+    donation = await schedule(db_session, blood_donation_scenario, donor, None, days_ago=10)
+    await DonationDAO.complete_donations([donation.id], session=db_session)
+    await db_session.execute(update(Donor).where(Donor.id == donor.id).values(total_donations=7, first_donation_date=None))
+
+    assert await DonorDAO.recalculate_donation_counters(session=db_session) == [donor.id]
+    assert await counters(db_session, donor) == (1, date(2025, 12, 22), date(2025, 12, 22))
+    assert await DonorDAO.recalculate_donation_counters([donor.id], session=db_session) == []
@@ -0,0 +1,22 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.common.events import ChangeEvent, publish, subscribe
+
+
+def test_events_are_delivered_only_after_commit():
+    received = []
+    subscribe(["test_events"], received.append)
+    engine = create_engine("sqlite://")
+
+    with Session(engine) as session:
+        session.begin()
+        publish(session, ChangeEvent("test_events", 1, hospital_id=3))
+        assert received == []
+        session.commit()
+        assert received == [ChangeEvent("test_events", 1, hospital_id=3)]
+
+        session.begin()
+        publish(session, ChangeEvent("test_events", 2))
+        session.rollback()
+        session.commit()
+        assert len(received) == 1
@@ -0,0 +1,97 @@
+import pytest
+from datetime import date
+from types import SimpleNamespace
+
+from app.common.enums import BloodType, DonationStatus
+from test.factories.base_factory import FactoryBatch
+from test.factories.user_factory import UserFactory
+from test.factories.donor_factory import DonorFactory
+from test.factories.hospital_factory import HospitalFactory
+from test.factories.hospital_staff_factory import HospitalStaffFactory
+from test.factories.blood_request_factory import BloodRequestFactory
+from test.factories.donation_factory import DonationFactory
+
+
+class RecordingSession:
+    """Stands in for AsyncSession: records each INSERT and hands out sequential ids"""
+
+    def __init__(self):
+        self.inserts = []
+        self.identity_map = {}
+
+    async def execute(self, statement):
+        # DonationFactory's counter refresh; nothing drifted
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=list))
+
+    async def scalars(self, statement, rows):
+        table = statement.table.name
+        self.inserts.append((table, rows))
+        result = [SimpleNamespace(id=100 * len(self.inserts) + n, **row) for n, row in enumerate(rows)]
+        return SimpleNamespace(all=lambda: result)
+
+
+@pytest.mark.asyncio
+async def test_batch_inserts_one_statement_per_model_in_dependency_order():
+    session = RecordingSession()
+    batch = FactoryBatch(session)
+    donation = batch.add(DonationFactory, blood_type=BloodType.O_NEGATIVE)
+    hospital = batch.add(HospitalFactory)
+    users = [batch.add(UserFactory, is_donor=True) for _ in range(3)]
+    donors = [batch.add(DonorFactory, user_id=user) for user in users]
+    staff = batch.add(HospitalStaffFactory, user_id=batch.add(UserFactory), hospital_id=hospital)
+    request = batch.add(BloodRequestFactory, hospital_id=hospital, staff_id=staff)
+    donation.values.update(donor_id=donors[0], hospital_id=hospital, blood_request_id=request)
+
+    await batch.flush()
+
+    assert [table for table, _ in session.inserts] == [
+        "hospitals", "users", "donors", "hospital_staff", "blood_requests", "donations"
+    ]
+    assert len(session.inserts[1][1]) == 4
+    assert [donor.instance.user_id for donor in donors] == [user.id for user in users]
+    assert request.instance.staff_id == staff.id
+    assert donation.instance.blood_request_id == request.id
+    assert donation.instance.donor_id == donors[0].id
+
+
+def test_pending_row_has_no_id_before_flush():
+    batch = FactoryBatch(RecordingSession())
+    user = batch.add(UserFactory)
+
+    with pytest.raises(RuntimeError):
+        user.id
+
+
+@pytest.mark.asyncio
+async def test_flush_lines_up_mixed_rows_with_their_inputs(db_session):
+    batch = FactoryBatch(db_session)
+    hospital = batch.add(HospitalFactory)
+    users = [batch.add(UserFactory, is_donor=True) for _ in range(3)]
+    # Different key sets within one model's INSERT
+    donors = [
+        batch.add(DonorFactory, user_id=users[0], blood_type=BloodType.O_NEGATIVE),
+        batch.add(DonorFactory, user_id=users[1], blood_type=BloodType.A_POSITIVE, health_notes="Anaemia in 2024"),
+        batch.add(DonorFactory, user_id=users[2], blood_type=BloodType.B_NEGATIVE, ineligible_until=date(2030, 1, 1)),
+    ]
+    staff = batch.add(HospitalStaffFactory, user_id=batch.add(UserFactory), hospital_id=hospital)
+    request = batch.add(BloodRequestFactory, hospital_id=hospital, staff_id=staff, blood_type=BloodType.O_NEGATIVE)
+    donations = [
+        batch.add(DonationFactory, donor_id=donors[2], hospital_id=hospital, blood_type=BloodType.B_NEGATIVE,
+                  blood_amount_ml=310, status=DonationStatus.SCHEDULED),
+        batch.add(DonationFactory, donor_id=donors[0], hospital_id=hospital, blood_type=BloodType.O_NEGATIVE,
+                  blood_amount_ml=320, blood_request_id=request, status=DonationStatus.SCHEDULED),
+    ]
+
+    await batch.flush()
+
+    assert [donor.instance.user_id for donor in donors] == [user.id for user in users]
+    assert [donor.instance.blood_type for donor in donors] == [
+        BloodType.O_NEGATIVE, BloodType.A_POSITIVE, BloodType.B_NEGATIVE
+    ]
+    assert [donor.instance.health_notes for donor in donors] == [None, "Anaemia in 2024", None]
+    assert [donor.instance.ineligible_until for donor in donors] == [None, None, date(2030, 1, 1)]
+    assert [(d.instance.donor_id, d.instance.blood_amount_ml, d.instance.blood_request_id) for d in donations] == [
+        (donors[2].id, 310, None),
+        (donors[0].id, 320, request.id),
+    ]
+    assert request.instance.staff_id == staff.id
@@ -0,0 +1,20 @@
+import app.main
+from app.database import Base
+from app.dao.index_inventory import INDEX_INVENTORY, inventoried_indexes, queries_using
+
+
+def _declared_indexes():
+    return {index.name for table in Base.metadata.tables.values() for index in table.indexes}
+
+
+def test_inventory_only_names_declared_indexes():
+    assert set(inventoried_indexes()) <= _declared_indexes()
+
+
+def test_every_declared_index_serves_a_query():
+    unused = {name for name in _declared_indexes() if not queries_using(name)}
+    assert unused == set()
+
+
+def test_inventory_entries_are_not_empty():
+    assert all(INDEX_INVENTORY.values())
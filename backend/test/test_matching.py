@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.common.enums import BloodType, DonationStatus, RequestStatus
+from app.matching.service import (
+    compatible_donor_types, find_candidate_donors, from_mask, is_compatible, match_open_requests, DONOR_MASKS
+)
+from test.factories.base_factory import FactoryBatch
+from test.factories.user_factory import UserFactory
+from test.factories.donor_factory import DonorFactory
+from test.factories.hospital_factory import HospitalFactory
+from test.factories.hospital_staff_factory import HospitalStaffFactory
+from test.factories.blood_request_factory import BloodRequestFactory
+from test.factories.donation_factory import DonationFactory
+
+
+def test_universal_donor_and_recipient():
+    assert from_mask(DONOR_MASKS[BloodType.AB_POSITIVE]) == list(BloodType)
+    assert all(is_compatible(BloodType.O_NEGATIVE, recipient) for recipient in BloodType)
+
+
+def test_rh_negative_recipient_needs_rh_negative_blood():
+    assert set(compatible_donor_types(BloodType.A_NEGATIVE)) == {BloodType.A_NEGATIVE, BloodType.O_NEGATIVE}
+    assert not is_compatible(BloodType.O_POSITIVE, BloodType.O_NEGATIVE)
+    assert not is_compatible(BloodType.A_POSITIVE, BloodType.B_POSITIVE)
+
+
+def test_exact_type_is_preferred_over_universal_donors():
+    assert compatible_donor_types(BloodType.O_POSITIVE) == [BloodType.O_POSITIVE, BloodType.O_NEGATIVE]
+    assert compatible_donor_types(BloodType.AB_POSITIVE)[0] == BloodType.AB_POSITIVE
+    assert compatible_donor_types(BloodType.AB_POSITIVE)[-1] == BloodType.O_NEGATIVE
+
+
+@pytest_asyncio.fixture
+async def matching_scenario(db_session):
+    """
+    An A- request in the North and four donors around it:
+    a local A- donor, a first-time O- donor, an A- donor who only gave in
+    the South, and a first-time A+ donor who cannot give to A-.
+    """
+    batch = FactoryBatch(db_session)
+    north = batch.add(HospitalFactory, region="North")
+    south = batch.add(HospitalFactory, region="South")
+    staff = batch.add(HospitalStaffFactory, user_id=batch.add(UserFactory, is_hospital_staff=True), hospital_id=north)
+    request = batch.add(
+        BloodRequestFactory,
+        hospital_id=north,
+        staff_id=staff,
+        blood_type=BloodType.A_NEGATIVE,
+        amount_needed_ml=1000,
+        status=RequestStatus.APPROVED
+    )
+
+    last_donation = datetime.now() - timedelta(days=200)
+    donors = {}
+    for name, blood_type, gave_at in [
+        ("local", BloodType.A_NEGATIVE, north),
+        ("first_time", BloodType.O_NEGATIVE, None),
+        ("elsewhere", BloodType.A_NEGATIVE, south),
+        ("incompatible", BloodType.A_POSITIVE, None),
+    ]:
+        donors[name] = batch.add(
+            DonorFactory,
+            user_id=batch.add(UserFactory, is_donor=True),
+            blood_type=blood_type,
+            last_donation_date=last_donation.date() if gave_at else None,
+            ineligible_until=None
+        )
+        if gave_at:
+            batch.add(
+                DonationFactory,
+                donor_id=donors[name],
+                hospital_id=gave_at,
+                blood_type=blood_type,
+                donation_date=last_donation,
+                status=DonationStatus.COMPLETED
+            )
+    await batch.flush()
+
+    return request.instance, {name: donor.id for name, donor in donors.items()}
+
+
+@pytest.mark.asyncio
+async def test_candidates_are_blocked_by_type_and_region(db_session, matching_scenario):
+    request, donors = matching_scenario
+
+    [match] = await match_open_requests(region="North", blood_type=BloodType.A_NEGATIVE, session=db_session)
+
+    assert match["request_id"] == request.id
+    assert [(c["donor_id"], c["exact_match"]) for c in match["candidates"]] == [
+        (donors["local"], True),
+        (donors["first_time"], False),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_first_time_donors_match_any_region(db_session, matching_scenario):
+    _, donors = matching_scenario
+
+    candidates = await find_candidate_donors([BloodType.O_NEGATIVE, BloodType.A_NEGATIVE], ["South"], session=db_session)
+
+    assert {(c["donor_id"], c["region"]) for c in candidates} >= {
+        (donors["first_time"], None),
+        (donors["elsewhere"], "South"),
+    }
+    assert donors["local"] not in {c["donor_id"] for c in candidates}
+
+
+@pytest.mark.asyncio
+async def test_candidates_are_truncated_per_request(db_session, matching_scenario):
+    _, donors = matching_scenario
+
+    [match] = await match_open_requests(region="North", blood_type=BloodType.A_NEGATIVE, per_request=1, session=db_session)
+
+    assert [c["donor_id"] for c in match["candidates"]] == [donors["local"]]
@@ -0,0 +1,51 @@
+import pytest
+from datetime import datetime, date
+from sqlalchemy.dialects import postgresql
+from app.dao.pagination import decode_cursor, encode_cursor, keyset_filter, split_page
+from app.hospital.models import Hospital
+
+
+def test_cursor_round_trip():
+    """Cursors keep ints, strings, dates and datetimes intact"""
+    values = [datetime(2025, 3, 26, 10, 30), date(2025, 3, 28), "Обласна лікарня", 42]
+
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor([])])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_keyset_filter_seeks_on_row_value():
+    condition = keyset_filter([Hospital.name, Hospital.id], encode_cursor(["B", 7]))
+    sql = str(condition.compile(dialect=postgresql.dialect()))
+
+    assert sql == "(hospitals.name, hospitals.id) > (%(param_1)s, %(param_2)s)"
+
+
+@pytest.mark.parametrize("values", [["B", "7; DROP TABLE hospitals"], [7, 7], ["B", True], ["B", 7, 8]])
+def test_keyset_filter_rejects_values_of_the_wrong_type(values):
+    with pytest.raises(ValueError):
+        keyset_filter([Hospital.name, Hospital.id], encode_cursor(values))
+
+
+def test_date_cursor_values_are_checked():
+    assert decode_cursor(encode_cursor([date(2025, 3, 28)]), [date]) == [date(2025, 3, 28)]
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([datetime(2025, 3, 28, 10, 30)]), [date])
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(["2025-03-28"]), [datetime])
+
+
+def test_split_page_returns_cursor_only_when_more_rows_exist():
+    rows = [{"id": i} for i in range(1, 5)]
+
+    page, next_cursor = split_page(rows, 3, lambda row: (row["id"],))
+    assert [row["id"] for row in page] == [1, 2, 3]
+    assert decode_cursor(next_cursor) == [3]
+
+    page, next_cursor = split_page(rows[:3], 3, lambda row: (row["id"],))
+    assert len(page) == 3
+    assert next_cursor is None
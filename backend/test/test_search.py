@@ -0,0 +1,80 @@
+from sqlalchemy.dialects import postgresql
+
+from app.common.enums import BloodType, DonationStatus
+from app.dao.search import (
+    EXACT_ID_SCORE, USER_SEARCH_COLUMNS, contains_or_id, escape_like, is_email, matching_enum_names, parse_exact_id
+)
+from app.dao.tables import TablesDAO
+from app.users.models import User
+
+
+def test_exact_match_shortcuts():
+    assert parse_exact_id(" 42 ") == 42
+    assert parse_exact_id("0671234567") is None
+    assert parse_exact_id("99999999999") is None
+    assert parse_exact_id("Kyiv") is None
+    assert is_email("olena@example.com")
+    assert not is_email("olena@")
+
+
+def test_enum_terms_match_labels_and_names():
+    assert matching_enum_names(BloodType, "o+") == ["O_POSITIVE"]
+    assert matching_enum_names(DonationStatus, "Complet") == ["COMPLETED"]
+    assert matching_enum_names(BloodType, "xyz") == []
+
+
+def render(clause):
+    return clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+
+
+def test_number_matches_id_and_text_columns():
+    where, score = contains_or_id(USER_SEARCH_COLUMNS, "421", User.id)
+
+    sql = str(render(where))
+    assert "users.id = 421" in sql
+    assert "users.phone_number ILIKE '%%421%%'" in sql
+    assert f"WHEN (users.id = 421) THEN {EXACT_ID_SCORE}" in str(render(score))
+
+
+def test_short_term_matches_prefixes_and_ids_only():
+    where, _ = contains_or_id(USER_SEARCH_COLUMNS, "42", User.id)
+
+    sql = str(render(where))
+    assert "users.id = 42" in sql
+    assert "users.phone_number ILIKE '42%%'" in sql
+    assert "'%%42" not in sql
+
+
+def test_text_term_has_no_id_condition():
+    where, _ = contains_or_id(USER_SEARCH_COLUMNS, "Kyiv", User.id)
+
+    assert "users.id" not in str(render(where))
+
+
+def test_like_wildcards_are_escaped():
+    assert escape_like("50%_off") == "50\\%\\_off"
+
+
+def test_table_search_uses_id_equality_instead_of_text_cast():
+    condition, params = TablesDAO._search_filter(
+        "17",
+        text_columns=["h.name"],
+        id_columns=["d.id"],
+        enum_columns={"d.blood_type": BloodType}
+    )
+
+    assert "::text ILIKE" not in condition
+    assert "d.id = :search_id" in condition
+    assert params["search_id"] == 17
+    assert "search_enum_0" not in params
+
+
+def test_table_search_by_email_is_exact():
+    condition, params = TablesDAO._search_filter(
+        "olena@example.com",
+        text_columns=["first_name", "email"],
+        email_column="email"
+    )
+
+    assert condition == "email = :search_email"
+    assert params == {"search_email": "olena@example.com"}
@@ -0,0 +1,15 @@
+import asyncio
+import pytest
+from app.users.security import get_password_hash_async, hashing_pool, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_in_bounded_pool():
+    passwords = [f"password{i}" for i in range(hashing_pool.concurrency + 2)]
+
+    hashes = await asyncio.gather(*(get_password_hash_async(p) for p in passwords))
+
+    assert hashing_pool.max_waiting >= 2
+    assert await verify_password_async(passwords[0], hashes[0])
+    assert not await verify_password_async(passwords[1], hashes[0])
+    assert hashing_pool.stats()["running"] == 0
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import app.database
+from app.database import session_scope
+from app.hospital.models import Hospital
+from test.factories.hospital_factory import HospitalFactory
+
+
+@pytest.fixture
+def session_maker(db_engine, monkeypatch):
+    """Point the private sessions of session_scope at the test database"""
+    maker = async_sessionmaker(db_engine, expire_on_commit=False)
+    monkeypatch.setattr(app.database, "async_session_maker", maker)
+    return maker
+
+
+async def committed_hospital_ids(session_maker, name):
+    async with session_maker() as session:
+        return list((await session.scalars(select(Hospital.id).where(Hospital.name == name))).all())
+
+
+@pytest.mark.asyncio
+async def test_private_session_is_committed(session_maker):
+    hospital = HospitalFactory.build()
+
+    try:
+        async with session_scope() as session:
+            session.add(hospital)
+            await session.flush()
+
+        assert await committed_hospital_ids(session_maker, hospital.name) == [hospital.id]
+    finally:
+        async with session_maker() as session:
+            await session.execute(delete(Hospital).where(Hospital.name == hospital.name))
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_private_session_is_rolled_back_on_error(session_maker):
+    hospital = HospitalFactory.build()
+
+    with pytest.raises(RuntimeError):
+        async with session_scope() as session:
+            session.add(hospital)
+            await session.flush()
+            raise RuntimeError("endpoint failed")
+
+    assert await committed_hospital_ids(session_maker, hospital.name) == []
+
+
+@pytest.mark.asyncio
+async def test_borrowed_session_is_left_to_its_owner(db_session, session_maker):
+    hospital = HospitalFactory.build()
+
+    async with session_scope(db_session) as session:
+        assert session is db_session
+        session.add(hospital)
+        await session.flush()
+
+    # Neither committed nor closed: still visible inside the owner's transaction only
+    assert db_session.in_transaction()
+    assert await db_session.get(Hospital, hospital.id) is hospital
+    assert await committed_hospital_ids(session_maker, hospital.name) == []
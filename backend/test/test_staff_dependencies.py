@@ -0,0 +1,26 @@
+import pytest
+from types import SimpleNamespace
+from fastapi import HTTPException
+
+from app.hospital_staff.router import get_my_hospital_staff_profile
+from app.users.dependencies import StaffContext, get_current_hospital_staff
+
+
+@pytest.mark.asyncio
+async def test_hospital_staff_check_needs_only_the_user():
+    staff_user = SimpleNamespace(is_hospital_staff=True)
+
+    assert await get_current_hospital_staff(staff_user) is staff_user
+    with pytest.raises(HTTPException) as error:
+        await get_current_hospital_staff(SimpleNamespace(is_hospital_staff=False))
+    assert error.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_my_profile_comes_from_the_staff_context():
+    user, profile = SimpleNamespace(id=1), SimpleNamespace(id=7)
+
+    assert await get_my_hospital_staff_profile(StaffContext(user=user, staff=profile, hospital=None)) is profile
+    with pytest.raises(HTTPException) as error:
+        await get_my_hospital_staff_profile(StaffContext(user=user, staff=None, hospital=None))
+    assert error.value.status_code == 404
@@ -0,0 +1,37 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import select, update
+
+from app.hospital.dao import HospitalDAO
+from app.hospital.models import Hospital
+from test.factories.hospital_factory import HospitalFactory
+
+
+@pytest.mark.asyncio
+async def test_update_returning_sets_values_and_refreshes_updated_at(db_session):
+    hospital = await HospitalFactory.create(db_session)
+    await db_session.execute(
+        update(Hospital).where(Hospital.id == hospital.id).values(updated_at=datetime(2024, 1, 1))
+    )
+
+    updated = await HospitalDAO.update_returning(hospital.id, session=db_session, city="Львів")
+
+    # The session's copy of the row is overwritten, not a second instance returned
+    assert updated is hospital
+    assert updated.city == "Львів"
+    assert updated.updated_at > datetime(2024, 1, 1)
+    stored = await db_session.execute(select(Hospital.city, Hospital.updated_at).where(Hospital.id == hospital.id))
+    assert stored.one() == (updated.city, updated.updated_at)
+
+
+@pytest.mark.asyncio
+async def test_update_returning_loads_requested_relationships(db_session, hospital, hospital_staff_user):
+    updated = await HospitalDAO.update_returning(hospital.id, session=db_session, load=("staff",), city="Київ")
+
+    assert [staff.user_id for staff in updated.staff] == [hospital_staff_user.id]
+
+
+@pytest.mark.asyncio
+async def test_update_returning_missing_id_returns_none(db_session):
+    assert await HospitalDAO.update_returning(2**31 - 1, session=db_session, city="Київ") is None
+    assert await HospitalDAO.update_returning(2**31 - 1, session=db_session) is None